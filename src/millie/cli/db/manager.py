@@ -120,12 +120,12 @@ def seed(skip_embeddings):
     manager = SeedManager()
     results = manager.run_seeders()
     
-    # if not results:
-    #     click.echo("No seeders found.")
-    #     return
+    if not results:
+        echo("No seeders found.")
+        return
         
-    # for name, result in results.items():
-    #     if isinstance(result, str) and result.startswith("Error:"):
-    #         click.echo(f"❌ {name}: {result}")
-    #     else:
-    #         click.echo(f"✅ {name} completed successfully")
+    for name, result in results.items():
+        if result["status"] == "error":
+            echo(f"❌ {name}: {result['error']}", err=True)
+        else:
+            echo(f"✅ {name} completed successfully ({result['count']} entities)")
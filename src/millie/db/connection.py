@@ -1,5 +1,6 @@
 """Milvus connection management."""
 import os
+import threading
 from typing import Dict
 from pymilvus import Collection, connections
 import logging
@@ -11,7 +12,9 @@ class MilvusConnection:
     """Manages Milvus database connection."""
     
     _instance = None
+    # Collection handles shared by the whole process, keyed by collection name
     _collections: Dict[str, Collection] = {}
+    _collections_lock = threading.RLock()
     
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -19,17 +22,25 @@ class MilvusConnection:
         return cls._instance
     
     def __init__(self, host: str | None = None, port: int | None = None, db_name: str | None = None):
-        if not hasattr(self, 'initialized'):
-            # Load environment variables
-            load_dotenv()
-            
-            # Set connection parameters with priority: explicit args > env vars > defaults
-            self.host = host or os.getenv('MILVUS_HOST', 'localhost')
-            self.port = port or int(os.getenv('MILVUS_PORT', '19530'))
-            self.db_name = db_name or os.getenv('MILVUS_DB_NAME', 'default')
-            
-            self.initialized = True
-            self._connect()
+        with self._collections_lock:
+            if not hasattr(self, 'initialized'):
+                # Load environment variables
+                load_dotenv()
+                
+                # Set connection parameters with priority: explicit args > env vars > defaults
+                self.host = host or os.getenv('MILVUS_HOST', 'localhost')
+                self.port = port or int(os.getenv('MILVUS_PORT', '19530'))
+                self.db_name = db_name or os.getenv('MILVUS_DB_NAME', 'default')
+                
+                # Number of sessions currently using the connection, and whether
+                # one of them opened it, only then the last one closes it
+                self._users = 0
+                self._opened_by_session = False
+                self._connect()
+                self.initialized = True
+            else:
+                # The application uses this handle directly, sessions leave it open
+                self._opened_by_session = False
     
     def _connect(self):
         """Establish connection to Milvus."""
@@ -45,22 +56,72 @@ class MilvusConnection:
             logger.error(f"Failed to connect to Milvus at {self.host}:{self.port}: {str(e)}")
             raise
     
+    @classmethod
+    def for_session(cls, host: str | None = None, port: int | None = None, db_name: str | None = None) -> 'MilvusConnection':
+        """Get the shared connection for a session, which must release it when done.
+        
+        A connection opened here is closed when the last session releases it.
+        One the application opened with MilvusConnection() stays open.
+        """
+        with cls._collections_lock:
+            connection = cls._instance
+            if connection is None or not hasattr(connection, 'initialized'):
+                connection = cls(host, port, db_name)
+                connection._opened_by_session = True
+            connection._users += 1
+            return connection
+    
+    def release(self):
+        """Unregister a session, closing the connection once no session uses it.
+        
+        Connections the application opened itself are never closed here.
+        """
+        # Closed under the lock, so no session can take the connection
+        # between the count reaching zero and the disconnect
+        with self._collections_lock:
+            self._users = max(0, self._users - 1)
+            if not self._users and self._opened_by_session:
+                self.close()
+    
     def close(self):
-        """Close all collections and connection."""
-        for collection in self._collections.values():
-            collection.release()
+        """Close all collections and connection.
+        
+        The next MilvusConnection() connects again.
+        """
+        with self._collections_lock:
+            for collection in self._collections.values():
+                collection.release()
+            self._collections.clear()
         connections.disconnect("default")
+        if hasattr(self, 'initialized'):
+            del self.initialized
         logger.info("Disconnected from Milvus")
     
     @classmethod
     def get_collection(cls, name: str) -> Collection:
         """Get a cached collection instance."""
-        if name not in cls._collections:
-            cls._collections[name] = Collection(name)
-        return cls._collections[name]
+        # Cached handles are read without the lock, it is only needed to create one
+        collection = cls._collections.get(name)
+        if collection is not None:
+            return collection
+        with cls._collections_lock:
+            if name not in cls._collections:
+                cls._collections[name] = Collection(name)
+            return cls._collections[name]
+    
+    @classmethod
+    def is_cached(cls, name: str) -> bool:
+        """Check whether a collection handle is already cached."""
+        return name in cls._collections
+    
+    @classmethod
+    def cache_collection(cls, name: str, collection: Collection):
+        """Cache a collection instance that was created elsewhere."""
+        with cls._collections_lock:
+            cls._collections[name] = collection
     
     @classmethod
     def remove_collection(cls, name: str):
         """Remove a collection from cache."""
-        if name in cls._collections:
-            cls._collections.pop(name) 
\ No newline at end of file
+        with cls._collections_lock:
+            cls._collections.pop(name, None)
@@ -0,0 +1,36 @@
+"""Helpers for finding the project files that declare models, seeders and embedders."""
+import os
+from typing import Iterator
+
+# Directory names that are never descended into
+EXCLUDED_DIRS = frozenset({'venv', '.venv', 'site-packages', '__pycache__', 'node_modules'})
+
+def iter_py_files(root: str) -> Iterator[str]:
+    """Yield Python files under a directory.
+    
+    Uses an explicit stack of directories with ``os.scandir`` so that file
+    types come from the cached directory entry, and excluded directories
+    (virtualenvs, site-packages, caches and dot-directories) are pruned
+    before descending into them.
+    
+    Args:
+        root: Directory to search
+        
+    Yields:
+        Paths of ``.py`` files
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name in EXCLUDED_DIRS or name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and name.endswith('.py'):
+                        yield entry.path
+        except OSError:
+            continue
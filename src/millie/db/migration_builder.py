@@ -5,6 +5,15 @@ from typing import Dict, List, Tuple, Type, Any
 from millie.orm.milvus_model import MilvusModel
 from millie.db.schema import Schema, SchemaField
 
+def field_schema_literal(field: SchemaField) -> str:
+    """Render a field as the FieldSchema constructor call used in migration files."""
+    extras = ''.join([
+        f', max_length={field.max_length}' if field.max_length is not None else '',
+        f', dim={field.dim}' if field.dim is not None else '',
+        ', is_primary=True' if field.is_primary else '',
+    ])
+    return f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}{extras})'
+
 class MigrationBuilder:
     """Handles the creation of migration files."""
     
@@ -34,17 +43,7 @@ class MigrationBuilder:
         # For initial migration, create collection with all fields
         if "initial" in changes and changes["initial"]:
             # Build field schemas
-            field_schemas = []
-            for field in changes["added"]:
-                field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-                if field.max_length:
-                    field_schema += f', max_length={field.max_length}'
-                if field.dim:
-                    field_schema += f', dim={field.dim}'
-                if field.is_primary:
-                    field_schema += ', is_primary=True'
-                field_schema += ')'
-                field_schemas.append(field_schema)
+            field_schemas = [field_schema_literal(field) for field in changes["added"]]
             
             # Create collection with all fields
             fields_str = ',\n            '.join(field_schemas)
@@ -64,28 +63,14 @@ class MigrationBuilder:
             
             # Handle added fields
             for field in changes["added"]:
-                field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-                if field.max_length:
-                    field_schema += f', max_length={field.max_length}'
-                if field.dim:
-                    field_schema += f', dim={field.dim}'
-                if field.is_primary:
-                    field_schema += ', is_primary=True'
-                field_schema += ')'
+                field_schema = field_schema_literal(field)
                 
                 upgrade_lines.append(f'        collection.alter_schema(add_fields=[{field_schema}])')
                 downgrade_lines.append(f'        collection.alter_schema(drop_fields=["{field.name}"])')
             
             # Handle removed fields
             for field in changes["removed"]:
-                field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-                if field.max_length:
-                    field_schema += f', max_length={field.max_length}'
-                if field.dim:
-                    field_schema += f', dim={field.dim}'
-                if field.is_primary:
-                    field_schema += ', is_primary=True'
-                field_schema += ')'
+                field_schema = field_schema_literal(field)
                 
                 upgrade_lines.append(f'        collection.alter_schema(drop_fields=["{field.name}"])')
                 downgrade_lines.append(f'        collection.alter_schema(add_fields=[{field_schema}])')
@@ -93,23 +78,8 @@ class MigrationBuilder:
             # Handle modified fields
             for old_field, new_field in changes["modified"]:
                 # For modified fields, we need to drop and recreate since Milvus doesn't support direct modification
-                old_schema = f'FieldSchema(name="{old_field.name}", dtype=DataType.{old_field.dtype}'
-                if old_field.max_length:
-                    old_schema += f', max_length={old_field.max_length}'
-                if old_field.dim:
-                    old_schema += f', dim={old_field.dim}'
-                if old_field.is_primary:
-                    old_schema += ', is_primary=True'
-                old_schema += ')'
-                
-                new_schema = f'FieldSchema(name="{new_field.name}", dtype=DataType.{new_field.dtype}'
-                if new_field.max_length:
-                    new_schema += f', max_length={new_field.max_length}'
-                if new_field.dim:
-                    new_schema += f', dim={new_field.dim}'
-                if new_field.is_primary:
-                    new_schema += ', is_primary=True'
-                new_schema += ')'
+                old_schema = field_schema_literal(old_field)
+                new_schema = field_schema_literal(new_field)
                 
                 upgrade_lines.extend([
                     f'        collection.alter_schema(drop_fields=["{old_field.name}"])',
@@ -166,17 +136,7 @@ class Migration_{migration_name}(Migration):
             # For initial migration, create collection with all fields
             if not changes["modified"] and not changes["removed"] and changes["added"]:
                 # Build field schemas
-                field_schemas = []
-                for field in changes["added"]:
-                    field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-                    if field.max_length:
-                        field_schema += f', max_length={field.max_length}'
-                    if field.dim:
-                        field_schema += f', dim={field.dim}'
-                    if field.is_primary:
-                        field_schema += ', is_primary=True'
-                    field_schema += ')'
-                    field_schemas.append(field_schema)
+                field_schemas = [field_schema_literal(field) for field in changes["added"]]
                 
                 # Create collection with all fields
                 fields_str = ',\n            '.join(field_schemas)
@@ -198,13 +158,4 @@ class Migration_{migration_name}(Migration):
         
     def _field_to_schema_str(self, field: SchemaField) -> str:
         """Convert a field to its FieldSchema string representation."""
-        args = [f'name="{field.name}"', f'dtype=DataType.{field.dtype}']
-        
-        if field.max_length is not None:
-            args.append(f'max_length={field.max_length}')
-        if field.dim is not None:
-            args.append(f'dim={field.dim}')
-        if field.is_primary:
-            args.append('is_primary=True')
-            
-        return f'FieldSchema({", ".join(args)})' 
\ No newline at end of file
+        return field_schema_literal(field)
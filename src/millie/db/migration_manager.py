@@ -1,22 +1,125 @@
+import io
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 import json
-from typing import List, Type, Callable, Dict, Any, Union
+from typing import FrozenSet, Iterator, List, Optional, Sequence, Tuple, Type, Callable, Dict, Any, Union
 import glob
 import importlib.util
 import inspect
+import py_compile
 import ast
+import copy
+import functools
 from collections import defaultdict
+from types import ModuleType
 
+from millie.db.file_discovery import iter_py_files
 from millie.db.migration_builder import MigrationBuilder
-from millie.db.schema_differ import SchemaDiffer
+from millie.db.schema_differ import DEFAULT_DIFFER
 from millie.db.schema_history import SchemaHistory
 from millie.db.schema import Schema, SchemaField
-from millie.orm.milvus_model import MilvusModel
+from millie.orm.milvus_model import MilvusModel, invalidate_cached_results, register_model
 from millie.db.migration import Migration
 from .session import MilvusSession
 
+# Byte strings of which at least one must appear in a file that declares a model
+_MODEL_MARKERS = (b'MilvusModel', b'milvus_model', b'milvus_field')
+
+# Model modules already executed in this process, keyed by file path and
+# holding the (mtime_ns, size) stamp the module was loaded from
+_MODULE_CACHE: Dict[str, Tuple[Tuple[int, int], ModuleType]] = {}
+
+# Migration classes already loaded in this process, keyed by absolute file path
+# and holding the (mtime_ns, size) stamp the migration was loaded from
+_MIGRATION_CACHE: Dict[str, Tuple[Tuple[int, int], Type[Migration]]] = {}
+
+def _name_of(node: ast.expr) -> Optional[str]:
+    """Get the trailing name of a ``Name`` or ``Attribute`` node."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+def _is_model_class(node: ast.ClassDef) -> bool:
+    """Check whether a class definition looks like a MilvusModel."""
+    if any(_name_of(base) == 'MilvusModel' for base in node.bases):
+        return True
+    if any(_name_of(decorator) == 'MillieMigrationModel' for decorator in node.decorator_list):
+        return True
+    # Subclasses of a project base model that add fields declare them with
+    # milvus_field, those that add none are found by _subclasses_model
+    return any(
+        isinstance(stmt, ast.AnnAssign) and stmt.value is not None
+        and _name_of(stmt.value) == 'milvus_field'
+        for stmt in node.body
+    )
+
+@functools.lru_cache(maxsize=None)
+def _file_has_milvus_model(path: str, stamp: Tuple[int, int]) -> bool:
+    """Check whether a file declares a model class without executing it.
+    
+    Results are cached per file stamp, so an unchanged file is only read and
+    parsed once per process.
+    
+    Args:
+        path: Path to the Python file
+        stamp: The file's (mtime_ns, size), used as the cache key
+        
+    Returns:
+        True if the file has a top-level model class definition
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    # Cheap byte scan first, so most files are never parsed
+    if not any(marker in source for marker in _MODEL_MARKERS):
+        return False
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return False
+    return any(isinstance(node, ast.ClassDef) and _is_model_class(node) for node in tree.body)
+
+@functools.lru_cache(maxsize=4096)
+def _subclasses_model(path: str, stamp: Tuple[int, int], model_names: FrozenSet[str]) -> bool:
+    """Check whether a file declares a subclass of an already known model class.
+    
+    Catches models like ``class Article(BaseDoc): ...`` that only inherit from
+    a project base model, whose files need not mention milvus at all.
+    
+    Args:
+        path: Path to the Python file
+        stamp: The file's (mtime_ns, size), used as the cache key
+        model_names: Class names of the models found so far
+        
+    Returns:
+        True if a top-level class has one of ``model_names`` as a base
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    # A subclass names its base, so files mentioning no model are never parsed
+    if not any(name.encode() in source for name in model_names):
+        return False
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return False
+    return any(
+        isinstance(node, ast.ClassDef) and any(_name_of(base) in model_names for base in node.bases)
+        for node in tree.body
+    )
+
+def _register_module_models(module: ModuleType) -> None:
+    """Re-register the model classes defined in an already executed module."""
+    for value in vars(module).values():
+        if (isinstance(value, type) and issubclass(value, MilvusModel)
+                and value is not MilvusModel and value.__module__ == module.__name__):
+            register_model(value)
+
 class MigrationManager:
     """Manages migrations for Milvus collections."""
     
@@ -37,51 +140,181 @@ class MigrationManager:
         os.makedirs(self.migrations_dir, exist_ok=True)
         os.makedirs(self.history_dir, exist_ok=True)
         
-    def _find_all_models(self) -> List[Type[MilvusModel]]:
+        self.history = SchemaHistory(self.history_dir, self.migrations_dir)
+        self._builder = MigrationBuilder(self.migrations_dir)
+        
+        # Models register themselves when their module is imported, so the
+        # codebase only has to be scanned once per manager
+        self._discovered = False
+        
+        # Result of the last detect_changes call, with the file stamp and the
+        # registered models it was computed from
+        self._last_scan_stamp: Optional[FrozenSet[Tuple[str, int, int]]] = None
+        self._last_models: Tuple[Type[MilvusModel], ...] = ()
+        self._last_changes: Dict[str, Dict[str, Any]] = {}
+        
+    def _iter_py_files(self) -> Iterator[str]:
+        """Yield Python files under the working directory, skipping excluded directories."""
+        return iter_py_files(self.cwd)
+    
+    def _model_files(self) -> Iterator[str]:
+        """Yield candidate model files, honoring ``MILLIE_MODEL_GLOB`` if set."""
+        pattern = os.getenv('MILLIE_MODEL_GLOB')
+        if not pattern:
+            yield from self._iter_py_files()
+            return
+        for file in glob.iglob(os.path.join(self.cwd, pattern), recursive=True):
+            if "venv" in file or "site-packages" in file:
+                continue
+            yield file
+        
+    def _module_name(self, file: str) -> str:
+        """Get the dotted module name a file is importable as from the working directory."""
+        module_path = os.path.splitext(os.path.relpath(file, self.cwd))[0]
+        if os.path.basename(module_path) == '__init__':
+            module_path = os.path.dirname(module_path)
+        return module_path.replace(os.sep, '.')
+        
+    def _find_all_models(self) -> Sequence[Type[MilvusModel]]:
         """Find all model classes in the codebase.
         
+        The codebase is only scanned on the first call. Later calls return the
+        registered models until invalidate_model_cache() is called.
+        
         Returns:
             List of discovered model classes
         """
+        if self._discovered:
+            return [model for model in MilvusModel.get_all_models() if model != MilvusModel]
+        
         # Add current working directory to Python path
-        import sys
         if self.cwd not in sys.path:
             sys.path.insert(0, self.cwd)
         
         # Import all Python files to trigger model registration
-        for file in glob.glob(os.path.join(self.cwd, os.getenv('MILLIE_MODEL_GLOB', "**/*.py")), recursive=True):
-            if "venv" in file or "site-packages" in file:
-                continue
+        deferred = []
+        for file in self._model_files():
             try:
-                spec = importlib.util.spec_from_file_location("module", file)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
+                st = os.stat(file)
+                stamp = (st.st_mtime_ns, st.st_size)
+                cached = _MODULE_CACHE.get(file)
+                if cached is not None and cached[0] == stamp:
+                    # Unchanged since the last scan, reuse the loaded module
+                    _register_module_models(cached[1])
+                    continue
+                
+                # Files that do not declare a model are not executed yet
+                if not _file_has_milvus_model(file, stamp):
+                    deferred.append((file, stamp))
+                    continue
+                
+                self._import_model_file(file, stamp, reuse_imported=cached is None)
             except Exception:
                 continue
         
+        # Then import the files subclassing the models found so far, until no
+        # more are found, so models several levels below a base model are found
+        while deferred:
+            model_names = frozenset(model.__name__ for model in MilvusModel.get_all_models())
+            remaining = []
+            for file, stamp in deferred:
+                try:
+                    if not _subclasses_model(file, stamp, model_names):
+                        remaining.append((file, stamp))
+                        continue
+                    self._import_model_file(file, stamp, reuse_imported=file not in _MODULE_CACHE)
+                except Exception:
+                    continue
+            if len(remaining) == len(deferred):
+                break
+            deferred = remaining
+        self._discovered = True
+        
         # Return all registered models
         return [model for model in MilvusModel.get_all_models() if model != MilvusModel]
         
+    def _import_model_file(self, file: str, stamp: Tuple[int, int], reuse_imported: bool):
+        """Execute a model file so its models register, and cache the module.
+        
+        Args:
+            file: Path to the Python file
+            stamp: The file's (mtime_ns, size)
+            reuse_imported: Whether a module the application already imported
+                from the file may be used instead of executing it again
+        """
+        # Reusing a module the application already imported normally avoids
+        # defining its model classes a second time
+        if reuse_imported:
+            module = sys.modules.get(self._module_name(file))
+            if module is not None and getattr(module, '__file__', None) == os.path.abspath(file):
+                _register_module_models(module)
+                _MODULE_CACHE[file] = (stamp, module)
+                return
+        
+        spec = importlib.util.spec_from_file_location("module", file)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _MODULE_CACHE[file] = (stamp, module)
+        
+    def invalidate_model_cache(self):
+        """Scan the codebase for models again on the next lookup."""
+        self._discovered = False
+        self._last_scan_stamp = None
+    
+    def _scan_stamp(self) -> FrozenSet[Tuple[str, int, int]]:
+        """Get the (path, mtime_ns, size) of every model and schema history file.
+        
+        Only directory entries and file metadata are read, never file contents.
+        """
+        stamps = []
+        for path in self._model_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stamps.append((path, st.st_mtime_ns, st.st_size))
+        with os.scandir(self.history_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False):
+                    st = entry.stat()
+                    stamps.append((entry.path, st.st_mtime_ns, st.st_size))
+        return frozenset(stamps)
+        
     def _get_model_by_name(self, model_name: str) -> Type[MilvusModel]:
         """Get model class by name."""
         return MilvusModel.get_model(model_name)
     
     def detect_changes(self, save_schema: bool = False):
-        """Detect schema changes for all @MilvusModel classes"""
+        """Detect schema changes for all @MilvusModel classes
+        
+        If no model or schema history file changed and no model was registered
+        since the previous call, a copy of the previous result is returned.
+        Calls that save the schema always run the full detection.
+        """
+        stamp = self._scan_stamp()
+        if stamp != self._last_scan_stamp:
+            # Files were edited, pick up the new model definitions
+            self._discovered = False
+        elif not save_schema and MilvusModel.get_all_models() == self._last_models:
+            return copy.deepcopy(self._last_changes)
+        
         models = self._find_all_models()
         changes = {}
         for model in models:
             model_changes = self.detect_changes_for_model(model, save_schema)
             if model_changes.get("initial", False) or model_changes["added"] or model_changes["removed"] or model_changes["modified"]:
                 changes[model.__name__] = model_changes
-
-        return changes
+        
+        # Saving rewrites the history files, so the stamp would be stale
+        self._last_scan_stamp = None if save_schema else stamp
+        self._last_models = MilvusModel.get_all_models()
+        self._last_changes = changes
+        return copy.deepcopy(changes)
 
     def detect_changes_for_model(self, model_cls: Type[MilvusModel], save_schema: bool = False):
         """Detect schema changes."""
         history = SchemaHistory(self.history_dir, self.migrations_dir)
-        differ = SchemaDiffer()
         
         # Get current and new schemas using model class
         current_schema = history.get_schema_from_history(model_cls)
@@ -104,7 +337,7 @@ class MigrationManager:
             }
         
         # Compare schemas to detect changes
-        changes = differ.diff_schemas(current_schema, new_schema)
+        changes = DEFAULT_DIFFER.diff_schemas(current_schema, new_schema)
         
         # Only save the new schema if there are actual changes
         if save_schema and (changes["added"] or changes["removed"] or changes["modified"]):
@@ -129,85 +362,118 @@ class MigrationManager:
         migration_changes = self.detect_changes(save_schema=True)
         
         # Generate migration content for each model with changes
-        builder = MigrationBuilder()
-        up_codes = []
-        down_codes = []
+        builder = self._builder
+        up_buffer = io.StringIO()
+        down_buffer = io.StringIO()
         
         for model_name, model_changes in migration_changes.items():
             model_cls = self._get_model_by_name(model_name)
             
             if model_cls:
                 up_code, down_code = builder.generate_migration_code(model_cls, model_changes)
-                up_codes.append(up_code)
-                down_codes.append(down_code)
+                # Separate each model's code from the previous one
+                if up_buffer.tell():
+                    up_buffer.write("\n\n")
+                    down_buffer.write("\n\n")
+                up_buffer.write(up_code)
+                down_buffer.write(down_code)
         
         # Combine all migration code
-        combined_up = "\n\n".join(up_codes) if up_codes else "        pass"
-        combined_down = "\n\n".join(down_codes) if down_codes else "        pass"
+        combined_up = up_buffer.getvalue() or "        pass"
+        combined_down = down_buffer.getvalue() or "        pass"
         
         # Generate the final migration content
         content = builder.generate_migration_file_content(name, migration_name, combined_up, combined_down)
         
         # Write migration file
-        with open(migration_path, 'w') as f:
+        with open(migration_path, 'w', buffering=1 << 16) as f:
             f.write(content)
+        
+        # Compile it now so the first run loads cached bytecode instead of the source
+        if not sys.dont_write_bytecode:
+            py_compile.compile(migration_path, doraise=False)
             
         return migration_path
     
     def create_empty_migration_file(self, name: str) -> str:
         """Generate a new migration file."""
-        builder = MigrationBuilder(self.migrations_dir)
-        return builder.generate_migration(name)
+        return self._builder.generate_migration(name)
     
     def run_migrations(self) -> List[str]:
-        """Run all pending migrations."""
-        applied = []
+        """Run all pending migrations.
+        
+        Every pending migration is imported before any of them is applied, so a
+        broken migration file fails the run before the database is touched.
+        """
         migrations = self._get_pending_migrations()
+        if not migrations:
+            return []
         
+        migration_classes = []
         for migration in migrations:
             try:
-                self._apply_migration(migration)
-                applied.append(migration)
+                migration_classes.append(self._load_migration_class(migration))
             except Exception as e:
-                raise Exception(f"Failed to apply migration {migration}: {str(e)}")
+                raise Exception(f"Failed to load migration {migration}: {str(e)}")
+        
+        # Connect once for the whole run. The session only closes the connection
+        # if it opened it and no other session still uses it
+        applied = []
+        with MilvusSession():
+            try:
+                for migration, migration_class in zip(migrations, migration_classes):
+                    try:
+                        migration_class().apply()
+                    except Exception as e:
+                        raise Exception(f"Failed to apply migration {migration}: {str(e)}")
+                    # Recorded as soon as it is applied, so a later failure does not lose it
+                    self.history.mark_applied([os.path.basename(migration)])
+                    applied.append(migration)
+            finally:
+                # Migrations change collections directly, cached results may be stale
+                invalidate_cached_results()
         
         return applied
     
     def _get_pending_migrations(self) -> List[str]:
-        """Get list of pending migrations."""
-        if not os.path.exists(self.migrations_dir):
-            return []
+        """Get list of migrations that have not been applied yet, in order."""
+        applied = set(self.history.applied_migrations())
+        return [path for path in self.history.get_migrations() if os.path.basename(path) not in applied]
+    
+    def _load_migration_class(self, migration_file: str) -> Type[Migration]:
+        """Import a migration file and get its migration class.
         
-        migrations = []
-        for filename in sorted(os.listdir(self.migrations_dir)):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                migrations.append(os.path.join(self.migrations_dir, filename))
+        An unchanged migration is only executed once per process.
+        """
+        path = os.path.abspath(migration_file)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _MIGRATION_CACHE.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
         
-        return migrations
-    
-    def _apply_migration(self, migration_file: str):
-        """Apply a single migration."""
-        # Import the migration module
         module_name = os.path.splitext(os.path.basename(migration_file))[0]
         spec = importlib.util.spec_from_file_location(module_name, migration_file)
         if not spec or not spec.loader:
             raise Exception(f"Could not load migration {migration_file}")
             
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
         
         # Find the migration class (it should be the only class that inherits from Migration)
-        migration_class = None
         for name, obj in inspect.getmembers(module):
             if inspect.isclass(obj) and issubclass(obj, Migration) and obj != Migration:
-                migration_class = obj
-                break
+                _MIGRATION_CACHE[path] = (stamp, obj)
+                return obj
                 
-        if not migration_class:
-            raise Exception(f"No migration class found in {migration_file}")
-            
-        # Create an instance and apply the migration
-        migration = migration_class()
-        migration.apply()
-
+        raise Exception(f"No migration class found in {migration_file}")
     
+    def _apply_migration(self, migration_file: str):
+        """Apply a single migration."""
+        migration_class = self._load_migration_class(migration_file)
+        migration_class().apply()
@@ -1,6 +1,5 @@
 """Decorator for marking Milvus embedding functions."""
 from typing import Callable, Dict
-from functools import wraps
 
 # Registry to store all embedder functions
 _EMBEDDERS: Dict[str, Callable] = {}
@@ -19,10 +18,5 @@ def milvus_embedder(func: Callable) -> Callable:
     and embedding generation. The EmbeddingManager will simply run
     all decorated functions in sequence.
     """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    
-    # Register the original function, not the wrapper
     _EMBEDDERS[func.__name__] = func
-    return func 
\ No newline at end of file
+    return func
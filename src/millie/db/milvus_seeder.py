@@ -1,6 +1,5 @@
 """Decorator for marking Milvus seeder functions."""
 from typing import Callable, Dict
-from functools import wraps
 
 # Registry to store all seeder functions
 _SEEDERS: Dict[str, Callable] = {}
@@ -19,10 +18,5 @@ def milvus_seeder(func: Callable) -> Callable:
             )
             # Save rule to Milvus...
     """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    
-    # Register the original function, not the wrapper
     _SEEDERS[func.__name__] = func
-    return func  # Return the original function instead of the wrapper 
\ No newline at end of file
+    return func
@@ -1,8 +1,11 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field as dataclass_field
+from typing import List, Dict, Any, Optional, Tuple
 from pymilvus import DataType, FieldSchema
 
-@dataclass
+# DataType members by name, used to resolve stored dtype names
+_DTYPE_MAP: Dict[str, DataType] = {dtype.name: dtype for dtype in DataType}
+
+@dataclass(frozen=True, slots=True)
 class SchemaField:
     """Represents a field in a Milvus schema."""
     name: str
@@ -10,6 +13,17 @@ class SchemaField:
     max_length: Optional[int] = None
     dim: Optional[int] = None
     is_primary: bool = False
+    _hash: int = dataclass_field(init=False, repr=False, compare=False)
+    _as_dict: Optional[Dict[str, Any]] = dataclass_field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Fields are immutable, so the hash of the type attributes can be kept
+        object.__setattr__(self, '_hash', hash(self._key))
+    
+    @property
+    def _key(self) -> Tuple[str, Optional[int], Optional[int], bool]:
+        """The attributes that define the field's type, packed for comparison."""
+        return (self.dtype, self.max_length, self.dim, self.is_primary)
     
     @classmethod
     def from_field_schema(cls, field: FieldSchema) -> 'SchemaField':
@@ -34,31 +48,34 @@ class SchemaField:
         )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
-        data = {
-            'name': self.name,
-            'dtype': self.dtype
-        }
-        if self.max_length is not None:
-            data['max_length'] = self.max_length
-        if self.dim is not None:
-            data['dim'] = self.dim
-        if self.is_primary:
-            data['is_primary'] = True
-        return data
+        """Convert to dictionary representation.
+        
+        The dictionary is built once and shared between calls, so callers
+        must not modify it.
+        """
+        if self._as_dict is None:
+            data = {
+                'name': self.name,
+                'dtype': self.dtype
+            }
+            if self.max_length is not None:
+                data['max_length'] = self.max_length
+            if self.dim is not None:
+                data['dim'] = self.dim
+            if self.is_primary:
+                data['is_primary'] = True
+            object.__setattr__(self, '_as_dict', data)
+        return self._as_dict
     
     def to_field_schema(self) -> FieldSchema:
         """Convert to Milvus FieldSchema object."""
-        kwargs = {
-            'name': self.name,
-            'dtype': getattr(DataType, self.dtype)
-        }
-        if self.max_length is not None:
-            kwargs['max_length'] = self.max_length
-        if self.dim is not None:
-            kwargs['dim'] = self.dim
-        if self.is_primary:
-            kwargs['is_primary'] = True
+        # FieldSchema is mutable, so only its keyword arguments are reused
+        try:
+            dtype = _DTYPE_MAP[self.dtype]
+        except KeyError:
+            raise ValueError(f"Unknown data type {self.dtype!r} for field {self.name}") from None
+        kwargs = dict(self.to_dict())
+        kwargs['dtype'] = dtype
         return FieldSchema(**kwargs)
 
 @dataclass
@@ -72,6 +89,16 @@ class Schema:
         self.is_migration_collection = is_migration_collection
         self.version = 0  # Initialize version to 0
     
+    @property
+    def fields(self) -> List[SchemaField]:
+        return self._fields
+    
+    @fields.setter
+    def fields(self, fields: List[SchemaField]):
+        self._fields = fields
+        self._by_name: Optional[Dict[str, SchemaField]] = None
+        self._indexed_count = 0
+    
     @classmethod
     def from_model(cls, model_class: Any) -> 'Schema':
         """Create schema from a MilvusModel class."""
@@ -119,8 +146,16 @@ class Schema:
         }
     
     def get_field(self, name: str) -> Optional[SchemaField]:
-        """Get a field by name."""
-        for field in self.fields:
-            if field.name == name:
-                return field
-        return None 
\ No newline at end of file
+        """Get a field by name.
+        
+        Fields are indexed by name on first use. The index is rebuilt when
+        ``fields`` is reassigned or its length changes.
+        """
+        if self._by_name is None or self._indexed_count != len(self._fields):
+            by_name = {}
+            for field in self._fields:
+                # Keep the first field when names repeat
+                by_name.setdefault(field.name, field)
+            self._by_name = by_name
+            self._indexed_count = len(self._fields)
+        return self._by_name.get(name) 
\ No newline at end of file
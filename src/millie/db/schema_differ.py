@@ -1,7 +1,8 @@
 import logging
-from typing import List, Dict, Set, Type, Tuple, Any
+from typing import FrozenSet, List, Dict, Set, Type, Tuple, Any
 from millie.orm.milvus_model import MilvusModel
 from millie.db.schema import Schema, SchemaField
+from millie.db.migration_builder import field_schema_literal
 
 
 # Configure logging
@@ -14,6 +15,14 @@ logger = logging.getLogger(__name__)
 class SchemaDiffer:
     """Utility class to find differences between schemas."""
 
+    def __init__(self, ignored_fields: FrozenSet[str] = frozenset()):
+        """Initialize the differ.
+        
+        Args:
+            ignored_fields: Names of fields to leave out of every diff
+        """
+        self._ignored = frozenset(ignored_fields)
+
     def diff_schemas(self, old_schema: Schema | None, new_schema: Schema) -> Dict[str, List[SchemaField]]:
         """Compare two schemas and return the differences."""
         # Handle initial schema case
@@ -21,34 +30,29 @@ class SchemaDiffer:
             # For initial schema, include all fields
             return {
                 "initial": True,
-                "added": new_schema.fields,
+                "added": [f for f in new_schema.fields if f.name not in self._ignored],
                 "removed": [],
                 "modified": []
             }
         
-        old_fields = {f.name: f for f in old_schema.fields}
-        new_fields = {f.name: f for f in new_schema.fields}
-        
-        added = []
-        removed = []
-        modified = []
-        
-        # Check for added fields
-        for name, field in new_fields.items():
-            if name not in old_fields:
-                added.append(field)
+        ignored = self._ignored
+        old_fields = {f.name: f for f in old_schema.fields if f.name not in ignored}
+        new_fields = {f.name: f for f in new_schema.fields if f.name not in ignored}
         
-        # Check for removed fields
-        for name, field in old_fields.items():
-            if name not in new_fields:
-                removed.append(field)
+        # Name sets come from C-level set operations on the key views; the
+        # fields themselves are then emitted in declaration order so that
+        # generated migrations are deterministic
+        added_names = new_fields.keys() - old_fields.keys()
+        removed_names = old_fields.keys() - new_fields.keys()
+        added = [f for name, f in new_fields.items() if name in added_names] if added_names else []
+        removed = [f for name, f in old_fields.items() if name in removed_names] if removed_names else []
         
         # Check for modified fields
-        for name, old_field in old_fields.items():
-            if name in new_fields:
-                new_field = new_fields[name]
-                if self._is_field_modified(old_field, new_field):
-                    modified.append((old_field, new_field))
+        modified = [
+            (old_field, new_fields[name])
+            for name, old_field in old_fields.items()
+            if name not in removed_names and self._is_field_modified(old_field, new_fields[name])
+        ]
         
         # Log changes for debugging
         if added or removed or modified:
@@ -68,12 +72,9 @@ class SchemaDiffer:
 
     def _is_field_modified(self, old_field: SchemaField, new_field: SchemaField) -> bool:
         """Check if a field has been modified."""
-        return (
-            old_field.dtype != new_field.dtype or
-            old_field.max_length != new_field.max_length or
-            old_field.dim != new_field.dim or
-            old_field.is_primary != new_field.is_primary
-        )
+        # Differing hashes settle it with an integer compare; equal hashes are
+        # confirmed with the tuple compare in case of a collision
+        return old_field._hash != new_field._hash or old_field._key != new_field._key
 
     @staticmethod
     def generate_migration_code(model_class: Type[MilvusModel], changes: Dict[str, List]) -> Tuple[str, str]:
@@ -85,28 +86,14 @@ class SchemaDiffer:
         
         # Handle added fields
         for field in changes["added"]:
-            field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-            if field.max_length:
-                field_schema += f', max_length={field.max_length}'
-            if field.dim:
-                field_schema += f', dim={field.dim}'
-            if field.is_primary:
-                field_schema += ', is_primary=True'
-            field_schema += ')'
+            field_schema = field_schema_literal(field)
             
             upgrade_lines.append(f'        collection.alter_schema(add_fields=[{field_schema}])')
             downgrade_lines.append(f'        collection.alter_schema(drop_fields=["{field.name}"])')
         
         # Handle removed fields
         for field in changes["removed"]:
-            field_schema = f'FieldSchema(name="{field.name}", dtype=DataType.{field.dtype}'
-            if field.max_length:
-                field_schema += f', max_length={field.max_length}'
-            if field.dim:
-                field_schema += f', dim={field.dim}'
-            if field.is_primary:
-                field_schema += ', is_primary=True'
-            field_schema += ')'
+            field_schema = field_schema_literal(field)
             
             upgrade_lines.append(f'        collection.alter_schema(drop_fields=["{field.name}"])')
             downgrade_lines.append(f'        collection.alter_schema(add_fields=[{field_schema}])')
@@ -114,23 +101,8 @@ class SchemaDiffer:
         # Handle modified fields
         for old_field, new_field in changes["modified"]:
             # For modified fields, we need to drop and recreate since Milvus doesn't support direct modification
-            old_schema = f'FieldSchema(name="{old_field.name}", dtype=DataType.{old_field.dtype}'
-            if old_field.max_length:
-                old_schema += f', max_length={old_field.max_length}'
-            if old_field.dim:
-                old_schema += f', dim={old_field.dim}'
-            if old_field.is_primary:
-                old_schema += ', is_primary=True'
-            old_schema += ')'
-            
-            new_schema = f'FieldSchema(name="{new_field.name}", dtype=DataType.{new_field.dtype}'
-            if new_field.max_length:
-                new_schema += f', max_length={new_field.max_length}'
-            if new_field.dim:
-                new_schema += f', dim={new_field.dim}'
-            if new_field.is_primary:
-                new_schema += ', is_primary=True'
-            new_schema += ')'
+            old_schema = field_schema_literal(old_field)
+            new_schema = field_schema_literal(new_field)
             
             upgrade_lines.extend([
                 f'        collection.alter_schema(drop_fields=["{old_field.name}"])',
@@ -145,3 +117,6 @@ class SchemaDiffer:
             '\n'.join(upgrade_lines),
             '\n'.join(downgrade_lines)
         )
+
+# Shared differ for callers that do not ignore any fields
+DEFAULT_DIFFER = SchemaDiffer()
@@ -2,11 +2,9 @@ import os
 import json
 import glob
 import logging
-import importlib.util
-import inspect
+import ast
 from pathlib import Path
-import re
-from typing import Dict, List, Literal, Type, Optional, Tuple
+from typing import Any, Dict, List, Type, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 from pymilvus import FieldSchema, DataType
@@ -15,8 +13,115 @@ from millie.orm.milvus_model import MilvusModel
 from millie.orm.milvus_model import MilvusModel
 from millie.db.schema import Schema, SchemaField
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Directory in the history directory for local state that is kept out of
+# version control, such as the field changes read from migrations
+MIGRATION_CACHE_DIR = ".migration_cache"
+
+# File in the migration cache directory that records, per database, which migrations have been applied
+APPLIED_MIGRATIONS_FILE = "applied.json"
+
+# Schema dict keys that record when a schema was saved, not what it describes
+_UNCOMPARED_KEYS = frozenset({'updated_at', 'version'})
+
+# FieldSchema arguments that SchemaField keeps
+_FIELD_SCHEMA_PARAMETERS = frozenset({'name', 'dtype', 'max_length', 'dim', 'is_primary'})
+
+def _file_stamp(path: str) -> Tuple[str, int, int]:
+    """Get the (path, mtime_ns, size) of a file."""
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+def _load_json(path: str) -> Any:
+    """Read a JSON file, with orjson when it is installed.
+    
+    The file is read as bytes in one call and parsed from memory.
+    """
+    with open(path, 'rb') as f:
+        payload = f.read()
+    return orjson.loads(payload) if HAS_ORJSON else json.loads(payload)
+
+def _dump_json(path: str, data: Any, indent: bool = True):
+    """Write a JSON file, with orjson when it is installed.
+    
+    History files are indented so they read well in diffs, caches are not.
+    """
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2 if indent else None)
+
+def _schema_content(schema: Schema) -> Dict[str, Any]:
+    """Get the parts of a schema's dict that describe the schema."""
+    return {key: value for key, value in schema.to_dict().items() if key not in _UNCOMPARED_KEYS}
+
+def _database_key() -> str:
+    """Get the host, port and database name of the Milvus database migrations are applied to."""
+    host = os.getenv('MILVUS_HOST', 'localhost')
+    port = os.getenv('MILVUS_PORT', '19530')
+    db_name = os.getenv('MILVUS_DB_NAME', 'default')
+    return f"{host}:{port}/{db_name}"
+
+def _find_up_method(tree: ast.Module) -> Optional[ast.FunctionDef]:
+    """Find the ``up`` method of the first ``Migration_*`` class in a module."""
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name.startswith('Migration_'):
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == 'up':
+                    return item
+            return None
+    return None
+
+def _list_elements(node: ast.expr) -> List[ast.expr]:
+    """Get the elements of a list or tuple literal."""
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        raise ValueError(f"Expected a list literal, got {ast.dump(node)}")
+    return node.elts
+
+def _literal(node: ast.expr) -> Any:
+    """Get the value of a constant, or the member name of a ``DataType.X`` reference."""
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ast.literal_eval(node)
+
+def _field_from_call(node: ast.expr) -> SchemaField:
+    """Build a SchemaField from a ``FieldSchema(...)`` call node."""
+    if not (isinstance(node, ast.Call) and _call_name(node) == 'FieldSchema'):
+        raise ValueError(f"Expected a FieldSchema call, got {ast.dump(node)}")
+    
+    # FieldSchema takes name and dtype positionally
+    params = dict(zip(('name', 'dtype'), (_literal(arg) for arg in node.args)))
+    for keyword in node.keywords:
+        if keyword.arg in _FIELD_SCHEMA_PARAMETERS:
+            params[keyword.arg] = _literal(keyword.value)
+    
+    return SchemaField(
+        name=params['name'],
+        dtype=params['dtype'],
+        max_length=params.get('max_length'),
+        dim=params.get('dim'),
+        is_primary=bool(params.get('is_primary', False))
+    )
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    """Get the trailing name of the function a call node invokes."""
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
 class SchemaHistory:
     """Tracks schema history for Milvus collections."""
     
@@ -30,6 +135,45 @@ class SchemaHistory:
         self.history_dir = history_dir
         self.migrations_dir = migrations_dir
         os.makedirs(history_dir, exist_ok=True)
+        
+        # Field changes read from each migration file, loaded from disk on first use
+        self._mig_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        # Whether the migration cache has entries that are not on disk yet
+        self._mig_cache_dirty = False
+        # Fields built from migrations per model, with the migration stamps they came from
+        self._built_fields: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], List[SchemaField]]] = {}
+
+    def _applied_migrations_file(self) -> str:
+        return os.path.join(self.history_dir, MIGRATION_CACHE_DIR, APPLIED_MIGRATIONS_FILE)
+
+    def _load_applied_migrations(self) -> Dict[str, List[str]]:
+        """Load the applied migrations of every database from disk."""
+        try:
+            return _load_json(self._applied_migrations_file())
+        except (OSError, ValueError):
+            return {}
+
+    def applied_migrations(self) -> List[str]:
+        """Get the file names of migrations that have already been applied to the current database.
+        
+        Applied migrations are local state, kept per Milvus host, port and
+        database name in the git-ignored migration cache directory, so a
+        fresh checkout or another database starts with nothing applied.
+        """
+        return list(self._load_applied_migrations().get(_database_key(), []))
+
+    def mark_applied(self, migration_names: List[str]):
+        """Record migrations as applied to the current database.
+        
+        Args:
+            migration_names: File names of the migrations that were applied
+        """
+        all_applied = self._load_applied_migrations()
+        applied = all_applied.setdefault(_database_key(), [])
+        applied.extend(name for name in migration_names if name not in applied)
+        
+        self._ensure_cache_dir()
+        _dump_json(self._applied_migrations_file(), all_applied)
 
     def get_model_schema_filename(self, model_cls: Type[MilvusModel]) -> str:
         """Get the path to a model's schema file."""
@@ -54,9 +198,7 @@ class SchemaHistory:
             return None
             
         # Load schema from history file
-        with open(history_file, 'r') as f:
-            data = json.load(f)
-            return Schema.from_dict(data)
+        return Schema.from_dict(_load_json(history_file))
 
     def save_model_schema(self, schema: Schema):
         """Save schema history for a specific model."""
@@ -68,9 +210,7 @@ class SchemaHistory:
         # Load existing data to preserve version if it exists
         current_version = 0
         if os.path.exists(history_file):
-            with open(history_file, 'r') as f:
-                existing_data = json.load(f)
-                current_version = existing_data.get("version", 0)
+            current_version = _load_json(history_file).get("version", 0)
         
         # Create new data with version
         data = schema.to_dict()
@@ -80,9 +220,8 @@ class SchemaHistory:
         # Ensure directory exists
         os.makedirs(os.path.dirname(history_file), exist_ok=True)
         
-        with open(history_file, 'w') as f:
-            json.dump(data, f, indent=2)
-            
+        _dump_json(history_file, data)
+        
         # Update the schema object with the new version
         schema.version = data["version"]
 
@@ -96,11 +235,20 @@ class SchemaHistory:
             is_migration_collection=getattr(model_class, 'is_migration_collection', False)
         )
         
-        # Apply all migrations in order
+        # Reuse the previous build while no migration file has changed
         migrations = self.get_migrations()
+        stamps = tuple(_file_stamp(migration_file) for migration_file in migrations)
+        built = self._built_fields.get(schema.name)
+        if built is not None and built[0] == stamps:
+            schema.fields = list(built[1])
+            return schema
+        
+        # Apply all migrations in order, then write the parsed ones to the cache once
         for migration_file in migrations:
             schema = self.apply_migration_to_schema(schema, migration_file)
+        self._save_migration_cache()
         
+        self._built_fields[schema.name] = (stamps, list(schema.fields))
         return schema
     
     def build_initial_schema(self, model_cls: Type[MilvusModel]) -> Schema:
@@ -133,177 +281,167 @@ class SchemaHistory:
         if not os.path.exists(self.migrations_dir):
             return []
         
-        migrations = []
-        for filename in sorted(os.listdir(self.migrations_dir)):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                migrations.append(os.path.join(self.migrations_dir, filename))
+        with os.scandir(self.migrations_dir) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and entry.name.endswith('.py') and not entry.name.startswith('__')
+            ]
+        names.sort()
         
-        return migrations
+        return [os.path.join(self.migrations_dir, name) for name in names]
 
     def apply_migration_to_schema(self, schema: Schema, migration_file: str) -> Schema:
         """Apply a migration to a schema without executing it."""
         try:
-            # Import migration module
-            module_name = os.path.splitext(os.path.basename(migration_file))[0]
-            spec = importlib.util.spec_from_file_location(module_name, migration_file)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            add_fields, drop_fields = self._extract_migration_ops(migration_file)
             
-            # Find migration class
-            migration_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if isinstance(attr, type) and attr.__name__.startswith('Migration_'):
-                    migration_class = attr
-                    break
-            
-            if not migration_class:
+            # Process drop fields first, then add fields
+            if not drop_fields and not add_fields:
                 return schema
+            dropped = set(drop_fields)
+            if dropped:
+                fields = [f for f in schema.fields if f.name not in dropped]
+            else:
+                fields = list(schema.fields)
+            fields.extend(add_fields)
+            schema.fields = fields
             
-            # Get the up() method source code
-            up_method = getattr(migration_class, 'up')
-            source = inspect.getsource(up_method)
-            
-            # Parse the migration code to find schema changes
-            lines = [line.strip() for line in re.split(r'[\(\),\[\]\n]', source) if line.strip()][1:]
-
-            add_fields = []
-            drop_fields = []
-            current_field = []
-            is_altering_schema = False
-            is_building_field = False
-            mode: Optional[Literal['add', 'drop']] = None
-
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-                line = line.replace("'", '"')
-                i += 1
-                
-                if 'alter_schema' in line:
-                    is_altering_schema = True
-                    # Reset state when starting a new alter_schema
-                    if current_field and mode == 'add':
-                        field_def = "FieldSchema(" + ", ".join(current_field) + ")"
-                        add_fields.append(field_def)
-                    current_field = []
-                    is_building_field = False
-                    mode = None
-                elif not is_altering_schema:
-                    continue
-                # Handle add_fields
-                elif 'add_fields=' in line:
-                    mode = 'add'
-                    current_field = []
-                elif 'drop_fields=' in line:
-                    mode = 'drop'
-                    current_field = []
-                elif 'FieldSchema' in line:
-                    # Start collecting a new field
-                    if current_field:  # If we have a field in progress, save it
-                        if mode == 'add':
-                            field_def = "FieldSchema(" + ", ".join(current_field) + ")"
-                            add_fields.append(field_def)
-                        elif mode == 'drop':
-                            drop_fields.extend(current_field)
-                    current_field = []
-                    is_building_field = True
-                elif is_building_field and mode == 'add' and self._is_field_schema_parameter(line):
-                    current_field.append(line)
-                elif mode == 'drop' and '"' in line:
-                    # Extract field name from quoted string
-                    field_name = line.strip().strip('"')
-                    if field_name:
-                        drop_fields.append(field_name)
-            
-            # Add the last field if we have one
-            if current_field:
-                if mode == 'add':
-                    field_def = "FieldSchema(" + ", ".join(current_field) + ")"
-                    add_fields.append(field_def)
-
-            # Process drop fields first
-            for field_name in drop_fields:
-                schema.fields = [f for f in schema.fields if f.name != field_name]
-
-            # Then process add fields
-            for field_str in add_fields:
-                field = self._parse_field_schema(field_str)
-                if field:
-                    schema.fields.append(field)
-                else:
-                    raise Exception(f"Failed to parse field schema: {field_str}")
-                
             return schema
         except Exception as e:
             print(f"Error applying migration {migration_file}: {e}")
             return schema
-        
-    def _is_field_schema_parameter(self, line: str) -> bool:
-        valid_parameters = ['name=', 'dtype=', 'max_length=', 'dim=', 'is_primary=', 'is_partition_key=', 'is_clustering_key=', 'default_value=', 'element_type=', 'mmap_enabled=']
-        under_test = line.strip().split('=')[0] + '='
-        return under_test in valid_parameters
 
-    def _parse_field_schema(self, field_def: str) -> Optional[SchemaField]:
-        """Parse a FieldSchema definition string into a SchemaField object."""
+    def _migration_cache_file(self) -> str:
+        return os.path.join(self.history_dir, MIGRATION_CACHE_DIR, "migrations.json")
+
+    def _load_migration_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the migration cache from disk, once per instance."""
+        if self._mig_cache is None:
+            try:
+                self._mig_cache = _load_json(self._migration_cache_file())
+            except (OSError, ValueError):
+                self._mig_cache = {}
+        return self._mig_cache
+
+    def _ensure_cache_dir(self):
+        """Create the migration cache directory, ignored by version control."""
+        cache_dir = os.path.join(self.history_dir, MIGRATION_CACHE_DIR)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+            # The cache is local state, keep it out of version control
+            with open(os.path.join(cache_dir, ".gitignore"), 'w') as f:
+                f.write("*\n")
+
+    def _save_migration_cache(self):
+        """Write the migration cache to disk if it has new entries.
+        
+        The cache only saves work, so a failed write is logged and ignored.
+        """
+        if not self._mig_cache_dirty:
+            return
         try:
-            # Extract field parameters
-            params = {}
-            
-            # Get name
-            name_start = field_def.index('name="') + 6
-            name_end = field_def.index('"', name_start)
-            params['name'] = field_def[name_start:name_end]
-            
-            # Get dtype
-            dtype_start = field_def.index('DataType.') + 9
-            dtype_end = field_def.find(',', dtype_start)
-            if dtype_end == -1:  # No comma found, look for closing parenthesis
-                dtype_end = field_def.find(')', dtype_start)
-            params['dtype'] = field_def[dtype_start:dtype_end].strip()
-            
-            # Get max_length if present
-            if 'max_length=' in field_def:
-                max_len_start = field_def.index('max_length=') + 10
-                max_len_end = field_def.find(',', max_len_start)
-                if max_len_end == -1:  # No comma found, look for closing parenthesis
-                    max_len_end = field_def.find(')', max_len_start)
-                max_len_str = field_def[max_len_start:max_len_end].strip().split('=')[-1]  # Take value after any =
-                params['max_length'] = int(max_len_str)
-            
-            # Get dim if present
-            if 'dim=' in field_def:
-                dim_start = field_def.index('dim=') + 4
-                dim_end = field_def.find(',', dim_start)
-                if dim_end == -1:  # No comma found, look for closing parenthesis
-                    dim_end = field_def.find(')', dim_start)
-                dim_str = field_def[dim_start:dim_end].strip().split('=')[-1]  # Take value after any =
-                params['dim'] = int(dim_str)
+            self._ensure_cache_dir()
+            _dump_json(self._migration_cache_file(), self._mig_cache, indent=False)
+        except OSError as e:
+            logger.warning(f"Could not write migration cache: {e}")
+            return
+        self._mig_cache_dirty = False
+
+    def _extract_migration_ops(self, migration_file: str) -> Tuple[List[SchemaField], List[str]]:
+        """Find the fields a migration adds and drops.
+        
+        Results are cached keyed by the file's mtime and size, so an
+        unchanged migration is only parsed once. New entries are written to
+        disk by _save_migration_cache.
+        
+        Args:
+            migration_file: Path to the migration file
             
-            # Get is_primary if present
-            params['is_primary'] = 'is_primary=True' in field_def
+        Returns:
+            Tuple of (added fields, names of dropped fields)
             
-            return SchemaField(**params)
-        except Exception as e:
-            print(f"Error parsing field schema: {e}")
-            return None
+        Raises:
+            SyntaxError: If the migration is not valid Python
+            ValueError: If an alter_schema call cannot be read
+        """
+        _, mtime_ns, size = _file_stamp(migration_file)
+        cache = self._load_migration_cache()
+        entry = cache.get(migration_file)
+        if entry is not None and entry["mtime_ns"] == mtime_ns and entry["size"] == size:
+            return [SchemaField.from_dict(field) for field in entry["add"]], list(entry["drop"])
+        
+        add_fields, drop_fields = self._parse_migration_ops(migration_file)
+        cache[migration_file] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "add": [field.to_dict() for field in add_fields],
+            "drop": drop_fields
+        }
+        # Written by build_model_schema_from_migrations after all migrations are read
+        self._mig_cache_dirty = True
+        return add_fields, drop_fields
+
+    def _parse_migration_ops(self, migration_file: str) -> Tuple[List[SchemaField], List[str]]:
+        """Find the fields a migration adds and drops by parsing its source.
+        
+        Only ``alter_schema`` calls inside the ``up`` method of the
+        ``Migration_*`` class are considered.
+        """
+        add_fields: List[SchemaField] = []
+        drop_fields: List[str] = []
+        
+        with open(migration_file, 'rb') as f:
+            source = f.read()
+        # Initial migrations create their collection without alter_schema, skip parsing those
+        if b'alter_schema' not in source:
+            return add_fields, drop_fields
+        tree = ast.parse(source, filename=migration_file)
+        
+        up_method = _find_up_method(tree)
+        if up_method is None:
+            return add_fields, drop_fields
+        
+        for node in ast.walk(up_method):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == 'alter_schema'):
+                continue
+            for keyword in node.keywords:
+                if keyword.arg == 'add_fields':
+                    add_fields.extend(_field_from_call(elt) for elt in _list_elements(keyword.value))
+                elif keyword.arg == 'drop_fields':
+                    drop_fields.extend(_literal(elt) for elt in _list_elements(keyword.value))
+        
+        return add_fields, drop_fields
+
+    def _built_vs_history(self, model_class: Type[MilvusModel]) -> Tuple[Schema, bool]:
+        """Compare the schema built from migrations with the one in a model's history.
+        
+        The history is read through Schema.from_dict, so fields written by hand
+        with default values compare equal to the built ones. The saved version
+        is not compared, the built schema does not have one.
+        
+        Returns:
+            Tuple of (schema from migrations, whether it differs from history)
+        """
+        new_schema = self.build_model_schema_from_migrations(model_class)
+        current = self.get_schema_from_history(model_class)
+        if current is None:
+            return new_schema, True
+        return new_schema, _schema_content(current) != _schema_content(new_schema)
 
     def update_model_schema(self, model_class: Type[MilvusModel]) -> Schema:
         """Update schema for a single model."""
-        current = self.get_schema_from_history(model_class)
-        new_schema = self.build_model_schema_from_migrations(model_class)
+        new_schema, changed = self._built_vs_history(model_class)
         
-        if current.to_dict() != new_schema.to_dict():
+        if changed:
             self.save_model_schema(new_schema)
             
         return new_schema
 
     def schema_changed(self, model_class: Type[MilvusModel]) -> bool:
         """Check if a model's schema has changed from history."""
-        current = self.get_schema_from_history(model_class)
-        new_schema = self.build_model_schema_from_migrations(model_class)
-        
-        return current.to_dict() != new_schema.to_dict()
+        return self._built_vs_history(model_class)[1]
 
     def save_schema_to_history(self, schema: Schema):
         """Save schema to history.
@@ -312,5 +450,4 @@ class SchemaHistory:
             schema: Schema to save
         """
         history_file = os.path.join(self.history_dir, f"{schema.collection_name}.json")
-        with open(history_file, 'w') as f:
-            json.dump(schema.to_dict(), f, indent=2)
+        _dump_json(history_file, schema.to_dict())
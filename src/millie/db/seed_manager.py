@@ -1,18 +1,36 @@
 """Manager for discovering and running Milvus seeders."""
 import os
-import glob
+import logging
 import importlib.util
 import ast
-from typing import Callable, List, Dict, Any, Union, Type
-from collections import defaultdict
+from typing import Callable, FrozenSet, List, Dict, Any, Tuple, Union, Type
+from collections import OrderedDict, defaultdict
 
+from .file_discovery import iter_py_files
 from .milvus_seeder import _SEEDERS, milvus_seeder
 from .session import MilvusSession
-from ..orm.milvus_model import MilvusModel
+from ..orm.milvus_model import MilvusModel, invalidate_cached_results
+
+logger = logging.getLogger(__name__)
+
+# Number of entities sent to Milvus per request, overridable with MILLIE_SEED_BATCH
+DEFAULT_SEED_BATCH_SIZE = 1000
+
+def _seed_batch_size() -> int:
+    """Get the number of entities per upsert request from MILLIE_SEED_BATCH or the default."""
+    value = os.getenv('MILLIE_SEED_BATCH', DEFAULT_SEED_BATCH_SIZE)
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise ValueError(f"MILLIE_SEED_BATCH must be an integer, got {value!r}") from None
 
 class SeedManager:
     """Manages seeding of Milvus collections."""
     
+    # Seeders found per working directory, with the file stamps they were found from
+    _discovery_cache: "OrderedDict[str, Tuple[FrozenSet[Tuple[str, int, int]], List[Callable]]]" = OrderedDict()
+    _DISCOVERY_CACHE_SIZE = 8
+    
     def __init__(self, cwd: str = None):
         """Initialize the seed manager.
         
@@ -31,22 +49,26 @@ class SeedManager:
             True if the file contains a seeder, False otherwise
         """
         try:
-            with open(file_path, 'r') as f:
-                tree = ast.parse(f.read(), filename=file_path)
-                
-            for node in ast.walk(tree):
+            with open(file_path, 'rb') as f:
+                source = f.read()
+            
+            # Cheap byte scan first, only files that mention the decorator are parsed
+            if b'milvus_seeder' not in source:
+                return False
+            tree = ast.parse(source, filename=file_path)
+            
+            # Seeders are module-level functions, nested definitions are not visited
+            for node in tree.body:
                 if isinstance(node, ast.FunctionDef):
                     for decorator in node.decorator_list:
                         if isinstance(decorator, ast.Name) and decorator.id == 'milvus_seeder':
-                            print(f"Found seeder function {node.name} in {file_path}")
                             return True
                         elif isinstance(decorator, ast.Call):
                             if isinstance(decorator.func, ast.Name) and decorator.func.id == 'milvus_seeder':
-                                print(f"Found seeder function {node.name} in {file_path}")
                                 return True
             return False
         except Exception as e:
-            print(f"Error checking for seeder in {file_path}: {e}")
+            logger.debug(f"Error checking for seeder in {file_path}: {e}")
             return False
         
     def discover_seeders(self) -> List[Callable]:
@@ -57,23 +79,30 @@ class SeedManager:
         """
         # Clear existing seeders before discovery
         _SEEDERS.clear()
-        print(f"\nScanning for seeders in {self.cwd}")
+        logger.debug(f"Scanning for seeders in {self.cwd}")
         
         # Add current working directory and src directory to Python path
         import sys
         if self.cwd not in sys.path:
             sys.path.insert(0, self.cwd)
-            print(f"Added {self.cwd} to Python path")
             
         # Also add the parent directory to handle package imports
         parent_dir = os.path.dirname(self.cwd)
         if parent_dir not in sys.path:
             sys.path.insert(0, parent_dir)
-            print(f"Added {parent_dir} to Python path")
             
-        # Find all Python files recursively
-        python_files = list(glob.glob(os.path.join(self.cwd, "**/*.py"), recursive=True))
-        print(f"\nFound {len(python_files)} Python files to scan")
+        # Find all Python files recursively, skipping virtualenvs and installed packages
+        python_files = list(iter_py_files(self.cwd))
+        logger.debug(f"Found {len(python_files)} Python files to scan")
+        
+        # Reuse the previous discovery if no Python file was added, removed or changed
+        signature = self._files_signature(python_files)
+        cached = self._discovery_cache.get(self.cwd)
+        if cached is not None and cached[0] == signature:
+            self._discovery_cache.move_to_end(self.cwd)
+            _SEEDERS.update((seeder.__name__, seeder) for seeder in cached[1])
+            logger.info(f"Reusing {len(cached[1])} seeders, no files changed")
+            return list(cached[1])
         
         # Clear sys.modules of any previously imported seeder modules
         for module_name in list(sys.modules.keys()):
@@ -81,14 +110,6 @@ class SeedManager:
                 del sys.modules[module_name]
         
         for file_path in python_files:
-            if not os.path.isfile(file_path):
-                continue
-                
-            # Skip files in venv directories
-            if "venv" in file_path or "site-packages" in file_path:
-                continue
-                
-            print(f"\nChecking {file_path}")
             # Only process files that have the milvus_seeder decorator
             if not self._has_seeder_decorator(file_path):
                 continue
@@ -96,7 +117,6 @@ class SeedManager:
             try:
                 # Import the module
                 module_name = f"seeder_{os.path.splitext(os.path.basename(file_path))[0]}"
-                print(f"Importing module {module_name} from {file_path}")
                 spec = importlib.util.spec_from_file_location(module_name, file_path)
                 if not spec or not spec.loader:
                     continue
@@ -106,11 +126,27 @@ class SeedManager:
                 spec.loader.exec_module(module)
                 
             except Exception as e:
-                print(f"Warning: Failed to process {file_path}: {e}")
+                logger.warning(f"Failed to process {file_path}: {e}")
                 
         seeders = list(_SEEDERS.values())
-        print(f"\nDiscovered {len(seeders)} seeders: {[s.__name__ for s in seeders]}")
+        logger.info(f"Discovered {len(seeders)} seeders: {[s.__name__ for s in seeders]}")
+        
+        self._discovery_cache[self.cwd] = (signature, list(seeders))
+        self._discovery_cache.move_to_end(self.cwd)
+        if len(self._discovery_cache) > self._DISCOVERY_CACHE_SIZE:
+            self._discovery_cache.popitem(last=False)
         return seeders
+    
+    def _files_signature(self, python_files: List[str]) -> FrozenSet[Tuple[str, int, int]]:
+        """Get the (path, mtime_ns, size) of every file that would be scanned."""
+        stamps = []
+        for file_path in python_files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            stamps.append((file_path, st.st_mtime_ns, st.st_size))
+        return frozenset(stamps)
         
     def run_seeders(self) -> Dict[str, Any]:
         """Run all discovered seeders.
@@ -118,10 +154,13 @@ class SeedManager:
         Returns:
             Dictionary mapping seeder names to their results
         """
+        # Checked before any seeder runs, so a bad setting does not waste their work
+        batch_size = _seed_batch_size()
+        
         # First discover all seeder functions
         seeders = self.discover_seeders()
         if not seeders:
-            print("No seeders found.")
+            logger.info("No seeders found.")
             return {}
             
         results = {}
@@ -133,7 +172,7 @@ class SeedManager:
         # First run all seeders and collect their entities
         for seeder in seeders:
             try:
-                print(f"\nRunning seeder: {seeder.__name__}")
+                logger.debug(f"Running seeder: {seeder.__name__}")
                 seeded_entities = seeder()
                 
                 # Skip if seeder returned None
@@ -142,26 +181,32 @@ class SeedManager:
                         "status": "success",
                         "count": 0
                     }
-                    print(f"✅ {seeder.__name__} completed successfully (no entities)")
                     continue
                 
                 # Handle both single entities and lists
                 if not isinstance(seeded_entities, list):
                     seeded_entities = [seeded_entities]
                 
-                # Group entities by their collection
+                # Group entities by their collection, seeders usually return a single model
+                # class so its type check and collection name are looked up once
+                first_cls = seeded_entities[0].__class__ if seeded_entities else None
+                first_collection = None
+                if first_cls is not None and issubclass(first_cls, MilvusModel):
+                    first_collection = first_cls.collection_name()
                 for entity in seeded_entities:
-                    if not isinstance(entity, MilvusModel):
-                        raise TypeError(f"Seeder {seeder.__name__} returned invalid entity type: {type(entity)}")
-                    collection_name = entity.__class__.collection_name()
-                    print(f"Adding entity to collection {collection_name}")
+                    cls = entity.__class__
+                    if first_collection is not None and cls is first_cls:
+                        collection_name = first_collection
+                    else:
+                        if not issubclass(cls, MilvusModel):
+                            raise TypeError(f"Seeder {seeder.__name__} returned invalid entity type: {cls}")
+                        collection_name = cls.collection_name()
                     entities_by_collection[collection_name].append(entity)
                     
                 results[seeder.__name__] = {
                     "status": "success",
                     "count": len(seeded_entities)
                 }
-                print(f"✅ {seeder.__name__} completed successfully")
                 
             except Exception as e:
                 error_msg = f"Error: {str(e)}"
@@ -169,15 +214,14 @@ class SeedManager:
                     "status": "error",
                     "error": error_msg
                 }
-                print(f"❌ {seeder.__name__}: {error_msg}")
+                logger.error(f"{seeder.__name__}: {error_msg}")
                 continue
         
-        print(f"\nProcessing entities for {len(entities_by_collection)} collections: {list(entities_by_collection.keys())}")
+        logger.debug(f"Processing entities for {len(entities_by_collection)} collections: {list(entities_by_collection.keys())}")
         
         # Now upsert all entities into their respective collections
         for collection_name, entities in entities_by_collection.items():
             try:
-                print(f"\nProcessing collection {collection_name} with {len(entities)} entities")
                 # Get the model class from the first entity
                 model_class = entities[0].__class__
                 
@@ -188,19 +232,14 @@ class SeedManager:
                 # Get collection and prepare entities for upsert
                 collection = session.get_milvus_collection(model_class)
                 
-                # Group entities by their IDs for upsert
                 entity_dicts = [entity.to_dict() for entity in entities]
-                ids = [entity["id"] for entity in entity_dicts]
-                
-                # Delete existing entities with these IDs
-                if ids:
-                    expr = 'id in ["' + '","'.join(ids) + '"]'
-                    collection.delete(expr)
                 
-                # Insert all entities
-                collection.insert(entity_dicts)
+                # Send large seed sets in batches rather than as one huge request
+                for start in range(0, len(entity_dicts), batch_size):
+                    # Replace existing entities and insert new ones in a single call
+                    collection.upsert(entity_dicts[start:start + batch_size])
                     
-                print(f"✅ Upserted {len(entities)} entities into {collection_name}")
+                logger.info(f"Upserted {len(entities)} entities into {collection_name}")
                 
             except Exception as e:
                 error_msg = f"Error upserting into {collection_name}: {str(e)}"
@@ -208,6 +247,9 @@ class SeedManager:
                     "status": "error",
                     "error": error_msg
                 }
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
+            finally:
+                # Earlier batches may have been written even if a later one failed
+                invalidate_cached_results(collection_name)
                 
         return results 
\ No newline at end of file
@@ -1,28 +1,75 @@
 """Milvus session management."""
 import os
-from typing import Type, List, Dict, Optional, TypeVar, Union
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Type, List, Dict, Optional, Set, TypeVar, Union
 from pymilvus import Collection, CollectionSchema, FieldSchema, DataType, utility
+from pymilvus.client.types import LoadState
 import logging
 from dotenv import load_dotenv
 
 from millie.db.connection import MilvusConnection
-from millie.orm.milvus_model import MilvusModel
+from millie.orm.milvus_model import MilvusModel, invalidate_cached_results
 
 load_dotenv()
 
 T = TypeVar('T', bound=MilvusModel)
 logger = logging.getLogger(__name__)
 
+# Largest nlist Milvus accepts for IVF indexes
+MAX_NLIST = 65536
+
+# Most collections dropped at the same time by drop_all_collections
+MAX_DROP_WORKERS = 16
+
+def default_index_params(expected_size: Optional[int] = None, index_type: str = "IVF_FLAT") -> Dict[str, Any]:
+    """Get IVF index parameters for a collection of the given size.
+    
+    nlist follows the usual 4 * sqrt(n) rule, so small collections are not
+    over-partitioned and large ones are not under-partitioned. Without an
+    expected size nlist is 1024.
+    
+    Pass index_type="IVF_SQ8" to store the index with 8-bit scalar quantized
+    vectors, which takes about a quarter of the memory of IVF_FLAT.
+    """
+    nlist = 1024
+    if expected_size is not None:
+        nlist = min(MAX_NLIST, max(16, int(4 * math.sqrt(expected_size))))
+    return {
+        "metric_type": "L2",
+        "index_type": index_type,
+        "params": {"nlist": nlist}
+    }
+
 class MilvusSession:
-    """Manages Milvus database operations."""
+    """Manages Milvus database operations.
+    
+    Sessions are lightweight handles over the process-wide MilvusConnection.
+    A connection opened by a session is closed when the last open session is
+    closed, one the application opened itself stays open.
+    """
     
     def __init__(self, host: str = os.getenv('MILVUS_HOST', 'localhost'), port: int = int(os.getenv('MILVUS_PORT', 19530)), db_name: str = os.getenv('MILVUS_DB_NAME', 'default')):
-        self.connection = MilvusConnection(host, port, db_name)
+        self.connection = MilvusConnection.for_session(host, port, db_name)
+        self._closed = False
+        # Names of collections this session knows to be loaded into memory
+        self._loaded: Set[str] = set()
     
-    def get_milvus_collection(self, model_class: Type[T]) -> Collection:
-        """Get or create a collection for a model class."""
+    def get_milvus_collection(self, model_class: Type[T], index_params: Optional[Dict[str, Any]] = None) -> Collection:
+        """Get or create a collection for a model class.
+        
+        Args:
+            model_class: Model class of the collection
+            index_params: Index parameters for the embedding field when the collection
+                is created. Defaults to the model's index_params, or IVF_FLAT parameters
+                sized by the model's expected_size.
+        """
         collection_name = model_class.collection_name()
         
+        # A cached handle means the collection is known to exist, skip the round trip
+        if MilvusConnection.is_cached(collection_name):
+            return MilvusConnection.get_collection(collection_name)
+        
         # Check if collection exists
         if not utility.has_collection(collection_name):
             # Create collection with schema
@@ -33,12 +80,13 @@ class MilvusSession:
             )
             collection.create_index(
                 field_name="embedding",
-                index_params={
-                    "metric_type": "L2",
-                    "index_type": "IVF_FLAT",
-                    "params": {"nlist": 1024}
-                }
+                index_params=(
+                    index_params
+                    or getattr(model_class, 'index_params', None)
+                    or default_index_params(getattr(model_class, 'expected_size', None))
+                )
             )
+            MilvusConnection.cache_collection(collection_name, collection)
             logger.info(f"Created collection {collection_name}")
         
         # Get collection from cache
@@ -58,20 +106,37 @@ class MilvusSession:
             logger.info("No collections found to drop")
             return
         
+        # Each drop is a round trip to the server, so they are sent concurrently
+        try:
+            with ThreadPoolExecutor(max_workers=min(MAX_DROP_WORKERS, len(collections))) as executor:
+                list(executor.map(utility.drop_collection, collections))
+        finally:
+            invalidate_cached_results()
+        
         for collection in collections:
-            utility.drop_collection(collection)
+            MilvusConnection.remove_collection(collection)
+            self._loaded.discard(collection)
             logger.info(f"Dropped collection: {collection}")
     
     def close(self):
-        """Close the session."""
-        self.connection.close()
+        """Close the session, and the connection if no other session uses it."""
+        if self._closed:
+            return
+        self._closed = True
+        self.connection.release()
+    
+    def __enter__(self) -> 'MilvusSession':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def init_collection(self, model_class: Type[T]):
+    def init_collection(self, model_class: Type[T], index_params: Optional[Dict[str, Any]] = None):
         """Initialize all collections for registered models."""
         logger.info(f"Initializing collection {model_class.collection_name()}...")
         
         try:
-            self.get_milvus_collection(model_class)
+            self.get_milvus_collection(model_class, index_params)
             logger.info(f"Initialized collection for {model_class.collection_name()}")
         except Exception as e:
             logger.error(f"Failed to initialize collection for {model_class.collection_name()}: {str(e)}")
@@ -83,17 +148,49 @@ class MilvusSession:
         try:
             milvus_collection = self.get_milvus_collection(model_class)
             milvus_collection.load()
+            self._loaded.add(model_class.collection_name())
             logger.info(f"Loaded collection for {model_class.collection_name()}")
         except Exception as e:
             logger.error(f"Failed to load collection for {model_class.collection_name()}: {str(e)}")
             raise
 
+    def flush_collection(self, model_class: Type[T]):
+        """Flush a collection's pending writes.
+        
+        Inserts and deletes are not flushed individually, flush once at the
+        end of an ingest instead.
+        """
+        logger.info(f"Flushing collection {model_class.collection_name()}...")
+        try:
+            milvus_collection = self.get_milvus_collection(model_class)
+            milvus_collection.flush()
+            logger.info(f"Flushed collection for {model_class.collection_name()}")
+        except Exception as e:
+            logger.error(f"Failed to flush collection for {model_class.collection_name()}: {str(e)}")
+            raise
+
+    def ensure_loaded(self, model_class: Type[T]) -> Collection:
+        """Load a collection unless it is already loaded, and return it.
+        
+        Collections stay loaded until unload_collection() is called, so
+        repeated searches and queries do not reload their segments.
+        """
+        collection_name = model_class.collection_name()
+        milvus_collection = self.get_milvus_collection(model_class)
+        if collection_name not in self._loaded:
+            # Another process may have loaded it already
+            if utility.load_state(collection_name) != LoadState.Loaded:
+                milvus_collection.load()
+            self._loaded.add(collection_name)
+        return milvus_collection
+
     def unload_collection(self, model_class: Type[T]):
         """Unload a collection."""
         logger.info(f"Unloading collection {model_class.collection_name()}...")
         try:
-            milvus_collection = Collection(model_class.collection_name())
+            milvus_collection = MilvusConnection.get_collection(model_class.collection_name())
             milvus_collection.release()
+            self._loaded.discard(model_class.collection_name())
             logger.info(f"Unloaded collection for {model_class.collection_name()}")
         except Exception as e:
             logger.error(f"Failed to unload collection for {model_class.collection_name()}: {str(e)}")
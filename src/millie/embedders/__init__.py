@@ -4,12 +4,22 @@ from .openai import (
     generate_embedding_text_embedding_3_small,
     generate_embedding_text_embedding_3_large,
     generate_embedding_text_embedding_ada_002,
+    generate_embeddings_text_embedding_3_small,
+    generate_embeddings_text_embedding_3_large,
+    generate_embeddings_text_embedding_ada_002,
+)
+from .sentence_transformers import (
+    generate_embedding_all_MiniLM_L6_v2,
+    generate_embeddings_all_MiniLM_L6_v2,
 )
-from .sentence_transformers import generate_embedding_all_MiniLM_L6_v2
 
 __all__ = [
     "generate_embedding_text_embedding_3_small",
     "generate_embedding_text_embedding_3_large",
     "generate_embedding_text_embedding_ada_002",
+    "generate_embeddings_text_embedding_3_small",
+    "generate_embeddings_text_embedding_3_large",
+    "generate_embeddings_text_embedding_ada_002",
     "generate_embedding_all_MiniLM_L6_v2",
+    "generate_embeddings_all_MiniLM_L6_v2",
 ]
\ No newline at end of file
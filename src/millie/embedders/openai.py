@@ -1,5 +1,7 @@
 """RAG operations manager."""
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import logging
 
@@ -11,13 +13,20 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-def generate_embedding_text_embedding_3_small(text: str) -> List[float]:
-    """Generate an embedding for a text string.
+# Texts sent per embeddings request, the API accepts up to 2048
+DEFAULT_EMBEDDING_BATCH_SIZE = 512
+
+# Embeddings requests sent at once when there is more than one batch
+DEFAULT_EMBEDDING_WORKERS = 4
+
+@functools.lru_cache(maxsize=None)
+def _client_for_key(api_key: str) -> "OpenAI":
+    """Get the OpenAI client for an API key, created once so its connections are reused."""
+    return OpenAI(api_key=api_key)
+
+def _get_client() -> "OpenAI":
+    """Get the shared OpenAI client.
     
-    Args:
-        text: Text to generate embedding for
-    Returns:
-        List of floats representing the embedding
     Raises:
         ImportError: If OpenAI package is not installed
         ValueError: If OPENAI_API_KEY is not set
@@ -32,16 +41,46 @@ def generate_embedding_text_embedding_3_small(text: str) -> List[float]:
     if openai_key is None:
         raise ValueError("OPENAI_API_KEY is not set")
     
-    client = OpenAI(api_key=openai_key)
-    response = client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
+    return _client_for_key(openai_key)
+
+def _generate_embeddings(model: str, texts: List[str], batch_size: int, max_workers: int) -> List[List[float]]:
+    """Embed texts with an OpenAI model, in batches sent concurrently."""
+    client = _get_client()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    
+    def embed(batch: List[str]) -> List[List[float]]:
+        response = client.embeddings.create(model=model, input=batch)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
     
-    return response.data[0].embedding
+    if len(batches) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            results = list(executor.map(embed, batches))
+    else:
+        results = [embed(batch) for batch in batches]
+    
+    return [embedding for batch in results for embedding in batch]
 
-def generate_embedding_text_embedding_3_large(text: str) -> List[float]:
-    """Generate an embedding for a text string using text-embedding-3-large.
+def generate_embeddings_text_embedding_3_small(
+    texts: List[str],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    max_workers: int = DEFAULT_EMBEDDING_WORKERS
+) -> List[List[float]]:
+    """Generate embeddings for many text strings.
+    
+    Args:
+        texts: Texts to generate embeddings for
+        batch_size: Number of texts sent per request
+        max_workers: Number of requests sent at once
+    Returns:
+        One embedding per text, in the same order
+    Raises:
+        ImportError: If OpenAI package is not installed
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    return _generate_embeddings("text-embedding-3-small", texts, batch_size, max_workers)
+
+def generate_embedding_text_embedding_3_small(text: str) -> List[float]:
+    """Generate an embedding for a text string.
     
     Args:
         text: Text to generate embedding for
@@ -51,23 +90,58 @@ def generate_embedding_text_embedding_3_large(text: str) -> List[float]:
         ImportError: If OpenAI package is not installed
         ValueError: If OPENAI_API_KEY is not set
     """
-    if not HAS_OPENAI:
-        raise ImportError(
-            "OpenAI package is not installed. "
-            "Please install it with 'pip install millie[openai]'"
-        )
+    return generate_embeddings_text_embedding_3_small([text])[0]
+
+def generate_embeddings_text_embedding_3_large(
+    texts: List[str],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    max_workers: int = DEFAULT_EMBEDDING_WORKERS
+) -> List[List[float]]:
+    """Generate embeddings for many text strings using text-embedding-3-large.
     
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key is None:
-        raise ValueError("OPENAI_API_KEY is not set")
+    Args:
+        texts: Texts to generate embeddings for
+        batch_size: Number of texts sent per request
+        max_workers: Number of requests sent at once
+    Returns:
+        One embedding per text, in the same order
+    Raises:
+        ImportError: If OpenAI package is not installed
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    return _generate_embeddings("text-embedding-3-large", texts, batch_size, max_workers)
+
+def generate_embedding_text_embedding_3_large(text: str) -> List[float]:
+    """Generate an embedding for a text string using text-embedding-3-large.
     
-    client = OpenAI(api_key=openai_key)
-    response = client.embeddings.create(
-        model="text-embedding-3-large",
-        input=text
-    )
+    Args:
+        text: Text to generate embedding for
+    Returns:
+        List of floats representing the embedding
+    Raises:
+        ImportError: If OpenAI package is not installed
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    return generate_embeddings_text_embedding_3_large([text])[0]
+
+def generate_embeddings_text_embedding_ada_002(
+    texts: List[str],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    max_workers: int = DEFAULT_EMBEDDING_WORKERS
+) -> List[List[float]]:
+    """Generate embeddings for many text strings using text-embedding-ada-002.
     
-    return response.data[0].embedding
+    Args:
+        texts: Texts to generate embeddings for
+        batch_size: Number of texts sent per request
+        max_workers: Number of requests sent at once
+    Returns:
+        One embedding per text, in the same order
+    Raises:
+        ImportError: If OpenAI package is not installed
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    return _generate_embeddings("text-embedding-ada-002", texts, batch_size, max_workers)
 
 def generate_embedding_text_embedding_ada_002(text: str) -> List[float]:
     """Generate an embedding for a text string using text-embedding-ada-002.
@@ -80,20 +154,4 @@ def generate_embedding_text_embedding_ada_002(text: str) -> List[float]:
         ImportError: If OpenAI package is not installed
         ValueError: If OPENAI_API_KEY is not set
     """
-    if not HAS_OPENAI:
-        raise ImportError(
-            "OpenAI package is not installed. "
-            "Please install it with 'pip install millie[openai]'"
-        )
-    
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key is None:
-        raise ValueError("OPENAI_API_KEY is not set")
-    
-    client = OpenAI(api_key=openai_key)
-    response = client.embeddings.create(
-        model="text-embedding-ada-002", 
-        input=text
-    )
-    
-    return response.data[0].embedding
+    return generate_embeddings_text_embedding_ada_002([text])[0]
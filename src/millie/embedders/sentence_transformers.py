@@ -1,6 +1,10 @@
 """Sentence Transformers embedder implementation."""
+import functools
 import logging
-from typing import List
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -10,13 +14,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-def generate_embedding_all_MiniLM_L6_v2(text: str) -> List[float]:
-    """Generate an embedding for a text string using all-MiniLM-L6-v2.
+# Texts encoded together by the model
+DEFAULT_ENCODE_BATCH_SIZE = 64
+
+@functools.lru_cache(maxsize=None)
+def _get_model(name: str) -> "SentenceTransformer":
+    """Load a model once per process, loading it takes seconds.
     
-    Args:
-        text: Text to generate embedding for
-    Returns:
-        List of floats representing the embedding
     Raises:
         ImportError: If sentence-transformers package is not installed
     """
@@ -26,6 +30,34 @@ def generate_embedding_all_MiniLM_L6_v2(text: str) -> List[float]:
             "Please install it with 'pip install millie[sentence-transformers]'"
         )
     
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    embedding = model.encode(text)
-    return embedding.tolist()
\ No newline at end of file
+    return SentenceTransformer(name)
+
+def generate_embeddings_all_MiniLM_L6_v2(texts: List[str], batch_size: int = DEFAULT_ENCODE_BATCH_SIZE) -> "np.ndarray":
+    """Generate embeddings for many text strings using all-MiniLM-L6-v2.
+    
+    The embeddings are returned as a float32 array rather than Python lists.
+    Its rows can be assigned to a model's embedding field and are sent to
+    Milvus without being converted.
+    
+    Args:
+        texts: Texts to generate embeddings for
+        batch_size: Number of texts encoded together
+    Returns:
+        Array of shape (len(texts), dim), one row per text in the same order
+    Raises:
+        ImportError: If sentence-transformers package is not installed
+    """
+    model = _get_model('all-MiniLM-L6-v2')
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True).astype('float32', copy=False)
+
+def generate_embedding_all_MiniLM_L6_v2(text: str) -> List[float]:
+    """Generate an embedding for a text string using all-MiniLM-L6-v2.
+    
+    Args:
+        text: Text to generate embedding for
+    Returns:
+        List of floats representing the embedding
+    Raises:
+        ImportError: If sentence-transformers package is not installed
+    """
+    return generate_embeddings_all_MiniLM_L6_v2([text])[0].tolist()
@@ -8,9 +8,18 @@ T = TypeVar('T')
 FieldType = TypeVar('FieldType')  # Remove the problematic Union with InitVar
 
 class MilvusFieldInfo:
-    """Stores Milvus field configuration."""
+    """Stores Milvus field configuration.
+    
+    The FieldSchema arguments every model reads have their own slots, any
+    other configuration is kept in kwargs.
+    """
+    __slots__ = ('data_type', 'max_length', 'dim', 'is_primary', 'kwargs')
+    
     def __init__(self, data_type: DataType, **kwargs):
         self.data_type = data_type
+        self.max_length: Optional[int] = kwargs.get('max_length')
+        self.dim: Optional[int] = kwargs.get('dim')
+        self.is_primary: bool = kwargs.get('is_primary', False)
         self.kwargs = kwargs
         
     @property
@@ -20,8 +29,10 @@ class MilvusFieldInfo:
         
     def __getattr__(self, name):
         """Get additional field configuration."""
-        if name in self.kwargs:
-            return self.kwargs[name]
+        # Only called for names without a slot
+        kwargs = object.__getattribute__(self, 'kwargs')
+        if name in kwargs:
+            return kwargs[name]
         raise AttributeError(f"'MilvusFieldInfo' object has no attribute '{name}'")
 
 @overload
@@ -0,0 +1,59 @@
+"""Query results that are turned into models only when they are accessed."""
+from typing import Any, Callable, Dict, Iterator, List, Sequence, TypeVar, Union, overload
+
+T = TypeVar('T')
+
+# Marks results that have not been built yet
+_UNBUILT = object()
+
+class LazyResultList(Sequence[T]):
+    """Read-only list of query results, built into models on first access.
+
+    Building a model validates all of its fields, so callers that only look
+    at a few of many results skip most of that work. Each model is built
+    once, and its row is released after that.
+    """
+
+    __slots__ = ('_rows', '_build', '_items')
+
+    def __init__(self, rows: List[Dict[str, Any]], build: Callable[[Dict[str, Any]], T]):
+        self._rows: List[Any] = rows
+        self._build = build
+        self._items: List[Any] = [_UNBUILT] * len(rows)
+
+    def _get(self, index: int) -> T:
+        item = self._items[index]
+        if item is _UNBUILT:
+            item = self._items[index] = self._build(self._rows[index])
+            self._rows[index] = None
+        return item
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError("result index out of range")
+        return self._get(index)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(len(self._items)):
+            yield self._get(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple, LazyResultList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -1,9 +1,15 @@
 """Base class for Milvus models."""
-from typing import Dict, Any, Type, TypeVar, Optional, List, ClassVar, get_type_hints, Union, get_origin, get_args
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Any, Type, TypeVar, Optional, List, Sequence, Tuple, ClassVar, ForwardRef, get_type_hints, Union, get_origin, get_args
 from abc import ABC, abstractmethod
 from datetime import datetime
 import json
 import logging
+import math
+import os
+import copy
+import functools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field as dataclass_field, fields, MISSING
 import uuid
 from pymilvus import DataType, FieldSchema, Hit, Collection
@@ -12,6 +18,27 @@ from typeguard import check_type, TypeCheckError
 from millie.db.schema import Schema
 from millie.orm.fields import milvus_field
 from millie.db.connection import MilvusConnection
+from millie.orm.query_cache import QueryCache, ResultCache, score_margin
+from millie.orm.lazy_results import LazyResultList
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+    HAS_CISO8601 = True
+except ImportError:
+    _parse_datetime = datetime.fromisoformat
+    HAS_CISO8601 = False
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +47,376 @@ T = TypeVar('T', bound='MilvusModel')
 # Registry of all model classes
 MODEL_REGISTRY: Dict[str, Type['MilvusModel']] = {}
 
+# Tuple of the registered models, rebuilt after the registry changes
+_MODEL_SNAPSHOT: Optional[Tuple[Type['MilvusModel'], ...]] = None
+
+# Most entities Milvus returns from a single query
+MAX_QUERY_RESULTS = 16384
+
+# Search results cache, disabled unless MILLIE_QCACHE_SIZE is set
+_QUERY_CACHE = QueryCache.from_env()
+
+# Query results cache for exact repeats, disabled unless MILLIE_RCACHE_SIZE is set
+_RESULT_CACHE = ResultCache.from_env()
+
+# orjson options matching json.dumps, which accepts non-string dict keys
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if HAS_ORJSON else 0
+
+# orjson options for serialize_for_json, leaving the types json.dumps does not know to _json_default
+_ORJSON_MODEL_OPTIONS = (
+    _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+) if HAS_ORJSON else 0
+
+# Types serialized as they are, looked up by exact type
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Number of models sent to Milvus per bulk request, overridable with MILLIE_INSERT_BATCH_SIZE
+DEFAULT_INSERT_BATCH_SIZE = 10000
+
+# Skip field type validation for every model, set with MILLIE_SKIP_VALIDATION=1
+_SKIP_VALIDATION = os.getenv('MILLIE_SKIP_VALIDATION', '').lower() in ('1', 'true', 'yes')
+
+# Keep query result embeddings as float32 numpy arrays, set with MILLIE_EMBEDDING_NDARRAY=1
+_EMBEDDING_NDARRAY = HAS_NUMPY and os.getenv('MILLIE_EMBEDDING_NDARRAY', '').lower() in ('1', 'true', 'yes')
+
+def _insert_batch_size() -> int:
+    """Get the bulk request size from the environment or the default."""
+    return max(1, int(os.getenv('MILLIE_INSERT_BATCH_SIZE', DEFAULT_INSERT_BATCH_SIZE)))
+
+# Most bulk insert batches queued or being sent at once
+MAX_PENDING_INSERTS = 2
+
+# Largest estimated payload of a bulk request, well below the 64 MiB gRPC message limit
+DEFAULT_INSERT_MAX_BYTES = 32 << 20
+
+# Estimated size of a JSON field value, which has no declared maximum
+_JSON_FIELD_BYTES = 4096
+
 def register_model(cls: Type[T]) -> Type[T]:
     """Register a model class in the registry."""
+    global _MODEL_SNAPSHOT
     MODEL_REGISTRY[cls.__name__] = cls
+    _MODEL_SNAPSHOT = None
     return cls
 
+@functools.lru_cache(maxsize=None)
+def _scalar_output_fields(cls: Type['MilvusModel']) -> Tuple[str, ...]:
+    """Get the names of a model's Milvus fields, leaving out vector fields.
+    
+    Returning vectors makes Milvus read them back for every hit, so they are
+    only fetched when a caller asks for them.
+    """
+    return tuple(
+        name for name, field in cls.__dataclass_fields__.items()
+        if 'milvus' in field.metadata and not field.metadata['milvus'].dtype.name.endswith('VECTOR')
+    )
+
+@functools.lru_cache(maxsize=None)
+def _type_hints(cls: Type['MilvusModel']) -> Dict[str, Any]:
+    """Get a model's resolved type hints, resolved once per class.
+    
+    The annotations of the class and its bases are merged directly, and
+    get_type_hints is only used to evaluate annotations written as strings.
+    """
+    hints: Dict[str, Any] = {}
+    for base in reversed(cls.__mro__):
+        hints.update(base.__dict__.get('__annotations__', {}))
+    if any(isinstance(hint, (str, ForwardRef)) for hint in hints.values()):
+        return get_type_hints(cls)
+    return hints
+
+@functools.lru_cache(maxsize=None)
+def _instance_field_items(cls: Type['MilvusModel']) -> Tuple[Tuple[str, Any], ...]:
+    """Get the (name, dataclass field) of every field of a model that is not a ClassVar."""
+    hints = _type_hints(cls)
+    return tuple(
+        (name, field) for name, field in cls.__dataclass_fields__.items()
+        if get_origin(hints.get(name, field.type)) is not ClassVar
+    )
+
+@functools.lru_cache(maxsize=None)
+def _instance_field_names(cls: Type['MilvusModel']) -> FrozenSet[str]:
+    """Get the names of every field of a model that is not a ClassVar."""
+    return frozenset(name for name, _ in _instance_field_items(cls))
+
+@functools.lru_cache(maxsize=None)
+def _parsed_fields(cls: Type['MilvusModel']) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Get the names of the JSON fields and of the datetime fields of a model, which from_dict parses."""
+    hints = _type_hints(cls)
+    json_fields = frozenset(
+        name for name, field in _instance_field_items(cls)
+        if 'milvus' in field.metadata and field.metadata['milvus'].dtype == DataType.JSON
+    )
+    datetime_fields = frozenset(name for name, _ in _instance_field_items(cls) if hints.get(name) == datetime)
+    return json_fields, datetime_fields
+
+@functools.lru_cache(maxsize=None)
+def _field_serializers(cls: Type['MilvusModel']) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+    """Get the (name, serializer) of every instance field of a model.
+    
+    Each field's serializer is picked once per class from its Milvus type, so
+    to_dict does not branch on field types for every value.
+    """
+    serialize = cls._serialize_complex_type
+    # Scalar fields can skip the generic dispatch unless a model overrides it
+    specialize = serialize.__func__ is MilvusModel._serialize_complex_type.__func__
+    hints = _type_hints(cls)
+    
+    def serialize_json(value: Any) -> str:
+        # Ensure we have a dict to serialize, then convert it to a JSON string
+        return _dumps_json({} if value is None else value)
+    
+    result = []
+    for name, field in _instance_field_items(cls):
+        dtype = field.metadata['milvus'].dtype if field.metadata and 'milvus' in field.metadata else None
+        if dtype == DataType.JSON:
+            result.append((name, serialize_json))
+        elif dtype == DataType.FLOAT16_VECTOR and HAS_NUMPY:
+            result.append((name, _to_float16))
+        elif dtype is not None and dtype.name.endswith('VECTOR'):
+            # Vectors only hold numbers, copying them element by element is wasted work
+            result.append((name, _unchanged))
+        elif specialize and eval_type(hints.get(name, field.type)) in _PLAIN_TYPES:
+            result.append((name, _serialize_plain))
+        elif specialize and eval_type(hints.get(name, field.type)) is datetime:
+            result.append((name, _serialize_datetime))
+        else:
+            result.append((name, serialize))
+    return tuple(result)
+
+def _serialize_plain(value: Any) -> Any:
+    """Serialize a value of a field declared as str, int, float or bool."""
+    return value if type(value) in _PLAIN_TYPES else _serialize_value(value)
+
+def _serialize_datetime(value: Any) -> Any:
+    """Serialize a value of a field declared as a datetime."""
+    return value.isoformat() if type(value) is datetime else _serialize_value(value)
+
+def _dumps_json(value: Any) -> str:
+    """Convert a value to a JSON string, with orjson when it is installed.
+    
+    orjson serializes datetimes, nested lists and dicts itself, so the value is
+    only walked by _serialize_value when orjson is not installed or cannot
+    serialize it, for example because of integers over 64 bits.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value, default=_orjson_default, option=_ORJSON_OPTIONS).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(_serialize_value(value))
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize the values orjson does not handle itself, such as nested models."""
+    serialized = _serialize_value(value)
+    if serialized is value:
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+    return serialized
+
+def _json_default(value: Any) -> Any:
+    """Serialize the values of a model's dict that are not JSON types, for serialize_for_json."""
+    return value.tolist() if _is_float_vector_array(value) else str(value)
+
+def _loads_json(value: Union[str, bytes]) -> Any:
+    """Parse a JSON string, with orjson when it is installed."""
+    return orjson.loads(value) if HAS_ORJSON else json.loads(value)
+
+def _to_float16(value: Any) -> Any:
+    """Convert a vector to the float16 array Milvus expects for half precision vectors."""
+    return None if value is None else np.asarray(value, dtype=np.float16)
+
+def _unchanged(value: Any) -> Any:
+    return value
+
+@functools.lru_cache(maxsize=None)
+def _field_schema_args(cls: Type['MilvusModel']) -> Tuple[Tuple[str, DataType, Dict[str, Any]], ...]:
+    """Get the (name, dtype, keyword arguments) of the FieldSchema for every Milvus field."""
+    args = []
+    for name, field in _instance_field_items(cls):
+        milvus_info = field.metadata.get('milvus')
+        if milvus_info:
+            kwargs = {}
+            if milvus_info.max_length is not None:
+                kwargs['max_length'] = milvus_info.max_length
+            if milvus_info.dim is not None:
+                kwargs['dim'] = milvus_info.dim
+            if milvus_info.is_primary:
+                kwargs['is_primary'] = True
+            args.append((name, milvus_info.dtype, kwargs))
+    return tuple(args)
+
+def _field_validator(allow_none: bool, field_type: Any, expected_type: Any, is_embedding: bool) -> Callable[[Any], None]:
+    """Build the function that checks one field's value, raising TypeCheckError on a mismatch."""
+    if is_embedding:
+        def check(value: Any) -> None:
+            # Float arrays from embedders are sent to Milvus as they are
+            if value is not None and not _is_valid_embedding(value):
+                raise TypeCheckError(f"{type(value).__name__} did not match any element in the union")
+    elif allow_none:
+        def check(value: Any) -> None:
+            if value is not None and not isinstance(value, expected_type):
+                raise TypeCheckError(f"{type(value).__name__} is not an instance of {field_type}")
+    else:
+        def check(value: Any) -> None:
+            if not isinstance(value, expected_type):
+                raise TypeCheckError(f"{type(value).__name__} is not an instance of {field_type}")
+    return check
+
+@functools.lru_cache(maxsize=None)
+def _field_validators(cls: Type['MilvusModel']) -> Tuple[Tuple[str, Callable[[Any], None]], ...]:
+    """Get the (name, check) of every field __post_init__ validates, with the type hint interpreted once."""
+    result = []
+    for name, field in _instance_field_items(cls):
+        allow_none = (
+            field.default_factory is not MISSING
+            or 'Optional' in str(field.type)
+            or not field.metadata.get('required', True)
+        )
+        expected_type = eval_type(field.type)
+        is_embedding = expected_type == list and name == 'embedding'
+        result.append((name, _field_validator(allow_none, field.type, expected_type, is_embedding)))
+    return tuple(result)
+
+@functools.lru_cache(maxsize=None)
+def _estimated_row_bytes(cls: Type['MilvusModel']) -> int:
+    """Estimate the largest size of one entity of a model in an insert request."""
+    total = 0
+    for _, dtype, kwargs in _field_schema_args(cls):
+        dim = kwargs.get('dim', 0)
+        if dtype == DataType.FLOAT_VECTOR:
+            total += dim * 4
+        elif dtype in (DataType.FLOAT16_VECTOR, DataType.BFLOAT16_VECTOR):
+            total += dim * 2
+        elif dtype == DataType.BINARY_VECTOR:
+            total += dim // 8
+        elif dtype == DataType.VARCHAR:
+            total += kwargs.get('max_length', 0)
+        elif dtype == DataType.JSON:
+            total += _JSON_FIELD_BYTES
+        else:
+            total += 8
+    return max(1, total)
+
+def _rows_per_batch(cls: Type['MilvusModel'], batch_size: Optional[int], max_bytes: Optional[int]) -> int:
+    """Get how many models go in one bulk request, keeping its size under max_bytes."""
+    batch_size = batch_size or _insert_batch_size()
+    max_bytes = max_bytes or DEFAULT_INSERT_MAX_BYTES
+    return max(1, min(batch_size, max_bytes // _estimated_row_bytes(cls)))
+
+@functools.lru_cache(maxsize=None)
+def _field_schemas(cls: Type['MilvusModel']) -> Tuple[FieldSchema, ...]:
+    """Get the FieldSchema of every Milvus field of a model."""
+    return tuple(FieldSchema(name=name, dtype=dtype, **kwargs) for name, dtype, kwargs in _field_schema_args(cls))
+
+def _is_valid_embedding(value: Any) -> bool:
+    """Check that a value is a list of numbers or a float array, with no NaN or infinite values.
+    
+    With numpy the whole vector is checked in one call rather than element by element.
+    """
+    if _is_float_vector_array(value):
+        return not HAS_NUMPY or bool(np.isfinite(value).all())
+    if not isinstance(value, list):
+        return False
+    if _is_float_list(value):
+        # A sum of numbers is only finite when every one of them is, which
+        # settles the common list of floats without building an array
+        try:
+            if math.isfinite(sum(value)):
+                return True
+        except TypeError:
+            pass
+    if not HAS_NUMPY:
+        return all(isinstance(x, (int, float)) and math.isfinite(x) for x in value)
+    try:
+        array = np.array(value)
+    except ValueError:
+        # Ragged nested lists
+        return False
+    return array.ndim == 1 and array.dtype.kind in 'fiub' and bool(np.isfinite(array).all())
+
+def _is_float_list(value: Any) -> bool:
+    """Check whether a value is a list of Python floats, judged by its first item."""
+    return type(value) is list and (not value or type(value[0]) is float)
+
+def _is_float_vector_array(value: Any) -> bool:
+    """Check whether a value is a one-dimensional float array, such as a numpy vector."""
+    dtype = getattr(value, 'dtype', None)
+    return getattr(value, 'ndim', None) == 1 and getattr(dtype, 'kind', None) == 'f'
+
+def _in_expr(field_name: str, values: List[Any]) -> str:
+    """Build a ``field in [...]`` expression, quoting the values with json.dumps."""
+    return f'{field_name} in {json.dumps(values, ensure_ascii=False)}'
+
+def _quote_string(value: str) -> str:
+    """Quote a string for a filter expression, escaping quotes and backslashes."""
+    return json.dumps(value, ensure_ascii=False)
+
+# Filter expression literals by value type, other types are written with str()
+_LITERALS: Dict[type, Callable[[Any], str]] = {
+    str: _quote_string,
+    bool: lambda value: 'true' if value else 'false',
+    int: str,
+    float: repr,
+}
+
+def _literal(value: Any) -> str:
+    """Write a value as a filter expression literal."""
+    return _LITERALS.get(type(value), str)(value)
+
+def _check_loaded(models: Iterable['MilvusModel']):
+    """Raise ValueError before any write if a model is missing fields its query did not return."""
+    for model in models:
+        if model._unloaded_fields:
+            model._check_loaded()
+
+def _insert_field_order(collection: Collection, cls: Type['MilvusModel']) -> Optional[List[str]]:
+    """Get the order column-based inserts must follow for a model's collection.
+    
+    Returns None when the collection schema is not available or its fields do
+    not match the model's, in which case rows have to be inserted instead.
+    """
+    schema_fields = getattr(getattr(collection, 'schema', None), 'fields', None)
+    if not isinstance(schema_fields, list):
+        return None
+    order = [field.name for field in schema_fields if not getattr(field, 'auto_id', False)]
+    if set(order) != {name for name, _ in _field_serializers(cls)}:
+        return None
+    return order
+
+def _serialize_value(value: Any) -> Any:
+    """Serialize a value for Milvus, converting datetimes and nested models.
+    
+    The serializer is looked up by exact type, subclasses of the handled
+    types fall back to isinstance checks.
+    """
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is not None:
+        return serializer(value)
+    if isinstance(value, list):
+        return _serialize_list(value)
+    elif isinstance(value, dict):
+        return _serialize_dict(value)
+    elif isinstance(value, datetime):
+        return value.isoformat()
+    elif hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+def _serialize_list(value: list) -> list:
+    plain = _PLAIN_TYPES
+    return [item if type(item) in plain else _serialize_value(item) for item in value]
+
+def _serialize_dict(value: dict) -> dict:
+    plain = _PLAIN_TYPES
+    return {k: v if type(v) in plain else _serialize_value(v) for k, v in value.items()}
+
+_SERIALIZERS: Dict[type, Callable[[Any], Any]] = {
+    **{plain_type: _unchanged for plain_type in _PLAIN_TYPES},
+    list: _serialize_list,
+    dict: _serialize_dict,
+    datetime: datetime.isoformat,
+}
+
 def eval_type(type_hint: Any) -> Type:
     """Evaluate a type hint to get its concrete type.
     
@@ -47,6 +439,33 @@ def eval_type(type_hint: Any) -> Type:
     # Handle simple types
     return type_hint
 
+def invalidate_cached_results(collection_name: Optional[str] = None):
+    """Drop the cached search and query results of a collection, or of every collection.
+    
+    Writes through a model do this themselves. Call it after writing to a
+    collection some other way, for example with pymilvus directly.
+    """
+    if collection_name is None:
+        _QUERY_CACHE.clear()
+        _RESULT_CACHE.clear()
+    else:
+        _QUERY_CACHE.invalidate(collection_name)
+        _RESULT_CACHE.invalidate(collection_name)
+
+def _invalidates_cached_results(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Drop the collection's cached results once a write method has finished, even if it failed.
+    
+    Reads that started before the write see an older cache generation, so
+    their rows are not cached afterwards either.
+    """
+    @functools.wraps(method)
+    def wrapper(self_or_cls, *args, **kwargs):
+        try:
+            return method(self_or_cls, *args, **kwargs)
+        finally:
+            invalidate_cached_results(self_or_cls.collection_name())
+    return wrapper
+
 @dataclass(kw_only=True)
 class MilvusModel(ABC):
     """Base class for all Milvus models.
@@ -62,6 +481,19 @@ class MilvusModel(ABC):
     # Class variable to mark migration collections
     is_migration_collection: ClassVar[bool] = False
     
+    # Expected number of entities, used to size the vector index when the collection is created
+    expected_size: ClassVar[Optional[int]] = None
+    
+    # Index parameters for the embedding field, overriding the ones derived from expected_size
+    index_params: ClassVar[Optional[Dict[str, Any]]] = None
+    
+    # Skip field type validation when instances are created, for models built from trusted data
+    skip_validation: ClassVar[bool] = False
+    
+    # Fields a query did not return, with the placeholder value each was built
+    # with. Set per instance by _from_row, writes refuse models that still hold one.
+    _unloaded_fields: ClassVar[Tuple[Tuple[str, Any], ...]] = ()
+    
     def __init_subclass__(cls, **kwargs):
         """Make sure subclasses are also dataclasses and registered."""
         super().__init_subclass__(**kwargs)
@@ -70,8 +502,8 @@ class MilvusModel(ABC):
         # Make sure subclasses are also dataclasses
         dataclass(cls, kw_only=True)
         
-        # Add type hints for the constructor
-        cls.__init__.__annotations__ = get_type_hints(cls)
+        # Add type hints for the constructor, resolved once and shared with from_dict
+        cls.__init__.__annotations__ = dict(_type_hints(cls))
     
     @classmethod
     def __class_getitem__(cls, key):
@@ -79,28 +511,16 @@ class MilvusModel(ABC):
         return cls
     
     def __post_init__(self):
-        """Validate field types after initialization."""
-        for field_name, field in self.__class__.__dataclass_fields__.items():
-            if str(field.type).startswith('typing.ClassVar'):
-                continue
-                
-            value = getattr(self, field_name)
-            
-            # Skip None values for Optional fields or fields with default_factory
-            if value is None:
-                if field.default_factory is not MISSING or 'Optional' in str(field.type):
-                    continue
-                if not field.metadata.get('required', True):
-                    continue
-            
+        """Validate field types after initialization, unless validation is skipped."""
+        if _SKIP_VALIDATION or self.skip_validation:
+            return
+        self._validate_types()
+    
+    def _validate_types(self):
+        """Check that every field holds a value of its declared type."""
+        for field_name, check in _field_validators(self.__class__):
             try:
-                # Special handling for List[float] type
-                if eval_type(field.type) == list and field_name == 'embedding' and value is not None:
-                    if not isinstance(value, list) or not all(isinstance(x, (int, float)) for x in value):
-                        raise TypeCheckError(f"{type(value).__name__} did not match any element in the union")
-                # Basic type checking
-                elif not isinstance(value, eval_type(field.type)):
-                    raise TypeCheckError(f"{type(value).__name__} is not an instance of {field.type}")
+                check(getattr(self, field_name))
             except Exception as e:
                 raise TypeCheckError(str(e))
     
@@ -113,103 +533,101 @@ class MilvusModel(ABC):
     @classmethod
     def schema(cls) -> Schema:
         """Generate the schema for this model."""
-        fields = []
-        for field_name, field in cls.__dataclass_fields__.items():
-            if not str(field.type).startswith('typing.ClassVar'):
-                milvus_info = field.metadata.get('milvus')
-                if milvus_info:
-                    # Get field parameters from milvus_info
-                    kwargs = {}
-                    if hasattr(milvus_info, 'max_length'):
-                        kwargs['max_length'] = milvus_info.max_length
-                    if hasattr(milvus_info, 'dim'):
-                        kwargs['dim'] = milvus_info.dim
-                    if hasattr(milvus_info, 'is_primary'):
-                        kwargs['is_primary'] = milvus_info.is_primary
-                    
-                    fields.append(
-                        FieldSchema(
-                            name=field_name,
-                            dtype=milvus_info.dtype,
-                            **kwargs
-                        )
-                    )
+        # The FieldSchema objects are built once per class and shared between
+        # calls, so callers must not modify them. CollectionSchema copies them.
         return Schema(
             name=cls.__name__,
             collection_name=cls.collection_name(),
-            fields=fields,
+            fields=list(_field_schemas(cls)),
             is_migration_collection=cls.is_migration_collection
         )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary for Milvus insertion."""
-        result = {}
-        for field_name, field in self.__class__.__dataclass_fields__.items():
-            if str(field.type).startswith('typing.ClassVar'):
-                continue
-                
-            value = getattr(self, field_name)
-            
-            # Handle JSON fields
-            if field.metadata and 'milvus' in field.metadata and field.metadata['milvus'].dtype == DataType.JSON:
-                # Ensure we have a dict to serialize
-                if value is None:
-                    value = {}
-                
-                # Serialize complex types first
-                value = self._serialize_complex_type(value)
-                # Then convert to JSON string
-                value = json.dumps(value)
-            else:
-                value = self._serialize_complex_type(value)
-                
-            # Always include the field, even if None
-            result[field_name] = value
+        # Always include every field, even if None
+        return {
+            field_name: serialize(getattr(self, field_name))
+            for field_name, serialize in _field_serializers(self.__class__)
+        }
+    
+    @classmethod
+    def to_columns(cls: Type[T], models: List[T]) -> Dict[str, List[Any]]:
+        """Convert models to one list of values per field for Milvus insertion.
         
-        return result
+        Values are serialized the same way as to_dict, but no dictionary is
+        built per model.
+        """
+        return {
+            field_name: [serialize(getattr(model, field_name)) for model in models]
+            for field_name, serialize in _field_serializers(cls)
+        }
     
     @classmethod
     def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
         """Create model instance from dictionary."""
-        # Parse JSON fields and convert types
+        # Parse JSON fields and convert types, only for fields declared with those types
+        json_fields, datetime_fields = _parsed_fields(cls)
         parsed_data = {}
         for key, value in data.items():
-            # Get field type from annotations
-            field_type = get_type_hints(cls).get(key)
-            
-            # Handle JSON fields
-            if isinstance(value, str) and value.startswith('{') and value.endswith('}'):
-                try:
-                    parsed_data[key] = json.loads(value)
-                except json.JSONDecodeError:
-                    parsed_data[key] = value
-            # Handle datetime fields
-            elif field_type == datetime and isinstance(value, str):
-                try:
-                    parsed_data[key] = datetime.fromisoformat(value)
-                except ValueError:
-                    parsed_data[key] = value
-            else:
-                parsed_data[key] = value
+            if isinstance(value, str):
+                # Handle JSON fields
+                if key in json_fields:
+                    try:
+                        value = _loads_json(value)
+                    except json.JSONDecodeError:
+                        pass
+                # Handle datetime fields, parsed with ciso8601 when it is installed
+                elif key in datetime_fields:
+                    try:
+                        value = _parse_datetime(value)
+                    except ValueError:
+                        pass
+            parsed_data[key] = value
         
         return cls(**parsed_data)
     
-    def _serialize_complex_type(self, value: Any) -> Any:
+    @classmethod
+    def _from_row(cls: Type[T], row: Dict[str, Any]) -> T:
+        """Create a model from a query row, remembering the fields the query did not return.
+        
+        Vector fields are left out of queries by default. The model gets
+        placeholders for them, and writing it back would replace the stored
+        values, so save(), bulk_insert() and bulk_upsert() refuse it until the
+        missing fields are set.
+        """
+        model = cls.from_dict(row)
+        missing = _instance_field_names(cls).difference(row)
+        if missing:
+            model._unloaded_fields = tuple((name, getattr(model, name)) for name in sorted(missing))
+        return model
+    
+    def _check_loaded(self):
+        """Raise ValueError if fields a query did not return would be written with placeholders."""
+        if not self._unloaded_fields:
+            return
+        unloaded = [name for name, placeholder in self._unloaded_fields if getattr(self, name) is placeholder]
+        if unloaded:
+            raise ValueError(
+                f"{self.__class__.__name__} was queried without {', '.join(unloaded)}, "
+                f"query it with output_fields=['*'] or set them before saving"
+            )
+    
+    @classmethod
+    def _serialize_complex_type(cls, value: Any) -> Any:
         """Serialize complex data types."""
-        if isinstance(value, list):
-            return [self._serialize_complex_type(item) for item in value]
-        elif isinstance(value, dict):
-            return {k: self._serialize_complex_type(v) for k, v in value.items()}
-        elif isinstance(value, datetime):
-            return value.isoformat()
-        elif hasattr(value, 'to_dict'):
-            return value.to_dict()
-        return value
+        return _serialize_value(value)
     
     @classmethod
-    def get_all_models(cls) -> List[Type['MilvusModel']]:
-        """Get all registered model classes."""
-        return list(MODEL_REGISTRY.values())
+    def get_all_models(cls) -> Tuple[Type['MilvusModel'], ...]:
+        """Get all registered model classes.
+        
+        The same tuple is returned until a model is registered or the registry
+        is cleared.
+        """
+        global _MODEL_SNAPSHOT
+        if _MODEL_SNAPSHOT is None or len(_MODEL_SNAPSHOT) != len(MODEL_REGISTRY):
+            _MODEL_SNAPSHOT = tuple(MODEL_REGISTRY.values())
+        return _MODEL_SNAPSHOT
     
     @classmethod
     def get_model(cls, name: str) -> Optional[Type['MilvusModel']]:
@@ -217,13 +635,19 @@ class MilvusModel(ABC):
         return MODEL_REGISTRY.get(name)
     
     def serialize_for_json(self) -> str:
-        """Serialize model to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        """Serialize model to JSON string, with orjson when it is installed."""
+        data = self.to_dict()
+        if HAS_ORJSON:
+            try:
+                return orjson.dumps(data, default=_json_default, option=_ORJSON_MODEL_OPTIONS).decode()
+            except orjson.JSONEncodeError:
+                pass
+        return json.dumps(data, default=_json_default)
     
     @classmethod
     def deserialize_from_json(cls: Type[T], json_str: str) -> T:
         """Create model instance from JSON string."""
-        data = json.loads(json_str)
+        data = _loads_json(json_str)
         return cls.from_dict(data)
     
     @staticmethod
@@ -232,10 +656,38 @@ class MilvusModel(ABC):
         # If data is a Hit object, get its fields
         if isinstance(data, Hit):
             data = dict(data.fields)
+        return MilvusModel._convert_embedding(data)
+    
+    @staticmethod
+    def _convert_hits_to_dicts(results: Iterable[Union[Dict[str, Any], Hit]]) -> List[Dict[str, Any]]:
+        """Convert the Hit objects or dictionaries of one result set to properly typed dictionaries.
         
-        if 'embedding' in data:
-            # Convert embedding values to float
-            data['embedding'] = [float(x) for x in data['embedding']]
+        A result set holds a single kind of row, so its type is checked once.
+        """
+        rows = list(results)
+        if rows and isinstance(rows[0], Hit):
+            rows = [dict(hit.fields) for hit in rows]
+        convert = MilvusModel._convert_embedding
+        return [convert(row) for row in rows]
+    
+    @staticmethod
+    def _convert_embedding(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Make sure a row's embedding is a list of floats.
+
+        With MILLIE_EMBEDDING_NDARRAY set it becomes a float32 numpy array
+        instead, which skips building a Python float per dimension.
+        """
+        embedding = data.get('embedding')
+        if embedding is None:
+            return data
+        if _EMBEDDING_NDARRAY:
+            data['embedding'] = np.asarray(embedding, dtype=np.float32)
+        elif not _is_float_list(embedding):
+            # Convert embedding values to float, in one numpy cast when available
+            if HAS_NUMPY:
+                data['embedding'] = np.asarray(embedding, dtype=np.float64).tolist()
+            else:
+                data['embedding'] = [float(x) for x in embedding]
         return data
     
     @classmethod
@@ -243,6 +695,27 @@ class MilvusModel(ABC):
         """Get the Milvus collection for this model."""
         return MilvusConnection.get_collection(cls.collection_name())
     
+    @classmethod
+    def _query(cls, **query_params) -> List[Dict[str, Any]]:
+        """Query the collection for this model and return the result rows.
+        
+        When MILLIE_RCACHE_SIZE is set, the rows of a query are cached for
+        MILLIE_QCACHE_TTL seconds and reused when the exact same query is run
+        again. Writes through this model drop the collection's cached rows once
+        they finish.
+        """
+        key = (cls.collection_name(), json.dumps(query_params, sort_keys=True))
+        rows = _RESULT_CACHE.get(key)
+        if rows is None:
+            generation = _RESULT_CACHE.generation(key[0])
+            results = cls._get_collection().query(**query_params)
+            rows = cls._convert_hits_to_dicts(results)
+            _RESULT_CACHE.put(key, rows, generation)
+        if _RESULT_CACHE.enabled:
+            # Callers may modify the returned models, keep the cached rows untouched
+            rows = copy.deepcopy(rows)
+        return rows
+    
     @classmethod
     def load(cls) -> None:
         """Load the collection into memory for faster queries.
@@ -263,6 +736,18 @@ class MilvusModel(ABC):
         collection = cls._get_collection()
         collection.release()
     
+    @classmethod
+    def flush(cls) -> None:
+        """Seal the collection's pending writes into persisted segments.
+        
+        Writes are never flushed automatically. Milvus seals growing segments
+        on its own, and a flush is a slow, collection-wide sync, so call this
+        once after a large ingest rather than after each write.
+        """
+        collection = cls._get_collection()
+        collection.flush()
+    
+    @_invalidates_cached_results
     def save(self) -> bool:
         """Save this model instance to Milvus.
         If the model has an ID and exists, it will be updated.
@@ -271,64 +756,121 @@ class MilvusModel(ABC):
         Returns:
             True if successful, False otherwise
         """
+        try:
+            self._check_loaded()
+        except ValueError as e:
+            print(f"Error saving model: {str(e)}")
+            return False
+        
         collection = self._get_collection()
         
         # Convert model to dictionary
         data = self.to_dict()
         
-        # If we have an ID, try to update
-        if hasattr(self, 'id') and getattr(self, 'id'):
-            # Delete existing record
-            expr = f'id == "{self.id}"'
-            collection.delete(expr)
-        
-        # Insert the record
+        # With an ID, replace the existing record or insert a new one in a single call
         try:
-            collection.insert(data)
+            if hasattr(self, 'id') and getattr(self, 'id'):
+                collection.upsert(data)
+            else:
+                collection.insert(data)
             return True
         except Exception as e:
             print(f"Error saving model: {str(e)}")
             return False
     
     @classmethod
-    def bulk_insert(cls: Type[T], models: List[T], batch_size: int = 100) -> bool:
+    def _insert_payload(cls: Type[T], models: List[T], field_order: Optional[List[str]]) -> List[Any]:
+        """Convert models to the data sent to collection.insert.
+        
+        Models go as columns in the collection's field order when it is known,
+        which saves pymilvus from converting one dictionary per row, and as
+        row dictionaries otherwise.
+        """
+        if field_order is None:
+            return [model.to_dict() for model in models]
+        columns = cls.to_columns(models)
+        return [columns[name] for name in field_order]
+    
+    @classmethod
+    @_invalidates_cached_results
+    def bulk_insert(cls: Type[T], models: List[T], batch_size: Optional[int] = None, max_bytes: Optional[int] = None) -> bool:
         """Insert multiple models in batches.
         
+        The inserted models are not flushed, call flush() once after the
+        last batch if they must be persisted immediately.
+        
         Args:
             models: List of model instances to insert
-            batch_size: Number of records to insert at once
+            batch_size: Number of records to insert at once. Defaults to
+                MILLIE_INSERT_BATCH_SIZE, or 10000 when that is not set.
+            max_bytes: Largest estimated size of one request, batches are made
+                smaller when needed. Defaults to 32 MiB.
             
         Returns:
             True if all inserts were successful, False if any failed
         """
+        try:
+            _check_loaded(models)
+        except ValueError as e:
+            print(f"Error inserting batch: {str(e)}")
+            return False
+        
         collection = cls._get_collection()
+        batch_size = _rows_per_batch(cls, batch_size, max_bytes)
         
-        # Convert all models to dictionaries
-        data = [model.to_dict() for model in models]
+        # Insert in batches, converting each batch only when it is sent
+        field_order = _insert_field_order(collection, cls)
+        if len(models) <= batch_size:
+            try:
+                collection.insert(cls._insert_payload(models, field_order))
+            except Exception as e:
+                print(f"Error inserting batch: {str(e)}")
+                return False
+            return True
         
-        # Insert in batches
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
+        # Batches are sent in order from a background thread, so the next batch
+        # is converted while the previous one is on the wire
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=1) as executor:
             try:
-                collection.insert(batch)
+                for i in range(0, len(models), batch_size):
+                    data = cls._insert_payload(models[i:i + batch_size], field_order)
+                    pending.append(executor.submit(collection.insert, data))
+                    if len(pending) >= MAX_PENDING_INSERTS:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
             except Exception as e:
+                for future in pending:
+                    future.cancel()
                 print(f"Error inserting batch: {str(e)}")
                 return False
         
         return True
     
     @classmethod
-    def bulk_upsert(cls: Type[T], models: List[T], batch_size: int = 100) -> bool:
+    @_invalidates_cached_results
+    def bulk_upsert(cls: Type[T], models: List[T], batch_size: Optional[int] = None, max_bytes: Optional[int] = None) -> bool:
         """Update or insert multiple models in batches.
         
         Args:
             models: List of model instances to upsert
-            batch_size: Number of records to process at once
+            batch_size: Number of records to process at once. Defaults to
+                MILLIE_INSERT_BATCH_SIZE, or 10000 when that is not set.
+            max_bytes: Largest estimated size of one request, batches are made
+                smaller when needed. Defaults to 32 MiB.
             
         Returns:
             True if all operations were successful, False if any failed
         """
+        try:
+            _check_loaded(models)
+        except ValueError as e:
+            print(f"Error upserting records: {str(e)}")
+            return False
+        
         collection = cls._get_collection()
+        batch_size = _rows_per_batch(cls, batch_size, max_bytes)
         
         # Group models by whether they have IDs
         updates = []
@@ -340,36 +882,29 @@ class MilvusModel(ABC):
                 inserts.append(model)
         
         # Process updates in batches
+        field_order = _insert_field_order(collection, cls) if updates else None
         for i in range(0, len(updates), batch_size):
             batch = updates[i:i + batch_size]
-            # Get IDs for this batch
-            ids = [model.id for model in batch]
-            # Delete existing records
-            expr = f'id in ["{id}" for id in {ids}]'
-            try:
-                collection.delete(expr)
-            except Exception as e:
-                print(f"Error deleting existing records: {str(e)}")
-                return False
+            data = cls._insert_payload(batch, field_order)
             
-            # Insert updated records
+            # Replace existing records and insert new ones in a single call
             try:
-                data = [model.to_dict() for model in batch]
-                collection.insert(data)
+                collection.upsert(data)
             except Exception as e:
-                print(f"Error inserting updated records: {str(e)}")
+                print(f"Error upserting records: {str(e)}")
                 return False
         
         # Process inserts in batches
         if inserts:
             try:
-                return cls.bulk_insert(inserts, batch_size)
+                return cls.bulk_insert(inserts, batch_size, max_bytes)
             except Exception as e:
                 print(f"Error inserting new records: {str(e)}")
                 return False
         
         return True
     
+    @_invalidates_cached_results
     def delete(self) -> bool:
         """Delete this model instance from Milvus.
         
@@ -382,7 +917,7 @@ class MilvusModel(ABC):
         collection = self._get_collection()
         
         try:
-            expr = f'id == "{self.id}"'
+            expr = f'id == {_quote_string(str(self.id))}'
             collection.delete(expr)
             return True
         except Exception as e:
@@ -390,6 +925,7 @@ class MilvusModel(ABC):
             return False
     
     @classmethod
+    @_invalidates_cached_results
     def delete_many(cls, expr: str) -> bool:
         """Delete multiple models matching an expression.
         
@@ -408,6 +944,29 @@ class MilvusModel(ABC):
             print(f"Error deleting models: {str(e)}")
             return False
     
+    @classmethod
+    @_invalidates_cached_results
+    def delete_by_ids(cls, ids: List[str]) -> bool:
+        """Delete many models by their IDs with one request per 16384 IDs.
+        
+        Use this instead of calling delete in a loop.
+        
+        Args:
+            ids: The IDs to delete
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        collection = cls._get_collection()
+        
+        try:
+            for i in range(0, len(ids), MAX_QUERY_RESULTS):
+                collection.delete(_in_expr('id', [str(id) for id in ids[i:i + MAX_QUERY_RESULTS]]))
+            return True
+        except Exception as e:
+            print(f"Error deleting models: {str(e)}")
+            return False
+    
     @classmethod
     def get_all(
         cls: Type[T],
@@ -416,27 +975,26 @@ class MilvusModel(ABC):
         output_fields: Optional[List[str]] = None,
         order_by: Optional[str] = None,
         order_desc: bool = False
-    ) -> List[T]:
+    ) -> Sequence[T]:
         """Get all models with optional pagination and ordering.
         
         Args:
             offset: Number of records to skip
             limit: Maximum number of records to return. If None, returns up to 16384 records.
-            output_fields: Optional list of fields to return. If None, returns all fields.
+            output_fields: Optional list of fields to return. If None, returns all
+                fields except vector fields. Models missing fields cannot be saved until they are set.
             order_by: Optional field to order by
             order_desc: If True, order in descending order
             
         Returns:
-            List of model instances
+            Sequence of model instances, each built when it is first accessed
         """
-        collection = cls._get_collection()
-        
         # Build query parameters
         query_params = {
             "expr": "",  # Empty string for no filtering
-            "output_fields": output_fields or ["*"],
+            "output_fields": output_fields or list(_scalar_output_fields(cls)),
             "offset": offset,
-            "limit": min(limit or 16384, 16384)  # Always include a limit, max 16384
+            "limit": min(limit or MAX_QUERY_RESULTS, MAX_QUERY_RESULTS)  # Always include a limit, max 16384
         }
             
         # Add ordering if specified
@@ -445,9 +1003,9 @@ class MilvusModel(ABC):
             query_params["order_by"] = f"{order_by} {order}"
         
         # Execute query
-        results = collection.query(**query_params)
+        rows = cls._query(**query_params)
         
-        return [cls.from_dict(cls._convert_hit_to_dict(result)) for result in results]
+        return LazyResultList(rows, cls._from_row)
     
     @classmethod
     def get_by_id(cls: Type[T], id: str, output_fields: Optional[List[str]] = None) -> Optional[T]:
@@ -460,48 +1018,72 @@ class MilvusModel(ABC):
         Returns:
             Model instance if found, None otherwise
         """
-        collection = cls._get_collection()
-        
         # Query by ID
-        expr = f'id == "{id}"'
-        results = collection.query(
+        expr = f'id == {_quote_string(str(id))}'
+        rows = cls._query(
             expr=expr,
             output_fields=output_fields or ['*']
         )
         
-        if not results:
+        if not rows:
             return None
             
-        return cls.from_dict(cls._convert_hit_to_dict(results[0]))
+        return cls._from_row(rows[0])
     
     @classmethod
-    def filter(cls: Type[T], output_fields: Optional[List[str]] = None, **kwargs) -> List[T]:
-        """Get models matching the given filters.
+    def get_by_ids(cls: Type[T], ids: List[str], output_fields: Optional[List[str]] = None) -> List[T]:
+        """Get many models by their IDs with one query per 16384 IDs.
+        
+        Use this instead of calling get_by_id in a loop.
         
         Args:
+            ids: The IDs to look up
             output_fields: Optional list of fields to return. If None, returns all fields.
-            **kwargs: Field names and values to filter by
             
         Returns:
-            List of matching models
+            Model instances in the order of ``ids``, leaving out IDs that were not found
         """
         collection = cls._get_collection()
         
+        # Results are matched back to the requested IDs, so the ID is always fetched
+        output_fields = output_fields or ['*']
+        if '*' not in output_fields and 'id' not in output_fields:
+            output_fields = [*output_fields, 'id']
+        
+        found = {}
+        for i in range(0, len(ids), MAX_QUERY_RESULTS):
+            chunk = [str(id) for id in ids[i:i + MAX_QUERY_RESULTS]]
+            results = collection.query(
+                expr=_in_expr('id', chunk),
+                output_fields=output_fields
+            )
+            for row in cls._convert_hits_to_dicts(results):
+                model = cls._from_row(row)
+                found[str(model.id)] = model
+        
+        return [found[str(id)] for id in ids if str(id) in found]
+    
+    @classmethod
+    def filter(cls: Type[T], output_fields: Optional[List[str]] = None, **kwargs) -> Sequence[T]:
+        """Get models matching the given filters.
+        
+        Args:
+            output_fields: Optional list of fields to return. If None, returns all
+                fields except vector fields. Models missing fields cannot be saved until they are set.
+            **kwargs: Field names and values to filter by
+            
+        Returns:
+            Sequence of matching models, each built when it is first accessed
+        """
         # Build filter expression
-        conditions = []
-        for field, value in kwargs.items():
-            if isinstance(value, str):
-                conditions.append(f'{field} == "{value}"')
-            else:
-                conditions.append(f'{field} == {value}')
-        expr = ' && '.join(conditions)
+        expr = ' && '.join(f'{field} == {_literal(value)}' for field, value in kwargs.items())
         
-        results = collection.query(
+        rows = cls._query(
             expr=expr,
-            output_fields=output_fields or ['*']
+            output_fields=output_fields or list(_scalar_output_fields(cls))
         )
         
-        return [cls.from_dict(cls._convert_hit_to_dict(result)) for result in results]
+        return LazyResultList(rows, cls._from_row)
     
     @classmethod
     def search_by_similarity(
@@ -512,7 +1094,7 @@ class MilvusModel(ABC):
         metric_type: str = "L2",
         search_params: Optional[Dict[str, Any]] = None,
         output_fields: Optional[List[str]] = None
-    ) -> List[T]:
+    ) -> Sequence[T]:
         """Search for models by vector similarity.
         
         Args:
@@ -521,27 +1103,95 @@ class MilvusModel(ABC):
             expr: Optional filter expression
             metric_type: Distance metric to use (L2 or IP)
             search_params: Optional dictionary of search parameters (e.g. {"nlist": 1024, "nprobe": 10})
-                         If not provided, defaults to {"nprobe": 10}
-            output_fields: Optional list of fields to return. If None, returns all fields.
+                         If not provided, defaults to {"nprobe": 10}. For IVF indexes nprobe
+                         should grow with the index's nlist to keep recall up.
+            output_fields: Optional list of fields to return. If None, returns all
+                fields except vector fields, which are left as None on the results and must be set before saving them.
             
         Returns:
-            List of models sorted by similarity
+            Sequence of models sorted by similarity, each built when it is first accessed
+            
+        When MILLIE_QCACHE_SIZE is set, results are cached for MILLIE_QCACHE_TTL
+        seconds and reused for exact repeats of the search. COSINE searches also
+        reuse them for vectors with a cosine similarity of at least
+        MILLIE_QCACHE_THRESHOLD, when the hits' scores are far enough apart that
+        the results cannot differ; one extra hit is fetched to check this. Writes
+        through this model drop the collection's cached results.
         """
-        collection = cls._get_collection()
-        
         # Build search parameters
         params = {
             "metric_type": metric_type,
             "params": search_params or {"nprobe": 10}
         }
+        output_fields = output_fields or list(_scalar_output_fields(cls))
+        
+        # Recent searches with the same or a very similar vector are answered locally
+        scope = (cls.collection_name(), limit, expr, json.dumps(params, sort_keys=True), tuple(output_fields))
+        rows = _QUERY_CACHE.get(scope, query_embedding, metric_type)
+        if rows is None:
+            generation = _QUERY_CACHE.generation(scope[0])
+            # The hit past the limit tells how far the results are from changing
+            near_matches = _QUERY_CACHE.enabled and metric_type.upper() == "COSINE"
+            collection = cls._get_collection()
+            results = collection.search(
+                data=[query_embedding],
+                anns_field="embedding",
+                param=params,
+                limit=limit + 1 if near_matches else limit,
+                expr=expr,
+                output_fields=output_fields
+            )
+            hits = list(results[0])
+            margin = score_margin([getattr(hit, 'distance', None) for hit in hits], limit) if near_matches else 0.0
+            rows = cls._convert_hits_to_dicts(hits[:limit])
+            _QUERY_CACHE.put(scope, query_embedding, rows, generation, margin)
+        if _QUERY_CACHE.enabled:
+            # Callers may modify the returned models, keep the cached rows untouched
+            rows = copy.deepcopy(rows)
+        
+        return LazyResultList(rows, cls._from_row)
+    
+    @classmethod
+    def search_many_by_similarity(
+        cls: Type[T],
+        query_embeddings: List[List[float]],
+        limit: int = 5,
+        expr: Optional[str] = None,
+        metric_type: str = "L2",
+        search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None
+    ) -> List[List[T]]:
+        """Search for models by vector similarity for many query vectors at once.
+        
+        All vectors are sent in a single search request, which Milvus runs
+        concurrently. Use this instead of calling search_by_similarity in a loop.
         
+        Args:
+            query_embeddings: The embedding vectors to search with
+            limit: Maximum number of results to return per vector
+            expr: Optional filter expression, applied to every vector
+            metric_type: Distance metric to use (L2 or IP)
+            search_params: Optional dictionary of search parameters, see search_by_similarity
+            output_fields: Optional list of fields to return. If None, returns all
+                fields except vector fields, which are left as None on the results and must be set before saving them.
+            
+        Returns:
+            One list of models sorted by similarity per query vector, in the same order
+        """
+        if not len(query_embeddings):
+            return []
+        
+        collection = cls._get_collection()
         results = collection.search(
-            data=[query_embedding],
+            data=list(query_embeddings),
             anns_field="embedding",
-            param=params,
+            param={
+                "metric_type": metric_type,
+                "params": search_params or {"nprobe": 10}
+            },
             limit=limit,
             expr=expr,
-            output_fields=output_fields or ["*"]
+            output_fields=output_fields or list(_scalar_output_fields(cls))
         )
         
-        return [cls.from_dict(cls._convert_hit_to_dict(hit)) for hit in results[0]] 
\ No newline at end of file
+        return [[cls._from_row(row) for row in cls._convert_hits_to_dicts(hits)] for hits in results]
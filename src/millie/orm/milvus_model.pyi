@@ -1,4 +1,4 @@
-from typing import TypeVar, Type, Dict, Any, List, Optional, ClassVar, Generic, Union
+from typing import TypeVar, Type, Dict, Any, List, Optional, Sequence, Tuple, ClassVar, Generic, Union
 from abc import ABC
 from datetime import datetime
 from dataclasses import Field
@@ -6,8 +6,13 @@ from pymilvus import DataType, Collection, Hit
 
 T = TypeVar('T', bound='MilvusModel')
 
+def invalidate_cached_results(collection_name: Optional[str] = None) -> None: ...
+
 class MilvusModel(ABC, Generic[T]):
     is_migration_collection: ClassVar[bool]
+    expected_size: ClassVar[Optional[int]]
+    index_params: ClassVar[Optional[Dict[str, Any]]]
+    skip_validation: ClassVar[bool]
     __dataclass_fields__: ClassVar[Dict[str, Field[Any]]]
 
     def __init__(self, **kwargs: Any) -> None: ...
@@ -25,11 +30,14 @@ class MilvusModel(ABC, Generic[T]):
     
     def to_dict(self) -> Dict[str, Any]: ...
     
+    @classmethod
+    def to_columns(cls: Type[T], models: List[T]) -> Dict[str, List[Any]]: ...
+    
     @classmethod
     def from_dict(cls: Type[T], data: Dict[str, Any]) -> T: ...
     
     @classmethod
-    def get_all_models(cls) -> List[Type['MilvusModel']]: ...
+    def get_all_models(cls) -> Tuple[Type['MilvusModel'], ...]: ...
     
     @classmethod
     def get_model(cls, name: str) -> Optional[Type['MilvusModel']]: ...
@@ -45,19 +53,25 @@ class MilvusModel(ABC, Generic[T]):
     @classmethod
     def unload(cls) -> None: ...
     
+    @classmethod
+    def flush(cls) -> None: ...
+    
     def save(self) -> bool: ...
     
     @classmethod
-    def bulk_insert(cls: Type[T], models: List[T], batch_size: int = 100) -> bool: ...
+    def bulk_insert(cls: Type[T], models: List[T], batch_size: Optional[int] = None, max_bytes: Optional[int] = None) -> bool: ...
     
     @classmethod
-    def bulk_upsert(cls: Type[T], models: List[T], batch_size: int = 100) -> bool: ...
+    def bulk_upsert(cls: Type[T], models: List[T], batch_size: Optional[int] = None, max_bytes: Optional[int] = None) -> bool: ...
     
     def delete(self) -> bool: ...
     
     @classmethod
     def delete_many(cls, expr: str) -> bool: ...
     
+    @classmethod
+    def delete_by_ids(cls, ids: List[str]) -> bool: ...
+    
     @classmethod
     def get_all(
         cls: Type[T],
@@ -66,13 +80,16 @@ class MilvusModel(ABC, Generic[T]):
         output_fields: Optional[List[str]] = None,
         order_by: Optional[str] = None,
         order_desc: bool = False
-    ) -> List[T]: ...
+    ) -> Sequence[T]: ...
     
     @classmethod
     def get_by_id(cls: Type[T], id: str, output_fields: Optional[List[str]] = None) -> Optional[T]: ...
     
     @classmethod
-    def filter(cls: Type[T], output_fields: Optional[List[str]] = None, **kwargs) -> List[T]: ...
+    def get_by_ids(cls: Type[T], ids: List[str], output_fields: Optional[List[str]] = None) -> List[T]: ...
+    
+    @classmethod
+    def filter(cls: Type[T], output_fields: Optional[List[str]] = None, **kwargs) -> Sequence[T]: ...
     
     @classmethod
     def search_by_similarity(
@@ -83,4 +100,15 @@ class MilvusModel(ABC, Generic[T]):
         metric_type: str = "L2",
         search_params: Optional[Dict[str, Any]] = None,
         output_fields: Optional[List[str]] = None
-    ) -> List[T]: ... 
\ No newline at end of file
+    ) -> Sequence[T]: ...
+    
+    @classmethod
+    def search_many_by_similarity(
+        cls: Type[T],
+        query_embeddings: List[List[float]],
+        limit: int = 5,
+        expr: Optional[str] = None,
+        metric_type: str = "L2",
+        search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None
+    ) -> List[List[T]]: ... 
\ No newline at end of file
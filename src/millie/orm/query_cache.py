@@ -0,0 +1,269 @@
+"""Client-side caches for similarity search and query results."""
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Decimal places query vectors are rounded to when building exact-match keys
+_KEY_PRECISION = 4
+
+class _CollectionCache:
+    """Base for caches whose entries are dropped when their collection is written to.
+    
+    Every invalidation moves the collection to a new generation. Callers take
+    the generation before running a query and pass it to put, so rows read
+    while a write was in flight are not cached after the write invalidated
+    the collection.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Invalidation count per collection, and of the whole cache
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+    
+    def generation(self, collection_name: str) -> Tuple[int, int]:
+        """Get the current generation of a collection, to pass to put."""
+        return (self._epoch, self._generations.get(collection_name, 0))
+    
+    def _is_current(self, collection_name: str, generation: Optional[Tuple[int, int]]) -> bool:
+        return generation is None or generation == (self._epoch, self._generations.get(collection_name, 0))
+    
+    def _bump(self, collection_name: str):
+        self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+
+class QueryCache(_CollectionCache):
+    """Bounded LRU cache of search results keyed by query vector.
+
+    A query is served from the cache when an earlier query with the same
+    search parameters used the same vector. COSINE searches can also reuse,
+    when numpy is installed, the results of a vector whose cosine similarity
+    is at least ``threshold``, if those results were far enough apart that the
+    smaller query change cannot reorder them (see put's ``margin``). L2 and IP
+    scores depend on the vectors' lengths as well as their directions, so
+    searches with those metrics are only served for exact repeats. Entries
+    expire after ``ttl`` seconds and are dropped when their collection is
+    written to.
+
+    The cache is disabled when ``max_size`` is 0.
+    """
+
+    def __init__(self, max_size: int = 0, ttl: float = 60.0, threshold: float = 0.95):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # (scope, rounded vector) -> (expires at, unit vector, rows, score margin)
+        self._entries: "OrderedDict[Tuple[Hashable, Tuple[float, ...]], Tuple[float, Sequence[float], List[Dict[str, Any]], float]]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> 'QueryCache':
+        """Create a cache configured by the MILLIE_QCACHE_* environment variables."""
+        return cls(
+            max_size=int(os.getenv('MILLIE_QCACHE_SIZE', 0)),
+            ttl=float(os.getenv('MILLIE_QCACHE_TTL', 60)),
+            threshold=float(os.getenv('MILLIE_QCACHE_THRESHOLD', 0.95))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, scope: Hashable, vector: Sequence[float],
+            metric_type: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached rows for a query, or None on a miss.
+
+        Args:
+            scope: Everything about the search other than the vector, its first
+                item must be the collection name
+            vector: The query vector
+            metric_type: The search's metric, similar vectors are only matched for COSINE
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        key = (scope, _round(vector))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+
+            if not HAS_NUMPY or (metric_type or "").upper() != "COSINE":
+                return None
+            return self._get_similar(scope, vector, now)
+
+    def put(self, scope: Hashable, vector: Sequence[float], rows: List[Dict[str, Any]],
+            generation: Optional[Tuple[int, int]] = None, margin: float = 0.0):
+        """Cache the rows returned for a query.
+        
+        The rows are not cached if the collection was invalidated since
+        ``generation`` was taken.
+        
+        ``margin`` is the smallest gap between the cosine scores of the hits,
+        including the first hit past the limit, see score_margin. A similar
+        vector only reuses the rows when it is close enough that no score can
+        move by half the margin, the default of 0 allows exact repeats only.
+        """
+        if not self.enabled:
+            return
+
+        key = (scope, _round(vector))
+        with self._lock:
+            if not self._is_current(scope[0], generation):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, _unit(vector), rows, margin)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collection_name: str):
+        """Drop every cached query against a collection."""
+        with self._lock:
+            self._bump(collection_name)
+            for key in [key for key in self._entries if key[0][0] == collection_name]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every cached query."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def _get_similar(self, scope: Hashable, vector: Sequence[float], now: float) -> Optional[List[Dict[str, Any]]]:
+        """Find a live entry with the same scope whose vector is close enough.
+        
+        For unit vectors a and b, a hit's cosine score moves by at most |a - b|
+        between the two queries, so the cached hits keep their order when twice
+        that is below the entry's margin.
+        """
+        candidates = [
+            (key, entry) for key, entry in self._entries.items()
+            if key[0] == scope and entry[0] > now and entry[3] > 0 and len(entry[1]) == len(vector)
+        ]
+        if not candidates:
+            return None
+
+        # One matrix product scores every candidate at once
+        similarities = np.asarray([entry[1] for _, entry in candidates]) @ np.asarray(_unit(vector))
+        shifts = 2 * np.sqrt(np.maximum(0.0, 2 - 2 * similarities))
+        margins = np.asarray([entry[3] for _, entry in candidates])
+        similarities[(similarities < self.threshold) | (shifts >= margins)] = -np.inf
+        best = int(np.argmax(similarities))
+        if similarities[best] == -np.inf:
+            return None
+
+        key, entry = candidates[best]
+        self._entries.move_to_end(key)
+        return entry[2]
+
+class ResultCache(_CollectionCache):
+    """Bounded LRU cache of query results for exact repeats of a query.
+    
+    Entries are keyed by everything that defines the query, the first item of
+    the key must be the collection name. Entries expire after ``ttl`` seconds
+    and are dropped when their collection is written to.
+    
+    The cache is disabled when ``max_size`` is 0.
+    """
+    
+    def __init__(self, max_size: int = 0, ttl: float = 60.0):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (expires at, rows)
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+    
+    @classmethod
+    def from_env(cls) -> 'ResultCache':
+        """Create a cache configured by the MILLIE_RCACHE_SIZE and MILLIE_QCACHE_TTL environment variables."""
+        return cls(
+            max_size=int(os.getenv('MILLIE_RCACHE_SIZE', 0)),
+            ttl=float(os.getenv('MILLIE_QCACHE_TTL', 60))
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached rows for a query, or None on a miss."""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Tuple[Hashable, ...], rows: List[Dict[str, Any]],
+            generation: Optional[Tuple[int, int]] = None):
+        """Cache the rows returned for a query.
+        
+        The rows are not cached if the collection was invalidated since
+        ``generation`` was taken.
+        """
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            if not self._is_current(key[0], generation):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, collection_name: str):
+        """Drop every cached query against a collection."""
+        with self._lock:
+            self._bump(collection_name)
+            for key in [key for key in self._entries if key[0] == collection_name]:
+                del self._entries[key]
+    
+    def clear(self):
+        """Drop every cached query."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+def score_margin(scores: Sequence[Optional[float]], limit: int) -> float:
+    """Get the margin to cache a search's hits with, see QueryCache.put.
+    
+    Args:
+        scores: The scores of the hits, from a search asked for ``limit + 1`` hits
+        limit: The number of hits the caller asked for
+    """
+    if any(score is None for score in scores):
+        return 0.0
+    scores = sorted((float(score) for score in scores), reverse=True)
+    # With fewer hits than asked for, every matching entity was returned
+    gaps = [a - b for a, b in zip(scores, scores[1:])]
+    if len(scores) > limit and not gaps:
+        return 0.0
+    return min(gaps, default=math.inf)
+
+def _round(vector: Sequence[float]) -> Tuple[float, ...]:
+    """Round a vector so that tiny float differences map to the same key."""
+    return tuple(round(float(x), _KEY_PRECISION) for x in vector)
+
+def _unit(vector: Sequence[float]) -> Tuple[float, ...]:
+    """Scale a vector to unit length, so dot products are cosine similarities."""
+    norm = math.sqrt(sum(float(x) * float(x) for x in vector)) or 1.0
+    return tuple(float(x) / norm for x in vector)
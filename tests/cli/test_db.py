@@ -144,3 +144,18 @@ def test_check_command_milvus_not_running(test_cli, cli_runner, mock_docker_comm
         result = cli_runner.invoke(test_cli, ["db", "check"])
         assert result.exit_code == 1
         assert "❌ Milvus is not running" in result.output 
+
+@click_skip_py310()
+def test_seed_command_reports_results(test_cli, cli_runner):
+    """Test that the seed command reports each seeder's result."""
+    results = {
+        "seed_rules": {"status": "success", "count": 3},
+        "seed_broken": {"status": "error", "error": "Error: boom"}
+    }
+    with patch('millie.cli.db.manager.SeedManager') as mock_manager:
+        mock_manager.return_value.run_seeders.return_value = results
+        result = cli_runner.invoke(test_cli, ["db", "seed"])
+    
+    assert result.exit_code == 0
+    assert "✅ seed_rules completed successfully (3 entities)" in result.output
+    assert "❌ seed_broken: Error: boom" in result.output
@@ -137,10 +137,68 @@ def test_close_connection(mock_connection, mock_connections):
     # Verify collections were released
     collection1.release.assert_called_once()
     collection2.release.assert_called_once()
+    assert MilvusConnection._collections == {}
     
     # Verify connection was closed
     mock_connections.disconnect.assert_called_once_with("default")
 
+@pytest.fixture
+def session_connection(mock_connections):
+    """Open the connection the way sessions do, with its dependencies mocked."""
+    with patch('millie.db.connection.Collection'), \
+         patch('millie.db.connection.load_dotenv'):
+        yield MilvusConnection.for_session()
+
+def test_release_closes_after_last_user(session_connection, mock_connections):
+    """Test that the shared connection stays open while any session uses it."""
+    conn = session_connection
+    assert MilvusConnection.for_session() is conn
+    
+    conn.release()
+    mock_connections.disconnect.assert_not_called()
+    
+    conn.release()
+    mock_connections.disconnect.assert_called_once_with("default")
+
+def test_release_closes_under_lock(session_connection, mock_connections):
+    """Test that the last release disconnects while holding the lock, and the next session reconnects."""
+    conn = session_connection
+    mock_connections.disconnect.side_effect = lambda alias: assert_lock_held()
+    
+    def assert_lock_held():
+        assert MilvusConnection._collections_lock._is_owned()
+    
+    conn.release()
+    mock_connections.disconnect.assert_called_once_with("default")
+    
+    with patch('millie.db.connection.load_dotenv'):
+        assert MilvusConnection.for_session() is conn
+    assert mock_connections.connect.call_count == 2
+    assert conn._users == 1
+
+def test_release_leaves_application_connection_open(mock_connection):
+    """Test that sessions never close a connection the application opened itself."""
+    with patch('millie.db.connection.connections') as mock_connections:
+        collection = Mock(spec=Collection)
+        MilvusConnection.cache_collection("kept", collection)
+        
+        conn = MilvusConnection.for_session()
+        assert conn is mock_connection
+        conn.release()
+        
+        mock_connections.connect.assert_not_called()
+        mock_connections.disconnect.assert_not_called()
+    collection.release.assert_not_called()
+    assert hasattr(conn, 'initialized')
+
+def test_reconnect_after_close(mock_connections):
+    """Test that a closed connection connects again when next requested."""
+    with patch('millie.db.connection.load_dotenv'):
+        conn = MilvusConnection()
+        conn.close()
+        assert MilvusConnection() is conn
+    assert mock_connections.connect.call_count == 2
+
 def test_get_collection_cached(mock_connection, mock_collection):
     """Test getting a cached collection."""
     conn = mock_connection
@@ -157,6 +215,15 @@ def test_get_collection_cached(mock_connection, mock_collection):
     assert mock_collection.call_count == 1  # No additional Collection creation
     assert collection2 is mock_coll
 
+def test_get_collection_cached_without_lock(mock_connection, mock_collection):
+    """Test that cached collections are returned without taking the lock."""
+    conn = mock_connection
+    conn.get_collection("test_collection")
+    
+    with patch.object(MilvusConnection, '_collections_lock') as mock_lock:
+        conn.get_collection("test_collection")
+    mock_lock.__enter__.assert_not_called()
+
 def test_get_collection_different_names(mock_connection, mock_collection):
     """Test getting different collections."""
     conn = mock_connection
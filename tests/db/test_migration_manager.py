@@ -1,8 +1,12 @@
 import os
+import sys
+import importlib.util
+from unittest.mock import Mock, patch
 from pymilvus import DataType
 import pytest
 from millie.orm.fields import milvus_field
 
+from millie.db.connection import MilvusConnection
 from millie.db.migration_manager import MigrationManager
 from millie.orm.milvus_model import MODEL_REGISTRY, MilvusModel
 
@@ -135,6 +139,13 @@ def test_generate_migration_file(manager, test_model):
         assert 'FieldSchema(name="id"' in content
         assert 'FieldSchema(name="name"' in content
 
+def test_generate_migration_compiles_bytecode(manager, test_model):
+    """Test that generated migrations are compiled for their first run."""
+    with patch.object(sys, 'dont_write_bytecode', False):
+        migration_path = manager.generate_migration("test_migration")
+    
+    assert os.path.exists(importlib.util.cache_from_source(migration_path))
+
 def test_migration_with_field_changes(manager, tmp_path):
     """Test migration generation with field changes."""
     # Create initial model file
@@ -272,4 +283,306 @@ class ModifyModel(MilvusModel):
     assert len(model_changes["modified"]) == 2
     modified_fields = [field.name for old_field, field in model_changes["modified"]]
     assert "name" in modified_fields
-    assert "vector" in modified_fields 
\ No newline at end of file
+    assert "vector" in modified_fields 
+def test_iter_py_files_prunes_excluded_dirs(schema_dir, tmp_path):
+    """Test that the file walker skips virtualenvs, caches and dot-directories."""
+    project = tmp_path / "project"
+    for subdir in ["pkg", "venv", ".venv", "site-packages", "__pycache__", ".git"]:
+        (project / subdir).mkdir(parents=True)
+        (project / subdir / "models.py").write_text("")
+    (project / "top.py").write_text("")
+    (project / "notes.txt").write_text("")
+    
+    manager = MigrationManager(cwd=str(project), schema_dir=schema_dir)
+    files = sorted(os.path.relpath(f, project) for f in manager._iter_py_files())
+    
+    assert files == [os.path.join("pkg", "models.py"), "top.py"]
+
+def test_find_all_models_scans_once(manager):
+    """Test that the codebase is only scanned again after invalidation."""
+    first = manager._find_all_models()
+    with patch.object(MigrationManager, '_model_files') as mock_files:
+        assert manager._find_all_models() == first
+        mock_files.assert_not_called()
+        
+        manager.invalidate_model_cache()
+        manager._find_all_models()
+        mock_files.assert_called_once()
+
+def test_detect_changes_reuses_result_until_files_change(manager, tmp_path):
+    """Test that detect_changes skips detection when no file changed."""
+    first = manager.detect_changes()
+    with patch.object(MigrationManager, 'detect_changes_for_model',
+                      wraps=manager.detect_changes_for_model) as mock_detect:
+        second = manager.detect_changes()
+        assert second == first
+        mock_detect.assert_not_called()
+        
+        # Callers get a copy, changing it does not change the cached result
+        second["Extra"] = {}
+        assert "Extra" not in manager.detect_changes()
+        
+        with open(os.environ['MILLIE_MODEL_GLOB'], 'a') as f:
+            f.write("\n# changed\n")
+        manager.detect_changes()
+        mock_detect.assert_called_once()
+
+def test_detect_changes_sees_models_defined_in_code(manager):
+    """Test that a model registered after the last call is detected."""
+    manager.detect_changes()
+    
+    class CodeOnlyModel(MilvusModel):
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "code_only"
+    
+    assert "CodeOnlyModel" in manager.detect_changes()
+
+def test_find_all_models_reuses_unchanged_modules(manager):
+    """Test that unchanged model files are not re-executed between scans."""
+    first = manager._find_all_models()
+    MODEL_REGISTRY.clear()
+    manager.invalidate_model_cache()
+    second = manager._find_all_models()
+    
+    # The same class object is re-registered rather than redefined
+    assert [m.__name__ for m in second] == ["TestModel"]
+    assert second[0] is first[0]
+
+def test_find_all_models_reloads_changed_modules(manager):
+    """Test that a modified model file is executed again."""
+    first = manager._find_all_models()[0]
+    models_file = os.environ['MILLIE_MODEL_GLOB']
+    with open(models_file, 'a') as f:
+        f.write("\n# changed\n")
+    
+    manager.invalidate_model_cache()
+    second = manager._find_all_models()[0]
+    assert second.__name__ == "TestModel"
+    assert second is not first
+
+def test_find_all_models_skips_files_without_models(schema_dir, tmp_path):
+    """Test that files which never mention a model are not executed."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "side_effect.py").write_text("raise RuntimeError('should not be imported')\n")
+    (project / "models.py").write_text('''
+from pymilvus import DataType
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.fields import milvus_field
+
+class PrefilterModel(MilvusModel):
+    id: str = milvus_field(DataType.VARCHAR, max_length=36, is_primary=True)
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "prefilter"
+''')
+    
+    manager = MigrationManager(cwd=str(project), schema_dir=schema_dir)
+    with patch('millie.db.migration_manager.importlib.util.spec_from_file_location',
+               wraps=importlib.util.spec_from_file_location) as mock_spec:
+        models = manager._find_all_models()
+    
+    assert [m.__name__ for m in models] == ["PrefilterModel"]
+    assert mock_spec.call_count == 1
+
+def test_find_all_models_skips_files_that_only_import_models(schema_dir, tmp_path):
+    """Test that files which use but do not declare models are not executed."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "uses_models.py").write_text('''
+from millie.orm.milvus_model import MilvusModel
+raise RuntimeError('should not be imported')
+''')
+    
+    manager = MigrationManager(cwd=str(project), schema_dir=schema_dir)
+    with patch('millie.db.migration_manager.importlib.util.spec_from_file_location') as mock_spec:
+        assert manager._find_all_models() == []
+    
+    mock_spec.assert_not_called()
+
+def test_find_all_models_imports_subclasses_of_project_base_models(schema_dir, tmp_path):
+    """Test that models inheriting all their fields from a project base model are found."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "subclass_base.py").write_text('''
+from pymilvus import DataType
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.fields import milvus_field
+
+class BaseDoc(MilvusModel):
+    id: str = milvus_field(DataType.VARCHAR, max_length=36, is_primary=True)
+''')
+    (project / "subclass_article.py").write_text('''
+from subclass_base import BaseDoc
+
+class Article(BaseDoc):
+    @classmethod
+    def collection_name(cls) -> str:
+        return "articles"
+''')
+    (project / "subclass_featured.py").write_text('''
+from subclass_article import Article
+
+class FeaturedArticle(Article):
+    pass
+''')
+    (project / "unrelated.py").write_text("class Other:\n    pass\nraise RuntimeError('should not be imported')\n")
+    
+    manager = MigrationManager(cwd=str(project), schema_dir=schema_dir)
+    try:
+        models = manager._find_all_models()
+    finally:
+        sys.path.remove(str(project))
+        for name in ("subclass_base", "subclass_article", "subclass_featured"):
+            sys.modules.pop(name, None)
+    
+    assert {m.__name__ for m in models} == {"BaseDoc", "Article", "FeaturedArticle"}
+
+def test_find_all_models_reuses_imported_modules(schema_dir, tmp_path):
+    """Test that a model module already in sys.modules is not executed again."""
+    project = tmp_path / "project"
+    (project / "reusepkg").mkdir(parents=True)
+    (project / "reusepkg" / "__init__.py").write_text("")
+    (project / "reusepkg" / "models.py").write_text('''
+from pymilvus import DataType
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.fields import milvus_field
+
+class ReusedModel(MilvusModel):
+    id: str = milvus_field(DataType.VARCHAR, max_length=36, is_primary=True)
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "reused"
+''')
+    
+    sys.path.insert(0, str(project))
+    try:
+        from reusepkg.models import ReusedModel
+        manager = MigrationManager(cwd=str(project), schema_dir=schema_dir)
+        models = manager._find_all_models()
+    finally:
+        sys.path.remove(str(project))
+        sys.modules.pop('reusepkg.models', None)
+        sys.modules.pop('reusepkg', None)
+    
+    assert models == [ReusedModel]
+
+def test_run_migrations_skips_applied(schema_dir):
+    """Test that migrations recorded as applied are not run again."""
+    manager = MigrationManager(schema_dir=schema_dir)
+    for name in ("0002_second.py", "0001_first.py", "__init__.py"):
+        open(os.path.join(manager.migrations_dir, name), 'w').close()
+    os.mkdir(os.path.join(manager.migrations_dir, "0003_not_a_file.py"))
+    
+    with patch.object(MigrationManager, '_load_migration_class') as mock_load, \
+            patch('millie.db.migration_manager.MilvusSession') as mock_session:
+        applied = manager.run_migrations()
+        assert [os.path.basename(path) for path in applied] == ["0001_first.py", "0002_second.py"]
+        assert manager.history.applied_migrations() == ["0001_first.py", "0002_second.py"]
+        
+        mock_load.reset_mock()
+        assert manager.run_migrations() == []
+        mock_load.assert_not_called()
+    
+    # The run's session is closed so the connection can be released
+    mock_session.return_value.__exit__.assert_called_once()
+
+def test_run_migrations_records_migrations_applied_before_a_failure(schema_dir):
+    """Test that a failing migration is reported, and those before it stay recorded."""
+    manager = MigrationManager(schema_dir=schema_dir)
+    for name in ("0001_first.py", "0002_broken.py"):
+        open(os.path.join(manager.migrations_dir, name), 'w').close()
+    
+    def load(migration_file):
+        migration = Mock()
+        if migration_file.endswith("0002_broken.py"):
+            migration.return_value.apply.side_effect = RuntimeError("broken")
+        return migration
+    
+    with patch.object(MigrationManager, '_load_migration_class', side_effect=load), \
+            patch('millie.db.migration_manager.MilvusSession'), \
+            patch.object(manager.history, 'mark_applied', wraps=manager.history.mark_applied) as mock_mark:
+        with pytest.raises(Exception, match="Failed to apply migration .*0002_broken.py: broken"):
+            manager.run_migrations()
+    
+    mock_mark.assert_called_once_with(["0001_first.py"])
+    assert manager.history.applied_migrations() == ["0001_first.py"]
+
+def test_run_migrations_keeps_application_connection_open(schema_dir):
+    """Test that a connection opened before running migrations is still connected after."""
+    manager = MigrationManager(schema_dir=schema_dir)
+    open(os.path.join(manager.migrations_dir, "0001_first.py"), 'w').close()
+    
+    MilvusConnection._instance = None
+    with patch('millie.db.connection.connections') as mock_connections, \
+            patch('millie.db.connection.load_dotenv'), \
+            patch.object(MigrationManager, '_load_migration_class'):
+        connection = MilvusConnection()
+        manager.run_migrations()
+        
+        mock_connections.disconnect.assert_not_called()
+    assert hasattr(connection, 'initialized')
+    assert connection._users == 0
+    MilvusConnection._instance = None
+
+def test_run_migrations_loads_all_before_applying(schema_dir):
+    """Test that a broken migration stops the run before anything is applied."""
+    manager = MigrationManager(schema_dir=schema_dir)
+    with open(os.path.join(manager.migrations_dir, "0001_first.py"), 'w') as f:
+        f.write('''
+from millie.db.migration import Migration
+
+class Migration_first(Migration):
+    def up(self):
+        raise AssertionError("should not be applied")
+    
+    def down(self):
+        pass
+''')
+    with open(os.path.join(manager.migrations_dir, "0002_broken.py"), 'w') as f:
+        f.write("raise ImportError('broken')\n")
+    
+    with patch('millie.db.migration_manager.MilvusSession') as mock_session:
+        with pytest.raises(Exception, match="Failed to load migration .*0002_broken.py"):
+            manager.run_migrations()
+        mock_session.assert_not_called()
+    assert manager.history.applied_migrations() == []
+
+def test_load_migration_class_executes_unchanged_migration_once(schema_dir):
+    """Test that a migration is only executed again after it changes."""
+    manager = MigrationManager(schema_dir=schema_dir)
+    migration_file = os.path.join(manager.migrations_dir, "0001_counted.py")
+    source = '''
+import builtins
+from millie.db.migration import Migration
+
+builtins.migration_exec_count = getattr(builtins, 'migration_exec_count', 0) + 1
+
+class Migration_counted(Migration):
+    def up(self):
+        pass
+    
+    def down(self):
+        pass
+'''
+    with open(migration_file, 'w') as f:
+        f.write(source)
+    
+    import builtins
+    builtins.migration_exec_count = 0
+    try:
+        first = manager._load_migration_class(migration_file)
+        assert manager._load_migration_class(migration_file) is first
+        assert builtins.migration_exec_count == 1
+        
+        with open(migration_file, 'a') as f:
+            f.write("\n# changed\n")
+        assert manager._load_migration_class(migration_file) is not first
+        assert builtins.migration_exec_count == 2
+    finally:
+        del builtins.migration_exec_count
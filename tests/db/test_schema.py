@@ -1,3 +1,4 @@
+import pytest
 from millie.db.schema import Schema, SchemaField
 from pymilvus import DataType
 from pymilvus import FieldSchema
@@ -266,6 +267,14 @@ def test_schema_field_to_dict():
         "is_primary": True
     }
 
+def test_schema_field_to_dict_is_cached():
+    """Test that SchemaField builds its dictionary once."""
+    schema_field = SchemaField(name="vector", dtype="FLOAT_VECTOR", dim=128)
+    assert schema_field.to_dict() is schema_field.to_dict()
+    
+    # Field schemas are still built fresh, since pymilvus may modify them
+    assert schema_field.to_field_schema() is not schema_field.to_field_schema()
+
 def test_schema_field_to_field_schema():
     """Test converting SchemaField to FieldSchema."""
     # Test basic field
@@ -289,6 +298,12 @@ def test_schema_field_to_field_schema():
     assert field_schema.max_length == 100
     assert field_schema.is_primary
 
+def test_schema_field_to_field_schema_unknown_dtype():
+    """Test that an unknown dtype name is reported clearly."""
+    schema_field = SchemaField(name="test", dtype="NOT_A_TYPE")
+    with pytest.raises(ValueError, match="NOT_A_TYPE"):
+        schema_field.to_field_schema()
+
 # Test model for Schema tests
 class TestModel(MilvusModel):
     id: str = milvus_field(DataType.VARCHAR, max_length=36, is_primary=True)
@@ -386,3 +401,23 @@ def test_schema_get_field():
     # Test non-existent field
     field = schema.get_field("nonexistent")
     assert field is None
+
+def test_schema_get_field_tracks_field_changes():
+    """Test that get_field sees fields added or replaced after a lookup."""
+    schema = Schema(
+        name="TestSchema",
+        collection_name="test_collection",
+        fields=[SchemaField(name="id", dtype="VARCHAR", max_length=36, is_primary=True)]
+    )
+    assert schema.get_field("vector") is None
+    
+    schema.fields.append(SchemaField(name="vector", dtype="FLOAT_VECTOR", dim=128))
+    assert schema.get_field("vector").dim == 128
+    
+    schema.fields = [f for f in schema.fields if f.name != "id"]
+    assert schema.get_field("id") is None
+    assert schema.get_field("vector").dim == 128
+    
+    # The first field wins when names repeat
+    schema.fields = [SchemaField(name="id", dtype="INT64"), SchemaField(name="id", dtype="VARCHAR")]
+    assert schema.get_field("id").dtype == "INT64"
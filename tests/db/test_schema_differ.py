@@ -250,4 +250,42 @@ def test_generate_migration_code_with_vector_field(differ):
     assert 'collection.alter_schema(add_fields=[FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=128)])' in up_code
     
     # Check downgrade code
-    assert 'collection.alter_schema(drop_fields=["embedding"])' in down_code 
\ No newline at end of file
+    assert 'collection.alter_schema(drop_fields=["embedding"])' in down_code 
+def test_ignored_fields(base_schema):
+    """Test that ignored fields are left out of the diff."""
+    differ = SchemaDiffer(ignored_fields=frozenset({"id", "email"}))
+    new_schema = Schema(
+        name="TestModel",
+        collection_name="test_model",
+        fields=[
+            SchemaField("id", "VARCHAR", max_length=36, is_primary=True),  # Modified but ignored
+            SchemaField("name", "VARCHAR", max_length=200),
+            SchemaField("age", "INT64"),
+            SchemaField("email", "VARCHAR", max_length=200)  # Added but ignored
+        ]
+    )
+    
+    changes = differ.diff_schemas(base_schema, new_schema)
+    assert changes == {"added": [], "removed": [], "modified": []}
+    
+    initial = differ.diff_schemas(None, new_schema)
+    assert [f.name for f in initial["added"]] == ["name", "age"]
+
+def test_changes_keep_declaration_order(differ):
+    """Test that added and removed fields are reported in declaration order."""
+    old_schema = Schema(
+        name="TestModel",
+        collection_name="test_model",
+        fields=[SchemaField(f"old_{i}", "INT64") for i in range(10)] + [SchemaField("id", "INT64")]
+    )
+    new_schema = Schema(
+        name="TestModel",
+        collection_name="test_model",
+        fields=[SchemaField("id", "INT64")] + [SchemaField(f"new_{i}", "INT64") for i in range(10)]
+    )
+    
+    changes = differ.diff_schemas(old_schema, new_schema)
+    
+    assert [f.name for f in changes["added"]] == [f"new_{i}" for i in range(10)]
+    assert [f.name for f in changes["removed"]] == [f"old_{i}" for i in range(10)]
+    assert changes["modified"] == []
@@ -7,6 +7,7 @@ from millie.db.schema import Schema, SchemaField
 from millie.orm.fields import milvus_field
 from millie.orm.milvus_model import MilvusModel
 import json
+from unittest.mock import patch
 
 @pytest.fixture
 def temp_history_dir(tmp_path):
@@ -116,27 +117,32 @@ def test_save_and_load_model_schema(schema_history):
     assert loaded_schema.fields[0].name == "id"
     assert loaded_schema.fields[1].name == "name"
 
-def test_parse_field_schema(schema_history):
-    """Test parsing FieldSchema from migration code."""
-    # Test basic field
-    field = schema_history._parse_field_schema('FieldSchema(name="test", dtype=DataType.VARCHAR)')
-    assert field.name == "test"
-    assert field.dtype == "VARCHAR"
-    assert not field.is_primary
-    assert field.max_length is None
-    assert field.dim is None
-    
-    # Test field with all parameters
-    field = schema_history._parse_field_schema('FieldSchema(name="test", dtype=DataType.FLOAT_VECTOR, dim=128, max_length=256, is_primary=True)')
-    assert field.name == "test"
-    assert field.dtype == "FLOAT_VECTOR"
-    assert field.is_primary
-    assert field.max_length == 256
-    assert field.dim == 128
-    
-    # Test invalid field definition
-    field = schema_history._parse_field_schema('invalid field def')
-    assert field is None
+def test_extract_migration_ops(schema_history, temp_migrations_dir):
+    """Test reading field changes from migration source without running it."""
+    migration_content = '''
+from pymilvus import FieldSchema, DataType
+
+raise RuntimeError("migrations are parsed, not executed")
+
+class Migration_20240125_test:
+    def up(self):
+        collection.alter_schema(add_fields=[
+            FieldSchema("id", DataType.INT64, is_primary=True),
+            FieldSchema(name='vector', dtype=DataType.FLOAT_VECTOR, dim=128, max_length=256)
+        ])
+        collection.alter_schema(drop_fields=['old_field'])
+    def down(self):
+        collection.alter_schema(drop_fields=["id"])
+'''
+    migration_file = temp_migrations_dir / "20240125_000000_test.py"
+    migration_file.write_text(migration_content)
+    
+    add_fields, drop_fields = schema_history._extract_migration_ops(str(migration_file))
+    assert add_fields == [
+        SchemaField(name="id", dtype="INT64", is_primary=True),
+        SchemaField(name="vector", dtype="FLOAT_VECTOR", dim=128, max_length=256)
+    ]
+    assert drop_fields == ["old_field"]
 
 @pytest.fixture
 def sample_migration(temp_migrations_dir):
@@ -223,6 +229,157 @@ class Migration_20240126_test:
     assert embedding_field.dtype == "FLOAT_VECTOR"
     assert embedding_field.dim == 128
 
+def test_migration_ops_are_cached(schema_history, sample_migration):
+    """Test that unchanged migrations are not parsed again, even by a new instance."""
+    first = schema_history._extract_migration_ops(sample_migration)
+    schema_history._save_migration_cache()
+    
+    history = SchemaHistory(schema_history.history_dir, schema_history.migrations_dir)
+    with patch.object(SchemaHistory, '_parse_migration_ops') as mock_parse:
+        assert history._extract_migration_ops(sample_migration) == first
+        mock_parse.assert_not_called()
+    
+    # Editing the migration invalidates its entry
+    with open(sample_migration, 'a') as f:
+        f.write("\n# changed\n")
+    with patch.object(SchemaHistory, '_parse_migration_ops', return_value=([], [])) as mock_parse:
+        assert history._extract_migration_ops(sample_migration) == ([], [])
+        mock_parse.assert_called_once()
+
+def test_migration_cache_is_written_once_per_build(schema_history, sample_migration, temp_migrations_dir):
+    """Test that building a schema writes the migration cache once, and survives failed writes."""
+    class CachedModel(MilvusModel):
+        @classmethod
+        def collection_name(cls):
+            return "test_collection"
+    
+    for i in range(3):
+        with open(temp_migrations_dir / f"20240126_00000{i}_extra.py", 'w') as f:
+            f.write("# no schema changes\n")
+    
+    with patch('millie.db.schema_history._dump_json', side_effect=OSError("read-only")) as mock_dump:
+        schema = schema_history.build_model_schema_from_migrations(CachedModel)
+        mock_dump.assert_called_once()
+    assert [field.name for field in schema.fields] == ["id", "name"]
+    
+    history = SchemaHistory(schema_history.history_dir, schema_history.migrations_dir)
+    with patch('millie.db.schema_history._dump_json') as mock_dump:
+        history.build_model_schema_from_migrations(CachedModel)
+        mock_dump.assert_called_once()
+        history.build_model_schema_from_migrations(CachedModel)
+        mock_dump.assert_called_once()
+
+def test_parse_migration_ops_skips_migrations_without_alter_schema(schema_history, temp_migrations_dir):
+    """Test that migrations with no alter_schema call are not parsed."""
+    migration_file = temp_migrations_dir / "20240125_000000_initial.py"
+    migration_file.write_text('class Migration_20240125_initial:\n    def up(self):\n        self.ensure_collection("test", [])\n')
+    
+    with patch('millie.db.schema_history.ast.parse') as mock_parse:
+        assert schema_history._parse_migration_ops(str(migration_file)) == ([], [])
+        mock_parse.assert_not_called()
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_history_json_round_trip(schema_history, has_orjson):
+    """Test that history files are written the same with and without orjson."""
+    if has_orjson:
+        pytest.importorskip("orjson")
+    schema = Schema(
+        name="Test",
+        collection_name="test",
+        fields=[SchemaField(name="id", dtype="INT64", is_primary=True)]
+    )
+    with patch('millie.db.schema_history.HAS_ORJSON', has_orjson):
+        schema_history.save_schema_to_history(schema)
+        history_file = os.path.join(schema_history.history_dir, "test.json")
+        with open(history_file) as f:
+            assert f.read() == json.dumps(schema.to_dict(), indent=2)
+        
+        schema_history.mark_applied(["20240125_000000_test.py"])
+        assert schema_history.applied_migrations() == ["20240125_000000_test.py"]
+
+def test_applied_migrations_are_local_per_database(schema_history, monkeypatch):
+    """Test that applied migrations are kept out of version control and per database."""
+    monkeypatch.setenv("MILVUS_DB_NAME", "first")
+    schema_history.mark_applied(["0001_first.py"])
+    assert schema_history.applied_migrations() == ["0001_first.py"]
+    
+    cache_dir = os.path.join(schema_history.history_dir, ".migration_cache")
+    with open(os.path.join(cache_dir, ".gitignore")) as f:
+        assert f.read() == "*\n"
+    assert not any(name.endswith(".json") for name in os.listdir(schema_history.history_dir))
+    
+    monkeypatch.setenv("MILVUS_DB_NAME", "second")
+    assert schema_history.applied_migrations() == []
+
+def test_update_model_schema_without_history(schema_history, sample_migration):
+    """Test that a model with no history file gets one built from migrations."""
+    class TestModel(MilvusModel):
+        @classmethod
+        def collection_name(cls):
+            return "test_collection"
+    
+    assert schema_history.schema_changed(TestModel)
+    schema = schema_history.update_model_schema(TestModel)
+    
+    saved = schema_history.get_schema_from_history(TestModel)
+    assert [f.name for f in saved.fields] == [f.name for f in schema.fields] == ["id", "name"]
+
+def test_update_model_schema_builds_once(schema_history, sample_migration):
+    """Test that a first update builds the schema from migrations only once."""
+    class TestModel(MilvusModel):
+        @classmethod
+        def collection_name(cls):
+            return "test_collection"
+    
+    with patch.object(schema_history, 'build_model_schema_from_migrations',
+                      wraps=schema_history.build_model_schema_from_migrations) as mock_build:
+        schema_history.update_model_schema(TestModel)
+        mock_build.assert_called_once_with(TestModel)
+    assert os.path.exists(schema_history.get_model_schema_filename(TestModel))
+
+def test_schema_changed_compares_schema_content(schema_history, sample_migration):
+    """Test that only structural changes count, not the saved version."""
+    class TestModel(MilvusModel):
+        @classmethod
+        def collection_name(cls):
+            return "test_collection"
+    
+    schema_history.update_model_schema(TestModel)
+    assert not schema_history.schema_changed(TestModel)
+    
+    history_file = schema_history.get_model_schema_filename(TestModel)
+    with open(history_file) as f:
+        data = json.load(f)
+    assert "content_hash" not in data
+    data["version"] += 1
+    with open(history_file, 'w') as f:
+        json.dump(data, f)
+    assert not schema_history.schema_changed(TestModel)
+    
+    data["schema"]["fields"].pop()
+    with open(history_file, 'w') as f:
+        json.dump(data, f)
+    assert schema_history.schema_changed(TestModel)
+
+def test_schema_changed_normalizes_hand_edited_history(schema_history, sample_migration):
+    """Test that default values written out by hand in a history file are not a change."""
+    class TestModel(MilvusModel):
+        @classmethod
+        def collection_name(cls):
+            return "test_collection"
+    
+    schema_history.update_model_schema(TestModel)
+    history_file = schema_history.get_model_schema_filename(TestModel)
+    with open(history_file) as f:
+        data = json.load(f)
+    for field in data["schema"]["fields"]:
+        field.setdefault("is_primary", False)
+        field.setdefault("max_length", None)
+    with open(history_file, 'w') as f:
+        json.dump(data, f)
+    
+    assert not schema_history.schema_changed(TestModel)
+
 def test_edge_cases_schema_history(schema_history, temp_migrations_dir):
     """Test edge cases in schema history."""
     # Test empty migrations directory
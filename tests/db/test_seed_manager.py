@@ -17,9 +17,9 @@ def seed_manager(temp_dir):
     return SeedManager(cwd=temp_dir)
 
 @pytest.fixture
-def mock_glob():
-    """Mock glob.glob to return test files."""
-    with patch('glob.glob') as mock:
+def mock_files():
+    """Mock the Python file walker to return test files."""
+    with patch('millie.db.seed_manager.iter_py_files') as mock:
         mock.return_value = [
             'test_seeds/seed_one.py',
             'test_seeds/seed_two.py'
@@ -51,9 +51,9 @@ def mock_milvus():
             'session': mock_session
         }
 
-def test_discover_seeders_empty(seed_manager, mock_glob):
+def test_discover_seeders_empty(seed_manager, mock_files):
     """Test discovering seeders when no files are found."""
-    mock_glob.return_value = []
+    mock_files.return_value = []
     seeders = seed_manager.discover_seeders()
     assert len(seeders) == 0
 
@@ -79,6 +79,30 @@ def seed_two():
     seeders = seed_manager.discover_seeders()
     assert len(seeders) == 2
 
+def test_discover_seeders_reuses_unchanged_discovery(temp_dir):
+    """Test that discovery is reused across instances until a file changes."""
+    seeder_file = os.path.join(temp_dir, 'cached_seeders.py')
+    with open(seeder_file, 'w') as f:
+        f.write('''
+from millie.db.milvus_seeder import milvus_seeder
+
+@milvus_seeder
+def cached_seed():
+    return None
+''')
+    first = SeedManager(cwd=temp_dir).discover_seeders()
+    
+    with patch('millie.db.seed_manager.importlib.util.spec_from_file_location') as mock_spec:
+        assert SeedManager(cwd=temp_dir).discover_seeders() == first
+        mock_spec.assert_not_called()
+        assert list(_SEEDERS) == ["cached_seed"]
+    
+    with open(seeder_file, 'a') as f:
+        f.write("\n# changed\n")
+    second = SeedManager(cwd=temp_dir).discover_seeders()
+    assert [s.__name__ for s in second] == ["cached_seed"]
+    assert second[0] is not first[0]
+
 def test_run_seeders_success(seed_manager, temp_dir, mock_milvus):
     """Test running seeders that complete successfully."""
     _SEEDERS.clear()
@@ -105,13 +129,53 @@ def successful_seeder():
     with open(os.path.join(temp_dir, 'success_seeder.py'), 'w') as f:
         f.write(seeder_code)
 
-    results = seed_manager.run_seeders()
+    with patch('millie.db.seed_manager.invalidate_cached_results') as mock_invalidate:
+        results = seed_manager.run_seeders()
     assert "successful_seeder" in results
     assert results["successful_seeder"]["status"] == "success"
     assert results["successful_seeder"]["count"] == 1
     
     # Verify Milvus operations were called
-    mock_milvus['collection'].insert.assert_called_once()
+    mock_milvus['collection'].upsert.assert_called_once()
+    mock_milvus['collection'].delete.assert_not_called()
+    mock_invalidate.assert_called_once_with("test")
+
+def test_run_seeders_rejects_invalid_batch_size(seed_manager, mock_milvus, monkeypatch):
+    """Test that a bad MILLIE_SEED_BATCH fails before any seeder runs."""
+    monkeypatch.setenv('MILLIE_SEED_BATCH', 'lots')
+    with patch.object(seed_manager, 'discover_seeders') as mock_discover:
+        with pytest.raises(ValueError, match="MILLIE_SEED_BATCH must be an integer, got 'lots'"):
+            seed_manager.run_seeders()
+    mock_discover.assert_not_called()
+
+def test_run_seeders_batches_upserts(seed_manager, temp_dir, mock_milvus, monkeypatch):
+    """Test that entities are upserted in batches of MILLIE_SEED_BATCH."""
+    _SEEDERS.clear()
+    monkeypatch.setenv('MILLIE_SEED_BATCH', '2')
+    
+    seeder_code = '''
+from millie.db.milvus_seeder import milvus_seeder
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.fields import milvus_field
+from pymilvus import DataType
+
+class TestModel(MilvusModel):
+    id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+    
+    @classmethod
+    def collection_name(cls) -> str:
+        return "test"
+
+@milvus_seeder
+def many_seeder():
+    return [TestModel(id=str(i)) for i in range(5)]
+'''
+    with open(os.path.join(temp_dir, 'many_seeder.py'), 'w') as f:
+        f.write(seeder_code)
+    
+    seed_manager.run_seeders()
+    upsert = mock_milvus['collection'].upsert
+    assert [len(call.args[0]) for call in upsert.call_args_list] == [2, 2, 1]
 
 def test_run_seeders_with_error(seed_manager, temp_dir, mock_milvus):
     """Test running seeders where some fail."""
@@ -135,6 +199,7 @@ def failing_seeder():
     
     # Verify no Milvus operations were called
     mock_milvus['collection'].insert.assert_not_called()
+    mock_milvus['collection'].upsert.assert_not_called()
 
 def test_run_seeders_mixed_results(seed_manager, temp_dir, mock_milvus):
     """Test running a mix of successful and failing seeders."""
@@ -184,16 +249,33 @@ def success_two():
     assert results["upsert_test"]["status"] == "error"
     assert "Collection test does not exist" in results["upsert_test"]["error"]
 
-def test_custom_working_directory(mock_glob):
+def test_custom_working_directory(mock_files):
     """Test using a custom working directory."""
     custom_dir = "/custom/path"
     manager = SeedManager(cwd=custom_dir)
     manager.discover_seeders()
     
-    # Verify glob was called with custom directory
-    mock_glob.assert_called_once_with(os.path.join(custom_dir, "**/*.py"), recursive=True)
+    # Verify the walker was called with custom directory
+    mock_files.assert_called_once_with(custom_dir)
+
+def test_discover_seeders_skips_virtualenvs(seed_manager, temp_dir):
+    """Test that seeders inside virtualenvs and installed packages are not imported."""
+    seeder_code = '''
+from millie.db.milvus_seeder import milvus_seeder
+
+@milvus_seeder
+def {name}():
+    return None
+'''
+    for subdir, name in [('app', 'app_seed'), ('.venv', 'venv_seed'), ('site-packages', 'package_seed')]:
+        os.makedirs(os.path.join(temp_dir, subdir))
+        with open(os.path.join(temp_dir, subdir, 'seeds.py'), 'w') as f:
+            f.write(seeder_code.format(name=name))
+    
+    seeders = seed_manager.discover_seeders()
+    assert [s.__name__ for s in seeders] == ["app_seed"]
 
-def test_import_error_handling(seed_manager, mock_glob, mock_import):
+def test_import_error_handling(seed_manager, mock_files, mock_import):
     """Test handling of import errors."""
     mock_import.side_effect = ImportError("Test import error")
     
@@ -243,6 +325,32 @@ def regular_function():
     
     assert not seed_manager._has_seeder_decorator(file_path)
 
+def test_has_seeder_decorator_skips_parse_without_token(seed_manager, temp_dir):
+    """Test that files never mentioning milvus_seeder are not parsed."""
+    file_path = os.path.join(temp_dir, 'plain.py')
+    with open(file_path, 'w') as f:
+        f.write('def regular_function():\n    pass\n')
+    
+    with patch('millie.db.seed_manager.ast.parse') as mock_parse:
+        assert not seed_manager._has_seeder_decorator(file_path)
+        mock_parse.assert_not_called()
+
+def test_has_seeder_decorator_ignores_nested_functions(seed_manager, temp_dir):
+    """Test that only module-level functions are considered seeders."""
+    code = '''
+from millie.db.milvus_seeder import milvus_seeder
+
+class Helpers:
+    @milvus_seeder
+    def not_a_seeder(self):
+        pass
+'''
+    file_path = os.path.join(temp_dir, 'nested_seeder.py')
+    with open(file_path, 'w') as f:
+        f.write(code)
+    
+    assert not seed_manager._has_seeder_decorator(file_path)
+
 def test_has_seeder_decorator_invalid_syntax(seed_manager, temp_dir):
     """Test handling invalid Python syntax."""
     code = '''
@@ -354,7 +462,7 @@ def seed_multiple():
     assert results["seed_multiple"]["count"] == 2
     
     # Verify Milvus operations were called for both collections
-    assert mock_milvus['collection'].insert.call_count == 2
+    assert mock_milvus['collection'].upsert.call_count == 2
 
 def test_run_seeders_none_return(seed_manager, temp_dir, mock_milvus):
     """Test running a seeder that returns None."""
@@ -378,6 +486,7 @@ def none_seeder():
     
     # Verify no Milvus operations were called
     mock_milvus['collection'].insert.assert_not_called()
+    mock_milvus['collection'].upsert.assert_not_called()
 
 def test_run_seeders_invalid_entity(seed_manager, temp_dir, mock_milvus):
     """Test running a seeder that returns an invalid entity type."""
@@ -400,4 +509,33 @@ def invalid_seeder():
     assert "invalid entity type" in results["invalid_seeder"]["error"].lower()
     
     # Verify no Milvus operations were called
-    mock_milvus['collection'].insert.assert_not_called() 
\ No newline at end of file
+    mock_milvus['collection'].insert.assert_not_called() 
+
+def test_run_seeders_mixed_invalid_entity(seed_manager, temp_dir, mock_milvus):
+    """Test that an invalid entity after valid ones still fails the seeder."""
+    _SEEDERS.clear()
+    
+    seeder_code = '''
+from millie.db.milvus_seeder import milvus_seeder
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.fields import milvus_field
+from pymilvus import DataType
+
+class UserModel(MilvusModel):
+    id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+    
+    @classmethod
+    def collection_name(cls) -> str:
+        return "users"
+
+@milvus_seeder
+def mixed_seeder():
+    return [UserModel(id="1"), UserModel(id="2"), "not a model instance"]
+'''
+    with open(os.path.join(temp_dir, 'mixed_seeder.py'), 'w') as f:
+        f.write(seeder_code)
+    
+    results = seed_manager.run_seeders()
+    
+    assert results["mixed_seeder"]["status"] == "error"
+    assert "invalid entity type" in results["mixed_seeder"]["error"].lower()
@@ -2,7 +2,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from pymilvus import Collection, CollectionSchema, utility
-from millie.db.session import MilvusSession
+from pymilvus.client.types import LoadState
+from millie.db.session import MilvusSession, default_index_params
 from millie.orm.milvus_model import MilvusModel
 from millie.orm.fields import milvus_field
 from pymilvus import DataType
@@ -40,6 +41,7 @@ def session(mock_utility):
     """Create a MilvusSession instance."""
     with patch('millie.db.session.MilvusConnection') as mock_conn:
         mock_conn.get_collection = MagicMock()
+        mock_conn.is_cached = MagicMock(return_value=False)
         session = MilvusSession(host='localhost', port=19530)
         yield session
 
@@ -47,7 +49,26 @@ def test_init_session():
     """Test session initialization."""
     with patch('millie.db.session.MilvusConnection') as mock_conn:
         session = MilvusSession(host='test-host', port=1234, db_name='test-db')
-        mock_conn.assert_called_once_with('test-host', 1234, 'test-db')
+        mock_conn.for_session.assert_called_once_with('test-host', 1234, 'test-db')
+
+def test_sessions_share_connection():
+    """Test that closing a session releases, not closes, the shared connection."""
+    with patch('millie.db.session.MilvusConnection') as mock_conn:
+        session = MilvusSession(host='test-host', port=1234, db_name='test-db')
+        mock_conn.for_session.assert_called_once()
+        
+        session.close()
+        session.close()
+        session.connection.release.assert_called_once()
+        session.connection.close.assert_not_called()
+
+def test_session_context_manager_closes():
+    """Test that a session used as a context manager is closed on exit."""
+    with patch('millie.db.session.MilvusConnection'):
+        with pytest.raises(RuntimeError):
+            with MilvusSession() as session:
+                raise RuntimeError("failed")
+        session.connection.release.assert_called_once()
 
 def test_collection_exists(session, mock_utility):
     """Test checking if collection exists."""
@@ -73,6 +94,35 @@ def test_get_collection_new(session, mock_collection, mock_utility):
             mock_collection.create_index.assert_called_once()
             mock_get.assert_called_once_with('test_model')
 
+def test_default_index_params():
+    """Test that nlist is sized by the expected number of entities."""
+    assert default_index_params()["params"]["nlist"] == 1024
+    assert default_index_params(100)["params"]["nlist"] == 40
+    assert default_index_params(10)["params"]["nlist"] == 16
+    assert default_index_params(10 ** 12)["params"]["nlist"] == 65536
+    assert default_index_params(index_type="IVF_SQ8")["index_type"] == "IVF_SQ8"
+
+def test_get_collection_new_uses_model_index(session, mock_collection, mock_utility):
+    """Test that new collections are indexed as the model declares."""
+    class SizedModel(TestModel):
+        expected_size = 1_000_000
+    
+    class HNSWModel(TestModel):
+        index_params = {"metric_type": "L2", "index_type": "HNSW", "params": {"M": 16, "efConstruction": 200}}
+    
+    mock_utility.has_collection.return_value = False
+    with patch('millie.db.session.Collection', return_value=mock_collection), \
+            patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection):
+        session.get_milvus_collection(SizedModel)
+        assert mock_collection.create_index.call_args.kwargs["index_params"]["params"] == {"nlist": 4000}
+        
+        session.get_milvus_collection(HNSWModel)
+        assert mock_collection.create_index.call_args.kwargs["index_params"] == HNSWModel.index_params
+        
+        explicit = default_index_params(100)
+        session.get_milvus_collection(HNSWModel, explicit)
+        assert mock_collection.create_index.call_args.kwargs["index_params"] is explicit
+
 def test_drop_all_collections(session, mock_utility):
     """Test dropping all collections."""
     session.drop_all_collections()
@@ -93,14 +143,66 @@ def test_load_collection(session, mock_collection):
         mock_collection.load.assert_called_once()
         mock_get.assert_called_once_with('test_model')
 
-def test_unload_collection(session):
+def test_flush_collection(session, mock_collection):
+    """Test flushing a collection."""
+    with patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection) as mock_get:
+        session.flush_collection(TestModel)
+        mock_collection.flush.assert_called_once()
+        mock_get.assert_called_once_with('test_model')
+
+def test_ensure_loaded_loads_once(session, mock_collection, mock_utility):
+    """Test that a collection is only loaded the first time it is needed."""
+    mock_utility.load_state.return_value = LoadState.NotLoad
+    with patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection):
+        assert session.ensure_loaded(TestModel) is mock_collection
+        assert session.ensure_loaded(TestModel) is mock_collection
+    mock_collection.load.assert_called_once()
+    mock_utility.load_state.assert_called_once_with('test_model')
+
+def test_ensure_loaded_skips_loaded_collection(session, mock_collection, mock_utility):
+    """Test that a collection loaded elsewhere is not loaded again."""
+    mock_utility.load_state.return_value = LoadState.Loaded
+    with patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection):
+        session.ensure_loaded(TestModel)
+    mock_collection.load.assert_not_called()
+
+def test_unload_collection_forgets_loaded_state(session, mock_collection, mock_utility):
+    """Test that an unloaded collection is loaded again when next needed."""
+    mock_utility.load_state.return_value = LoadState.NotLoad
+    with patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection):
+        session.ensure_loaded(TestModel)
+        session.unload_collection(TestModel)
+        session.ensure_loaded(TestModel)
+    assert mock_collection.load.call_count == 2
+
+def test_unload_collection(session, mock_collection):
     """Test unloading a collection."""
-    with patch('millie.db.session.Collection') as mock_coll:
-        mock_collection = MagicMock()
-        mock_coll.return_value = mock_collection
-        
+    with patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection) as mock_get:
         session.unload_collection(TestModel)
         mock_collection.release.assert_called_once()
+        mock_get.assert_called_once_with('test_model')
+
+def test_get_collection_cached_skips_exists_check(session, mock_collection, mock_utility):
+    """Test that a cached collection handle is reused without asking Milvus."""
+    with patch('millie.db.session.MilvusConnection.is_cached', return_value=True), \
+            patch('millie.db.session.MilvusConnection.get_collection', return_value=mock_collection):
+        assert session.get_milvus_collection(TestModel) is mock_collection
+    mock_utility.has_collection.assert_not_called()
+
+def test_drop_all_collections_clears_cache(session, mock_utility):
+    """Test that dropped collections are removed from the handle cache."""
+    with patch('millie.db.session.MilvusConnection.remove_collection') as mock_remove, \
+            patch('millie.db.session.invalidate_cached_results') as mock_invalidate:
+        session.drop_all_collections()
+    mock_remove.assert_called_once_with('test_collection')
+    mock_invalidate.assert_called_once_with()
+
+def test_drop_all_collections_drops_each_collection(session, mock_utility):
+    """Test that every collection is dropped when there are several."""
+    names = [f"collection_{i}" for i in range(20)]
+    mock_utility.list_collections.return_value = names
+    session.drop_all_collections()
+    assert sorted(call.args[0] for call in mock_utility.drop_collection.call_args_list) == sorted(names)
 
 def test_init_collection_success(session, mock_collection):
     """Test successful collection initialization."""
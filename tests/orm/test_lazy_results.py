@@ -0,0 +1,63 @@
+"""Tests for lazily built query results."""
+from unittest.mock import Mock, patch
+
+import pytest
+from pymilvus import Collection, DataType
+
+from millie.orm.fields import milvus_field
+from millie.orm.lazy_results import LazyResultList
+from millie.orm.milvus_model import MilvusModel
+
+class LazyModel(MilvusModel):
+    """Model for lazy result tests."""
+    id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+    name: str = milvus_field(DataType.VARCHAR, max_length=50)
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "lazy_models"
+
+def test_items_are_built_once_on_access():
+    """Test that each row is built the first time it is accessed and then reused."""
+    build = Mock(side_effect=lambda row: row["id"])
+    results = LazyResultList([{"id": "1"}, {"id": "2"}, {"id": "3"}], build)
+
+    assert len(results) == 3
+    build.assert_not_called()
+
+    assert results[1] == "2"
+    assert results[-1] == "3"
+    assert results[1] == "2"
+    assert build.call_count == 2
+
+    assert list(results) == ["1", "2", "3"]
+    assert results[:2] == ["1", "2"]
+    assert build.call_count == 3
+
+def test_out_of_range_index():
+    """Test that out of range indexes raise IndexError like a list."""
+    results = LazyResultList([{"id": "1"}], lambda row: row)
+    with pytest.raises(IndexError):
+        results[1]
+    with pytest.raises(IndexError):
+        results[-2]
+
+def test_compares_equal_to_lists():
+    """Test that results compare equal to lists with the same items."""
+    results = LazyResultList([{"id": "1"}], lambda row: row["id"])
+    assert results == ["1"]
+    assert results != ["2"]
+    assert LazyResultList([], lambda row: row) == []
+
+def test_queries_build_models_on_access():
+    """Test that query methods only build the models that are accessed."""
+    with patch('millie.orm.milvus_model.MilvusConnection') as mock:
+        collection = Mock(spec=Collection)
+        collection.query.return_value = [{"id": str(i), "name": f"model {i}"} for i in range(100)]
+        mock.get_collection.return_value = collection
+
+        with patch.object(LazyModel, 'from_dict', wraps=LazyModel.from_dict) as mock_from_dict:
+            results = LazyModel.get_all()
+            assert len(results) == 100
+            assert results[0].name == "model 0"
+            assert mock_from_dict.call_count == 1
@@ -1,5 +1,5 @@
 """Tests for MilvusModel functionality."""
-from dataclasses import fields
+from dataclasses import dataclass, fields
 import json
 from datetime import datetime
 import re
@@ -8,10 +8,10 @@ import pytest
 from unittest.mock import Mock, patch
 from pymilvus import Collection, DataType, Hit
 from typeguard import TypeCheckError
-from millie.orm.milvus_model import MilvusModel, MODEL_REGISTRY
+from millie.orm.milvus_model import MilvusModel, MODEL_REGISTRY, _type_hints
 from millie.orm.decorators import MillieMigrationModel
 from millie.orm.fields import milvus_field
-from typing import Optional, List, ClassVar, Dict, Any
+from typing import Optional, List, ClassVar, Dict, Any, get_type_hints
 
 # ============================================================================
 # Test Models
@@ -177,6 +177,81 @@ def test_embedding_validation():
             age=25,
             embedding="invalid"
         )
+    
+    for has_numpy in (True, False):
+        with patch('millie.orm.milvus_model.HAS_NUMPY', has_numpy):
+            assert TestModel(id="123", name="test", age=25, embedding=[1, 0.5]).embedding == [1, 0.5]
+            # Finite values whose sum overflows
+            assert TestModel(id="123", name="test", age=25, embedding=[1e308, 1e308]).embedding == [1e308, 1e308]
+            for invalid in (["0.1", "0.2"], [0.1, None], [0.1, "0.2"], [0.1, 1j], [[0.1], [0.2]],
+                            [0.1, float("nan")], [float("inf")], [0.1, float("inf"), float("-inf")]):
+                with pytest.raises(TypeCheckError):
+                    TestModel(id="123", name="test", age=25, embedding=invalid)
+
+def test_field_validators_built_once():
+    """Test that each model's field checks are built once and reused."""
+    TestModel(id="123", name="test", age=25)
+    with patch('millie.orm.milvus_model.eval_type') as mock_eval_type:
+        TestModel(id="124", name="test", age=26)
+    mock_eval_type.assert_not_called()
+
+def test_string_classvar_annotations_are_not_fields():
+    """Test that ClassVars written as strings are not treated as model fields."""
+    class StringClassVarModel(MilvusModel):
+        version: "ClassVar[int]" = 1
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "string_classvar"
+    
+    assert StringClassVarModel(id="1").to_dict() == {"id": "1"}
+
+def test_skip_validation():
+    """Test that validation can be turned off per model or for every model."""
+    class TrustedModel(MilvusModel):
+        skip_validation: ClassVar[bool] = True
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "trusted"
+    
+    assert TrustedModel(id=123).id == 123
+    
+    with patch('millie.orm.milvus_model._SKIP_VALIDATION', True):
+        assert TestModel(id="123", name="test", age="not a number").age == "not a number"
+    with pytest.raises(TypeCheckError):
+        TestModel(id="123", name="test", age="not a number")
+
+def test_embedding_accepts_float_arrays():
+    """Test that numpy float vectors are accepted as embeddings."""
+    np = pytest.importorskip("numpy")
+    embedding = np.array([0.1, 0.2], dtype=np.float32)
+    model = TestModel(id="123", name="test", age=25, embedding=embedding)
+    
+    assert model.to_dict()["embedding"] is embedding
+    assert json.loads(model.serialize_for_json())["embedding"] == pytest.approx([0.1, 0.2])
+    
+    with pytest.raises(TypeCheckError):
+        TestModel(id="123", name="test", age=25, embedding=np.array(["a", "b"]))
+
+def test_float16_embeddings_are_converted():
+    """Test that FLOAT16_VECTOR fields are sent to Milvus as float16 arrays."""
+    np = pytest.importorskip("numpy")
+    
+    class HalfModel(MilvusModel):
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        embedding: Optional[List[float]] = milvus_field(DataType.FLOAT16_VECTOR, dim=2)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "half"
+    
+    embedding = HalfModel(id="1", embedding=[0.5, 0.25]).to_dict()["embedding"]
+    assert embedding.dtype == np.float16
+    assert embedding.tolist() == [0.5, 0.25]
+    assert HalfModel(id="2", embedding=None).to_dict()["embedding"] is None
 
 def test_model_registration():
     """Test automatic model registration."""
@@ -196,6 +271,21 @@ def test_model_registration():
     assert "RegisterTestModel" in MODEL_REGISTRY
     assert MODEL_REGISTRY["RegisterTestModel"] == RegisterTestModel
 
+def test_get_all_models_snapshot():
+    """Test that get_all_models reuses its tuple until the registry changes."""
+    MODEL_REGISTRY.clear()
+    assert MilvusModel.get_all_models() == ()
+    
+    class SnapshotModel(MilvusModel):
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+    
+    models = MilvusModel.get_all_models()
+    assert models == (SnapshotModel,)
+    assert MilvusModel.get_all_models() is models
+    
+    MODEL_REGISTRY.clear()
+    assert MilvusModel.get_all_models() == ()
+
 def test_schema_generation():
     """Test schema generation from model."""
     schema = TestModel.schema()
@@ -223,6 +313,17 @@ def test_schema_generation():
     assert "metadata" in field_dict
     assert field_dict["metadata"].dtype == DataType.JSON
 
+def test_schema_fields_are_built_once():
+    """Test that schemas share FieldSchema objects but not their field lists."""
+    first = TestModel.schema()
+    second = TestModel.schema()
+    
+    assert all(a is b for a, b in zip(first.fields, second.fields))
+    assert first.fields is not second.fields
+    
+    first.fields.pop()
+    assert len(TestModel.schema().fields) == len(second.fields)
+
 # ============================================================================
 # Inheritance Tests
 # ============================================================================
@@ -257,6 +358,25 @@ def test_model_inheritance():
     assert model.get_full_name() == "test (age: 25)"
     assert ChildModel.collection_name() == "child"
 
+def test_subclassing_processes_only_the_new_class():
+    """Test that defining a subclass does not process its parents again."""
+    with patch('millie.orm.milvus_model.dataclass', wraps=dataclass) as mock_dataclass, \
+            patch('millie.orm.milvus_model.get_type_hints', wraps=get_type_hints) as mock_hints:
+        class GrandchildModel(ChildModel):
+            grand_field: str = milvus_field(DataType.VARCHAR, max_length=10, default="grand")
+    
+    assert [call.args[0] for call in mock_dataclass.call_args_list] == [GrandchildModel]
+    # Annotations that are not strings are merged without get_type_hints
+    mock_hints.assert_not_called()
+    assert _type_hints(GrandchildModel) == get_type_hints(GrandchildModel)
+    assert GrandchildModel(id="1", name="test", age=1, extra_field="extra").grand_field == "grand"
+
+def test_subclass_instances_are_validated_once():
+    """Test that creating a subclass instance does not validate parent fields again."""
+    with patch.object(ChildModel, '_validate_types') as mock_validate:
+        ChildModel(id="1", name="test", age=1, extra_field="extra")
+    mock_validate.assert_called_once_with()
+
 def test_inheritance_schema():
     """Test schema generation in inherited models."""
     parent_schema = SimpleModel.schema()
@@ -391,6 +511,50 @@ def test_complex_type_deserialization():
     assert model.nested_data["empty"] == {}
     assert model.nested_data["unicode"] == {"🔑": "值"}
 
+def test_from_dict_only_parses_json_fields():
+    """Test that VARCHAR values that look like JSON are kept as strings."""
+    model = TestModel.from_dict({
+        "id": "1",
+        "name": '{"not": "json"}',
+        "age": 1,
+        "metadata": '{"key": "value"}'
+    })
+    
+    assert model.name == '{"not": "json"}'
+    assert model.metadata == {"key": "value"}
+
+def test_from_dict_parses_datetime_fields():
+    """Test that declared datetime fields are parsed from ISO strings."""
+    class TimestampModel(MilvusModel):
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        created_at: datetime = milvus_field(DataType.VARCHAR, max_length=30)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "timestamps"
+    
+    model = TimestampModel.from_dict({"id": "1", "created_at": "2024-01-01T12:30:15"})
+    assert model.created_at == datetime(2024, 1, 1, 12, 30, 15)
+    
+    with pytest.raises(TypeCheckError):
+        TimestampModel.from_dict({"id": "1", "created_at": "not a date"})
+
+def test_from_dict_resolves_type_hints_once():
+    """Test that from_dict does not resolve the model's type hints again."""
+    ComplexModel.from_dict({"id": "1", "nested_data": "{}"})
+    with patch('millie.orm.milvus_model.get_type_hints') as mock_hints:
+        for i in range(3):
+            ComplexModel.from_dict({"id": str(i), "nested_data": "{}"})
+    mock_hints.assert_not_called()
+
+def test_init_resolves_type_hints_once():
+    """Test that creating models does not resolve their type hints again."""
+    ComplexModel(id="1", nested_data={})
+    with patch('millie.orm.milvus_model.get_type_hints') as mock_hints:
+        for i in range(3):
+            ComplexModel(id=str(i), nested_data={})
+    mock_hints.assert_not_called()
+
 def test_complex_type_validation():
     """Test validation of complex types."""
     # Test invalid nested data type
@@ -415,13 +579,10 @@ def test_collection_operations(mock_connection):
     )
     
     # Test save operation
-    model.save()
-    collection.delete.assert_called_once_with('id == "123"')
-    collection.insert.assert_called_once()
-    
-    # Reset mock calls
-    collection.delete.reset_mock()
-    collection.insert.reset_mock()
+    assert model.save()
+    collection.upsert.assert_called_once_with(model.to_dict())
+    collection.delete.assert_not_called()
+    collection.insert.assert_not_called()
     
     # Test load operation
     TestModel.load()
@@ -431,6 +592,10 @@ def test_collection_operations(mock_connection):
     TestModel.unload()
     collection.release.assert_called_once()
     
+    # Test flush operation
+    TestModel.flush()
+    collection.flush.assert_called_once()
+    
     # Test delete operation
     model.delete()
     collection.delete.assert_called_once_with('id == "123"')
@@ -473,8 +638,37 @@ def test_query_operations(mock_connection):
     results = TestModel.filter(age=25, name="Test 1")
     collection.query.assert_called_with(
         expr='age == 25 && name == "Test 1"',
+        output_fields=['id', 'metadata', 'name', 'age', 'extra_data']
+    )
+
+def test_filter_quotes_values(mock_connection):
+    """Test that filter values are written as valid expression literals."""
+    collection = mock_connection.get_collection.return_value
+    collection.query.return_value = []
+    
+    TestModel.filter(name='say "hi" \\ 值', age=25, active=True, score=0.5)
+    assert collection.query.call_args.kwargs["expr"] == (
+        'name == "say \\"hi\\" \\\\ 值" && age == 25 && active == true && score == 0.5'
+    )
+    
+    TestModel.get_by_id('a"b')
+    assert collection.query.call_args.kwargs["expr"] == 'id == "a\\"b"'
+
+def test_get_by_ids(mock_connection):
+    """Test fetching many models with a single query."""
+    collection = mock_connection.get_collection.return_value
+    collection.query.return_value = [
+        {"id": "2", "name": "Test 2", "age": 30},
+        {"id": "1", "name": "Test 1", "age": 25}
+    ]
+    
+    results = TestModel.get_by_ids(["1", "missing", "2"])
+    
+    collection.query.assert_called_once_with(
+        expr='id in ["1", "missing", "2"]',
         output_fields=['*']
     )
+    assert [model.id for model in results] == ["1", "2"]
 
 def test_search_operations(mock_connection):
     """Test vector search operations."""
@@ -511,6 +705,89 @@ def test_search_operations(mock_connection):
         output_fields=["id", "name"]
     )
 
+def test_search_leaves_out_vector_fields_by_default(mock_connection):
+    """Test that searches only fetch vectors when asked for them."""
+    collection = mock_connection.get_collection.return_value
+    collection.search.return_value = [[]]
+    
+    TestModel.search_by_similarity([0.1] * 128)
+    assert collection.search.call_args.kwargs["output_fields"] == ['id', 'metadata', 'name', 'age', 'extra_data']
+    
+    TestModel.search_by_similarity([0.1] * 128, output_fields=["id", "embedding"])
+    assert collection.search.call_args.kwargs["output_fields"] == ["id", "embedding"]
+
+def test_models_queried_without_vectors_are_not_written_back(mock_connection):
+    """Test that models missing fields a query left out are not saved with placeholders."""
+    collection = mock_connection.get_collection.return_value
+    collection.query.return_value = [{"id": "1", "name": "Test", "age": 25, "metadata": "{}", "extra_data": "{}"}]
+    
+    model = TestModel.filter(name="Test")[0]
+    assert model.embedding is None
+    model.name = "Changed"
+    assert not model.save()
+    assert not TestModel.bulk_upsert([model])
+    assert not TestModel.bulk_insert([model])
+    collection.upsert.assert_not_called()
+    collection.insert.assert_not_called()
+    
+    # Setting the missing field makes the model complete again
+    model.embedding = [0.1] * 1536
+    assert model.save()
+    collection.upsert.assert_called_once()
+    
+    # Models created directly or fetched with every field are not affected
+    collection.query.return_value = [{**collection.query.return_value[0], "embedding": [0.2] * 1536}]
+    assert TestModel.get_by_id("1").save()
+    assert TestModel(id="2", name="New", age=1).save()
+
+def test_convert_hit_to_dict_embeddings():
+    """Test that hit embeddings become lists of floats without copying float lists."""
+    embedding = [0.1, 0.2]
+    assert TestModel._convert_hit_to_dict({"embedding": embedding})["embedding"] is embedding
+    
+    converted = TestModel._convert_hit_to_dict({"embedding": [1, 2]})["embedding"]
+    assert converted == [1.0, 2.0]
+    assert all(type(x) is float for x in converted)
+    
+    assert TestModel._convert_hit_to_dict({"id": "1", "embedding": None}) == {"id": "1", "embedding": None}
+
+def test_convert_hit_to_dict_ndarray_embeddings():
+    """Test that hit embeddings stay float32 arrays when MILLIE_EMBEDDING_NDARRAY is set."""
+    np = pytest.importorskip("numpy")
+    with patch('millie.orm.milvus_model._EMBEDDING_NDARRAY', True):
+        row = TestModel._convert_hit_to_dict({"id": "1", "name": "Test", "age": 1, "embedding": [0.5] * 1536})
+    
+    assert isinstance(row["embedding"], np.ndarray)
+    assert row["embedding"].dtype == np.float32
+    model = TestModel.from_dict(row)
+    assert model.embedding is row["embedding"]
+    assert model.to_dict()["embedding"] is row["embedding"]
+
+def test_convert_hits_to_dicts():
+    """Test that a whole result set is converted with one type check."""
+    rows = [{"id": "1", "embedding": [1, 2]}, {"id": "2"}]
+    assert TestModel._convert_hits_to_dicts(rows) == [{"id": "1", "embedding": [1.0, 2.0]}, {"id": "2"}]
+    assert TestModel._convert_hits_to_dicts([]) == []
+    
+    hit = Mock(spec=Hit)
+    hit.fields = {"id": "3"}
+    assert TestModel._convert_hits_to_dicts([hit]) == [{"id": "3"}]
+
+def test_search_many_by_similarity(mock_connection):
+    """Test that many query vectors are searched with one request."""
+    collection = mock_connection.get_collection.return_value
+    collection.search.return_value = [
+        [{"id": "1", "name": "Test 1", "age": 25}],
+        [{"id": "2", "name": "Test 2", "age": 30}, {"id": "3", "name": "Test 3", "age": 35}]
+    ]
+    
+    results = TestModel.search_many_by_similarity([[0.1] * 128, [0.2] * 128], limit=2)
+    
+    collection.search.assert_called_once()
+    assert collection.search.call_args.kwargs["data"] == [[0.1] * 128, [0.2] * 128]
+    assert [[model.id for model in hits] for hits in results] == [["1"], ["2", "3"]]
+    assert TestModel.search_many_by_similarity([]) == []
+
 def test_bulk_operations(mock_connection):
     """Test bulk insert and upsert operations."""
     collection = mock_connection.get_collection.return_value
@@ -524,6 +801,7 @@ def test_bulk_operations(mock_connection):
     # Test bulk insert
     assert TestModel.bulk_insert(models, batch_size=2) is True
     assert collection.insert.call_count == 3  # 2 batches of 2 and 1 batch of 1
+    collection.flush.assert_not_called()
     
     # Reset mock
     collection.insert.reset_mock()
@@ -531,5 +809,156 @@ def test_bulk_operations(mock_connection):
     
     # Test bulk upsert
     assert TestModel.bulk_upsert(models, batch_size=2) is True
-    assert collection.delete.call_count == 3  # Same batching
-    assert collection.insert.call_count == 3  # Same batching
+    assert collection.upsert.call_count == 3  # Same batching
+    collection.delete.assert_not_called()
+    collection.insert.assert_not_called()
+
+def test_bulk_insert_limits_request_size(mock_connection):
+    """Test that batches are made smaller to keep requests under max_bytes."""
+    collection = mock_connection.get_collection.return_value
+    models = [TestModel(id=f"test_{i}", name=f"Test {i}", age=i) for i in range(5)]
+    
+    # A TestModel row is estimated at 1536 * 4 + 100 + 50 + 8 + 2 * 4096 bytes
+    assert TestModel.bulk_insert(models, max_bytes=2 * 14494) is True
+    assert [len(call.args[0]) for call in collection.insert.call_args_list] == [2, 2, 1]
+    
+    # The default 32 MiB limit leaves room for the whole list
+    collection.insert.reset_mock()
+    assert TestModel.bulk_insert(models) is True
+    assert collection.insert.call_count == 1
+
+def test_bulk_insert_sends_batches_in_order(mock_connection):
+    """Test that pipelined batches keep their order and stop at the first failure."""
+    collection = mock_connection.get_collection.return_value
+    models = [TestModel(id=f"test_{i}", name=f"Test {i}", age=i) for i in range(10)]
+    
+    assert TestModel.bulk_insert(models, batch_size=3) is True
+    sent = [row["id"] for call in collection.insert.call_args_list for row in call.args[0]]
+    assert sent == [model.id for model in models]
+    
+    collection.insert.reset_mock()
+    collection.insert.side_effect = [None, Exception("Test error"), None, None]
+    assert TestModel.bulk_insert(models, batch_size=3) is False
+    assert collection.insert.call_count <= 3
+
+def test_to_dict_serializers(test_model):
+    """Test that each field is serialized according to its Milvus type."""
+    test_model.extra_data = None
+    data = test_model.to_dict()
+    
+    assert data["embedding"] is test_model.embedding
+    assert json.loads(data["metadata"]) == {"key": "value"}
+    assert data["extra_data"] == '{}'
+    assert data["age"] == 25
+
+def test_scalar_field_serializers():
+    """Test that scalar fields skip the generic serializer unless a model overrides it."""
+    class EventModel(MilvusModel):
+        id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+        happened_at: datetime = milvus_field(DataType.VARCHAR, max_length=32)
+        
+        @classmethod
+        def collection_name(cls) -> str:
+            return "events"
+    
+    class UpperModel(EventModel):
+        @classmethod
+        def _serialize_complex_type(cls, value):
+            return value.upper() if isinstance(value, str) else super()._serialize_complex_type(value)
+    
+    event = {"id": "a", "happened_at": datetime(2024, 1, 1, 12, 30)}
+    assert EventModel(**event).to_dict() == {"id": "a", "happened_at": "2024-01-01T12:30:00"}
+    with patch('millie.orm.milvus_model._serialize_value') as mock_serialize:
+        EventModel(**event).to_dict()
+    mock_serialize.assert_not_called()
+    assert UpperModel(**event).to_dict() == {"id": "A", "happened_at": "2024-01-01T12:30:00"}
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_json_fields_with_and_without_orjson(has_orjson):
+    """Test that JSON fields hold the same data with and without orjson."""
+    if has_orjson:
+        pytest.importorskip("orjson")
+    nested = {
+        "datetime": datetime(2024, 1, 1, 12, 30, 15, 500),
+        "list": [1, 2.5, {"key": None}],
+        1: "non-string key",
+        "unicode": "值",
+        "big": 2 ** 70
+    }
+    with patch('millie.orm.milvus_model.HAS_ORJSON', has_orjson):
+        data = ComplexModel(id="1", nested_data=nested).to_dict()
+        model = ComplexModel.from_dict(data)
+    
+    assert model.nested_data == {
+        "datetime": "2024-01-01T12:30:15.000500",
+        "list": [1, 2.5, {"key": None}],
+        "1": "non-string key",
+        "unicode": "值",
+        "big": 2 ** 70
+    }
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_serialize_for_json_with_and_without_orjson(has_orjson, test_model):
+    """Test that models serialize to the same JSON with and without orjson."""
+    if has_orjson:
+        pytest.importorskip("orjson")
+    with patch('millie.orm.milvus_model.HAS_ORJSON', has_orjson):
+        json_str = test_model.serialize_for_json()
+        model = TestModel.deserialize_from_json(json_str)
+        data = test_model.to_dict()
+    
+    assert json.loads(json_str) == data
+    assert model == test_model
+
+def test_to_columns(test_model):
+    """Test that models are converted to one list per field."""
+    other = TestModel(id="456", name="Other", age=30)
+    columns = TestModel.to_columns([test_model, other])
+    
+    assert list(columns) == list(test_model.to_dict())
+    assert columns["id"] == ["123", "456"]
+    assert [json.loads(value) for value in columns["metadata"]] == [{"key": "value"}, {}]
+    assert columns["embedding"] == [test_model.embedding, None]
+
+def test_bulk_insert_sends_columns_in_schema_order(mock_connection):
+    """Test that bulk inserts are column-based when the collection schema matches the model."""
+    collection = mock_connection.get_collection.return_value
+    collection.schema = Mock(fields=list(reversed(TestModel.schema().fields)))
+    models = [TestModel(id=f"test_{i}", name=f"Test {i}", age=i) for i in range(3)]
+    
+    assert TestModel.bulk_insert(models) is True
+    data = collection.insert.call_args.args[0]
+    assert data[0] == ['{}', '{}', '{}']  # extra_data, the last model field
+    assert data[-1] == ["test_0", "test_1", "test_2"]
+    
+    # Updated models are sent as columns too
+    TestModel.bulk_upsert(models)
+    assert collection.upsert.call_args.args[0][-1] == ["test_0", "test_1", "test_2"]
+    
+    # Collections whose fields differ from the model get rows
+    collection.schema = Mock(fields=TestModel.schema().fields[:2])
+    TestModel.bulk_insert(models)
+    assert collection.insert.call_args.args[0][0] == models[0].to_dict()
+
+def test_delete_by_ids(mock_connection):
+    """Test that many models are deleted with one IN expression."""
+    collection = mock_connection.get_collection.return_value
+    
+    assert TestModel.delete_by_ids(["a", 'b"c']) is True
+    collection.delete.assert_called_once_with('id in ["a", "b\\"c"]')
+    
+    collection.delete.side_effect = Exception("Test error")
+    assert TestModel.delete_by_ids(["a"]) is False
+
+def test_bulk_insert_batch_size_from_env(mock_connection, monkeypatch):
+    """Test that the default bulk batch size can be set from the environment."""
+    collection = mock_connection.get_collection.return_value
+    models = [TestModel(id=f"test_{i}", name=f"Test {i}", age=i) for i in range(5)]
+    
+    assert TestModel.bulk_insert(models) is True
+    assert collection.insert.call_count == 1
+    
+    collection.insert.reset_mock()
+    monkeypatch.setenv('MILLIE_INSERT_BATCH_SIZE', '2')
+    assert TestModel.bulk_insert(models) is True
+    assert [len(call.args[0]) for call in collection.insert.call_args_list] == [2, 2, 1]
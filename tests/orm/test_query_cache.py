@@ -0,0 +1,213 @@
+"""Tests for the search results cache."""
+from unittest.mock import Mock, patch
+
+import pytest
+from pymilvus import Collection, DataType
+
+from millie.orm.fields import milvus_field
+from millie.orm.milvus_model import MilvusModel
+from millie.orm.query_cache import QueryCache, ResultCache, score_margin
+
+class CachedModel(MilvusModel):
+    """Model for search cache tests."""
+    id: str = milvus_field(DataType.VARCHAR, max_length=100, is_primary=True)
+    name: str = milvus_field(DataType.VARCHAR, max_length=50)
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "cached_models"
+
+@pytest.fixture
+def cache():
+    """Enable a small search cache for the duration of a test."""
+    cache = QueryCache(max_size=2, ttl=60, threshold=0.95)
+    with patch('millie.orm.milvus_model._QUERY_CACHE', cache):
+        yield cache
+
+@pytest.fixture
+def result_cache():
+    """Enable a small query results cache for the duration of a test."""
+    cache = ResultCache(max_size=2, ttl=60)
+    with patch('millie.orm.milvus_model._RESULT_CACHE', cache):
+        yield cache
+
+@pytest.fixture
+def collection():
+    """Mock the collection searched by CachedModel."""
+    with patch('millie.orm.milvus_model.MilvusConnection') as mock:
+        collection = Mock(spec=Collection)
+        collection.search.return_value = [[{"id": "1", "name": "first"}]]
+        collection.query.side_effect = lambda **kwargs: [{"id": "1", "name": "first"}]
+        mock.get_collection.return_value = collection
+        yield collection
+
+def test_disabled_cache_misses():
+    """Test that a cache without capacity never stores anything."""
+    cache = QueryCache()
+    cache.put(("c",), [1.0, 0.0], [{"id": "1"}])
+    assert cache.get(("c",), [1.0, 0.0]) is None
+
+def test_exact_and_similar_hits(cache):
+    """Test that identical and near-identical vectors hit the cache."""
+    rows = [{"id": "1"}]
+    cache.put(("c",), [1.0, 0.0], rows, margin=0.5)
+
+    assert cache.get(("c",), [1.0, 0.0]) is rows
+    assert cache.get(("c",), [0.99, 0.01], "COSINE") is rows
+    assert cache.get(("c",), [0.0, 1.0], "COSINE") is None
+    assert cache.get(("other",), [1.0, 0.0]) is None
+
+def test_similar_hits_are_cosine_only(cache):
+    """Test that vectors differing in length are different L2 and IP searches."""
+    rows = [{"id": "1"}]
+    cache.put(("c",), [1.0, 0.0], rows, margin=0.5)
+
+    assert cache.get(("c",), [2.0, 0.0], "L2") is None
+    assert cache.get(("c",), [2.0, 0.0], "IP") is None
+    assert cache.get(("c",), [2.0, 0.0]) is None
+    assert cache.get(("c",), [2.0, 0.0], "COSINE") is rows
+
+def test_similar_hits_need_a_score_margin(cache):
+    """Test that close results are only reused for queries too near to reorder them."""
+    cache.put(("c",), [1.0, 0.0], [{"id": "1"}], margin=0.01)
+    assert cache.get(("c",), [0.99, 0.01], "COSINE") is None
+    assert cache.get(("c",), [1.0, 0.0], "COSINE") is not None
+
+    cache.put(("d",), [1.0, 0.0], [{"id": "1"}])
+    assert cache.get(("d",), [0.99, 0.01], "COSINE") is None
+
+def test_score_margin():
+    """Test the margin is the smallest gap between the hits and the one past the limit."""
+    assert score_margin([0.9, 0.5, 0.45], 2) == pytest.approx(0.05)
+    assert score_margin([0.9, 0.5], 2) == pytest.approx(0.4)
+    assert score_margin([0.9], 1) == float("inf")
+    assert score_margin([0.9, None], 1) == 0.0
+
+def test_entries_expire(cache):
+    """Test that entries are not served after their TTL."""
+    cache.put(("c",), [1.0, 0.0], [{"id": "1"}])
+    with patch('millie.orm.query_cache.time.monotonic', return_value=10 ** 9):
+        assert cache.get(("c",), [1.0, 0.0]) is None
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """Test that the cache stays within its size."""
+    cache.put(("c",), [1.0, 0.0], [{"id": "1"}])
+    cache.put(("c",), [0.0, 1.0], [{"id": "2"}])
+    cache.get(("c",), [1.0, 0.0])
+    cache.put(("c",), [-1.0, 0.0], [{"id": "3"}])
+
+    assert cache.get(("c",), [1.0, 0.0]) is not None
+    assert cache.get(("c",), [0.0, 1.0]) is None
+
+def test_search_reuses_cached_results(cache, collection):
+    """Test that a repeated search does not go to Milvus."""
+    first = CachedModel.search_by_similarity([1.0, 0.0])
+    second = CachedModel.search_by_similarity([1.0, 0.0])
+
+    assert collection.search.call_count == 1
+    assert [m.id for m in first] == [m.id for m in second] == ["1"]
+    assert first[0] is not second[0]
+
+    # Different search parameters are cached separately
+    CachedModel.search_by_similarity([1.0, 0.0], limit=1)
+    assert collection.search.call_count == 2
+
+def test_cosine_search_reuses_results_for_similar_vectors(cache, collection):
+    """Test that COSINE searches fetch one extra hit and reuse well separated results."""
+    hits = [Mock(distance=0.9, fields={"id": "1", "name": "first"}),
+            Mock(distance=0.2, fields={"id": "2", "name": "second"})]
+    collection.search.return_value = [hits]
+    with patch('millie.orm.milvus_model.Hit', Mock):
+        first = CachedModel.search_by_similarity([1.0, 0.0], limit=1, metric_type="COSINE")
+        second = CachedModel.search_by_similarity([0.99, 0.01], limit=1, metric_type="COSINE")
+
+    assert collection.search.call_count == 1
+    assert collection.search.call_args.kwargs["limit"] == 2
+    assert [m.id for m in first] == [m.id for m in second] == ["1"]
+
+def test_l2_search_does_not_reuse_results_for_similar_vectors(cache, collection):
+    """Test that L2 searches with a scaled vector go to Milvus."""
+    CachedModel.search_by_similarity([1.0, 0.0])
+    CachedModel.search_by_similarity([2.0, 0.0])
+
+    assert collection.search.call_count == 2
+    assert collection.search.call_args.kwargs["limit"] == 5
+
+def test_writes_invalidate_cached_results(cache, collection):
+    """Test that writing to a collection drops its cached searches."""
+    CachedModel.search_by_similarity([1.0, 0.0])
+    CachedModel(id="2", name="second").save()
+    CachedModel.search_by_similarity([1.0, 0.0])
+
+    assert collection.search.call_count == 2
+
+def test_searches_during_a_write_are_not_cached(cache, collection):
+    """Test that results read while a write is in flight are dropped once it finishes."""
+    collection.upsert.side_effect = lambda data: CachedModel.search_by_similarity([1.0, 0.0])
+    CachedModel(id="1", name="first").save()
+    CachedModel.search_by_similarity([1.0, 0.0])
+
+    assert collection.search.call_count == 2
+
+def test_result_cache_evicts_and_expires(result_cache):
+    """Test that the query results cache stays within its size and TTL."""
+    result_cache.put(("c", "a"), [{"id": "1"}])
+    result_cache.put(("c", "b"), [{"id": "2"}])
+    result_cache.get(("c", "a"))
+    result_cache.put(("c", "c"), [{"id": "3"}])
+
+    assert result_cache.get(("c", "a")) is not None
+    assert result_cache.get(("c", "b")) is None
+    with patch('millie.orm.query_cache.time.monotonic', return_value=10 ** 9):
+        assert result_cache.get(("c", "a")) is None
+
+def test_queries_reuse_cached_rows(result_cache, collection):
+    """Test that exact repeats of a query do not go to Milvus."""
+    first = CachedModel.filter(name="first")
+    first[0].name = "changed"
+    second = CachedModel.filter(name="first")
+
+    assert collection.query.call_count == 1
+    assert second[0].name == "first"
+
+    # Other queries are cached separately
+    CachedModel.get_by_id("1")
+    CachedModel.get_all(limit=1)
+    assert collection.query.call_count == 3
+
+def test_writes_invalidate_cached_rows(result_cache, collection):
+    """Test that writing to a collection drops its cached query results."""
+    CachedModel.get_by_id("1")
+    CachedModel(id="1", name="first").delete()
+    CachedModel.get_by_id("1")
+
+    assert collection.query.call_count == 2
+
+def test_writes_during_a_query_leave_no_stale_rows(result_cache, collection):
+    """Test that rows read before a concurrent write finished are not cached."""
+    def query_racing_a_write(**kwargs):
+        # The write completes after Milvus answered the query, but before the rows are cached
+        CachedModel(id="1", name="second").save()
+        return [{"id": "1", "name": "first"}]
+
+    collection.query.side_effect = query_racing_a_write
+    assert CachedModel.get_by_id("1").name == "first"
+
+    collection.query.side_effect = lambda **kwargs: [{"id": "1", "name": "second"}]
+    assert CachedModel.get_by_id("1").name == "second"
+    assert collection.query.call_count == 2
+
+def test_put_skips_rows_from_an_older_generation(result_cache):
+    """Test that rows read before an invalidation or clear are not cached."""
+    generation = result_cache.generation("c")
+    result_cache.invalidate("c")
+    result_cache.put(("c", "a"), [{"id": "1"}], generation)
+    assert result_cache.get(("c", "a")) is None
+
+    generation = result_cache.generation("c")
+    result_cache.clear()
+    result_cache.put(("c", "a"), [{"id": "1"}], generation)
+    assert result_cache.get(("c", "a")) is None
+
+    result_cache.put(("c", "a"), [{"id": "1"}], result_cache.generation("c"))
+    assert result_cache.get(("c", "a")) == [{"id": "1"}]